@@ -26,6 +26,11 @@ class IsAdminOrCompanyAdmin(BasePermission):
         return request.user.is_authenticated and request.user.role in ("admin", "company")
 
 
+class IsAdminOrCompanyAdminOrGuard(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role in ("admin", "company", "guard")
+
+
 class IsAdminOrCompanyAdminOrEmployee(BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role in ("admin", "company", "employee")
@@ -1 +1,15 @@
-# No models to register for analytics app
+from django.contrib import admin
+from .models import EntryRollup, Occupancy
+
+
+@admin.register(EntryRollup)
+class EntryRollupAdmin(admin.ModelAdmin):
+    list_display = ["bucket", "gate", "company", "entry_type", "check_ins", "check_outs"]
+    list_filter = ["entry_type", "gate"]
+    date_hierarchy = "bucket"
+
+
+@admin.register(Occupancy)
+class OccupancyAdmin(admin.ModelAdmin):
+    list_display = ["gate", "company", "entry_type", "count", "updated_at"]
+    list_filter = ["entry_type", "gate"]
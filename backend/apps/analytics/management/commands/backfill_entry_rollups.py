@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.analytics.utils import hour_bucket, rebuild_entry_rollups
+from apps.entries.models import EntryLog
+
+
+class Command(BaseCommand):
+    help = "Rebuild hourly entry rollups from raw entry logs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Only rebuild the last N days (default: all history).")
+        parser.add_argument("--chunk-days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        end = hour_bucket(timezone.now()) + timedelta(hours=1)
+        if options["days"]:
+            start = end - timedelta(days=options["days"])
+        else:
+            first = EntryLog.objects.aggregate(first=Min("check_in_time"))["first"]
+            if first is None:
+                self.stdout.write("No entry logs to roll up.")
+                return
+            start = hour_bucket(first)
+
+        chunk = timedelta(days=options["chunk_days"])
+        rows = 0
+        while start < end:
+            chunk_end = min(start + chunk, end)
+            rows += rebuild_entry_rollups(start, chunk_end)
+            self.stdout.write(f"Rolled up entries through {chunk_end:%Y-%m-%d %H:%M}...")
+            start = chunk_end
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} entry rollup rows."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.occupancy import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = "Recompute on-site occupancy counters from open entry logs"
+
+    def handle(self, *args, **options):
+        drift = rebuild_occupancy()
+        for (gate_id, company_id, entry_type), (old, new) in sorted(drift.items(), key=lambda item: str(item[0])):
+            self.stdout.write(f"gate={gate_id} company={company_id} {entry_type}: {old} -> {new}")
+        self.stdout.write(self.style.SUCCESS(f"Reconciled occupancy; {len(drift)} counters corrected."))
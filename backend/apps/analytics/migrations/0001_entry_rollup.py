@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:23
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('gates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bucket', models.DateTimeField()),
+                ('entry_type', models.CharField(max_length=20)),
+                ('check_ins', models.PositiveIntegerField(default=0)),
+                ('check_outs', models.PositiveIntegerField(default=0)),
+                ('company', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='entry_rollups', to='companies.company')),
+                ('gate', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='entry_rollups', to='gates.gate')),
+            ],
+            options={
+                'ordering': ['bucket'],
+                'indexes': [models.Index(fields=['company', 'bucket'], name='analytics_e_company_4fd145_idx')],
+                'constraints': [models.UniqueConstraint(models.F('bucket'), django.db.models.functions.comparison.Coalesce('gate', models.Value(0)), django.db.models.functions.comparison.Coalesce('company', models.Value(0)), models.F('entry_type'), name='unique_entry_rollup_key')],
+            },
+        ),
+    ]
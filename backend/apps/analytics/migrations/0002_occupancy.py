@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:21
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_entry_rollup'),
+        ('companies', '0001_initial'),
+        ('gates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Occupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('entry_type', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('company', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occupancy', to='companies.company')),
+                ('gate', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occupancy', to='gates.gate')),
+            ],
+            options={
+                'verbose_name_plural': 'occupancy',
+                'ordering': ['gate', 'company', 'entry_type'],
+                'constraints': [models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('gate', models.Value(0)), django.db.models.functions.comparison.Coalesce('company', models.Value(0)), models.F('entry_type'), name='unique_occupancy_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def seed_occupancy(apps, schema_editor):
+    # Entries already open at deploy time never went through record_occupancy(); count
+    # them into the new table. The Redis counters seed themselves from it on first read.
+    EntryLog = apps.get_model("entries", "EntryLog")
+    Occupancy = apps.get_model("analytics", "Occupancy")
+    rows = (
+        EntryLog.objects.filter(check_out_time__isnull=True)
+        .values("gate_id", "company_id", "entry_type")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    Occupancy.objects.all().delete()
+    Occupancy.objects.bulk_create([
+        Occupancy(
+            gate_id=row["gate_id"], company_id=row["company_id"], entry_type=row["entry_type"], count=row["count"]
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_occupancy"),
+        ("entries", "0007_one_open_entry_constraints"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_occupancy, migrations.RunPython.noop),
+    ]
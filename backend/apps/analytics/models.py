@@ -0,0 +1,60 @@
+from django.db import models
+from django.db.models.functions import Coalesce
+
+from apps.core.models import TimestampedModel
+
+
+class EntryRollup(TimestampedModel):
+    bucket = models.DateTimeField()
+    gate = models.ForeignKey("gates.Gate", on_delete=models.CASCADE, null=True, related_name="entry_rollups")
+    company = models.ForeignKey(
+        "companies.Company", on_delete=models.CASCADE, null=True, related_name="entry_rollups"
+    )
+    entry_type = models.CharField(max_length=20)
+    check_ins = models.PositiveIntegerField(default=0)
+    check_outs = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["bucket"]
+        constraints = [
+            # Coalesce so rows for a missing gate/company still collide on the key.
+            models.UniqueConstraint(
+                "bucket",
+                Coalesce("gate", models.Value(0)),
+                Coalesce("company", models.Value(0)),
+                "entry_type",
+                name="unique_entry_rollup_key",
+            ),
+        ]
+        indexes = [models.Index(fields=["company", "bucket"])]
+
+    def __str__(self):
+        return f"{self.entry_type} at {self.gate_id} for {self.company_id} ({self.bucket})"
+
+
+class Occupancy(TimestampedModel):
+    """People on site right now per gate, company and entry type.
+
+    The durable copy of the Redis counters; both move together on check-in and
+    check-out, and reconcile_occupancy recomputes them from open entries.
+    """
+
+    gate = models.ForeignKey("gates.Gate", on_delete=models.CASCADE, null=True, related_name="occupancy")
+    company = models.ForeignKey("companies.Company", on_delete=models.CASCADE, null=True, related_name="occupancy")
+    entry_type = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["gate", "company", "entry_type"]
+        verbose_name_plural = "occupancy"
+        constraints = [
+            models.UniqueConstraint(
+                Coalesce("gate", models.Value(0)),
+                Coalesce("company", models.Value(0)),
+                "entry_type",
+                name="unique_occupancy_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.count} {self.entry_type} at {self.gate_id} for {self.company_id}"
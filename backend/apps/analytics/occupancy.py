@@ -0,0 +1,123 @@
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.entries.models import EntryLog
+from .models import Occupancy
+
+# Cached list of (gate, company, entry_type) keys that have a counter. The TTL bounds how
+# long a reader that raced a brand-new key can hide it.
+KEYS_CACHE_KEY = "occupancy:keys"
+KEYS_TTL = 60
+
+
+def _counter_key(gate_id, company_id, entry_type):
+    return f"occupancy:{gate_id or 0}:{company_id or 0}:{entry_type}"
+
+
+def _row_count(key):
+    gate_id, company_id, entry_type = key
+    return Occupancy.objects.filter(
+        gate_id=gate_id, company_id=company_id, entry_type=entry_type
+    ).values_list("count", flat=True).first() or 0
+
+
+def _bump_row(key, amount):
+    gate_id, company_id, entry_type = key
+    qs = Occupancy.objects.filter(gate_id=gate_id, company_id=company_id, entry_type=entry_type)
+    if qs.update(count=F("count") + amount, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            Occupancy.objects.create(gate_id=gate_id, company_id=company_id, entry_type=entry_type, count=amount)
+    except IntegrityError:
+        # Another request created the row between our update and insert.
+        qs.update(count=F("count") + amount, updated_at=timezone.now())
+    cache.delete(KEYS_CACHE_KEY)
+
+
+def _key_order(item):
+    gate_id, company_id, entry_type = item[0]
+    return gate_id or 0, company_id or 0, entry_type
+
+
+def record_occupancy(check_ins=(), check_outs=()):
+    """Apply check-ins and check-outs to the occupancy table and its Redis counters.
+
+    Both take atomic increments (UPDATE ... count + n, INCRBY), so concurrent scans
+    never lose each other's changes. Call it after the entries' transaction commits.
+    """
+    deltas = Counter()
+    for entry in check_ins:
+        deltas[entry.gate_id, entry.company_id, entry.entry_type] += 1
+    for entry in check_outs:
+        deltas[entry.gate_id, entry.company_id, entry.entry_type] -= 1
+    for key, amount in sorted(deltas.items(), key=_key_order):
+        if not amount:
+            continue
+        _bump_row(key, amount)
+        try:
+            cache.incr(_counter_key(*key), amount)
+        except ValueError:
+            # Not cached: seed from the row just updated, which already includes this
+            # delta. set() also overwrites a reader's seed taken before our update.
+            cache.set(_counter_key(*key), _row_count(key), None)
+
+
+def _occupancy_keys():
+    keys = cache.get(KEYS_CACHE_KEY)
+    if keys is None:
+        keys = list(Occupancy.objects.values_list("gate_id", "company_id", "entry_type"))
+        cache.set(KEYS_CACHE_KEY, keys, KEYS_TTL)
+    return keys
+
+
+def get_occupancy():
+    """Current headcount per (gate, company, entry_type), read from the Redis counters."""
+    keys = _occupancy_keys()
+    cached = cache.get_many([_counter_key(*key) for key in keys])
+    counts = {key: cached.get(_counter_key(*key)) for key in keys}
+    if None in counts.values():
+        rows = {
+            (gate_id, company_id, entry_type): count
+            for gate_id, company_id, entry_type, count
+            in Occupancy.objects.values_list("gate_id", "company_id", "entry_type", "count")
+        }
+        for key, count in counts.items():
+            if count is None:
+                counts[key] = rows.get(key, 0)
+                cache.add(_counter_key(*key), counts[key], None)
+    return counts
+
+
+def rebuild_occupancy():
+    """Recompute occupancy from open entries; returns {key: (old, new)} for keys that drifted."""
+    rows = (
+        EntryLog.objects.filter(check_out_time__isnull=True)
+        .values("gate_id", "company_id", "entry_type")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    totals = {(row["gate_id"], row["company_id"], row["entry_type"]): row["count"] for row in rows}
+    with transaction.atomic():
+        previous = {
+            (gate_id, company_id, entry_type): count
+            for gate_id, company_id, entry_type, count
+            in Occupancy.objects.select_for_update().values_list("gate_id", "company_id", "entry_type", "count")
+        }
+        Occupancy.objects.all().delete()
+        Occupancy.objects.bulk_create([
+            Occupancy(gate_id=gate_id, company_id=company_id, entry_type=entry_type, count=count)
+            for (gate_id, company_id, entry_type), count in totals.items()
+        ])
+    cache.delete_many([_counter_key(*key) for key in previous.keys() - totals.keys()])
+    cache.set_many({_counter_key(*key): count for key, count in totals.items()}, None)
+    cache.delete(KEYS_CACHE_KEY)
+    return {
+        key: (previous.get(key, 0), totals.get(key, 0))
+        for key in previous.keys() | totals.keys()
+        if previous.get(key, 0) != totals.get(key, 0)
+    }
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from .occupancy import rebuild_occupancy
+from .utils import hour_bucket, rebuild_entry_rollups, refresh_overview
+
+
+@shared_task
+def reconcile_entry_rollups(hours=None):
+    hours = hours or settings.ENTRY_ROLLUP_RECONCILE_HOURS
+    end = hour_bucket(timezone.now())
+    return rebuild_entry_rollups(end - timedelta(hours=hours), end)
+
+
+@shared_task
+def reconcile_occupancy():
+    return len(rebuild_occupancy())
+
+
+@shared_task
+def refresh_analytics_overview(role):
+    refresh_overview(role)
@@ -1,10 +1,18 @@
 from datetime import timedelta
+from importlib import import_module
+from io import StringIO
 
 import pytest
+from django.apps import apps as django_apps
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Sum
 from django.urls import reverse
 from django.utils import timezone
 
+from apps.analytics import occupancy
+from apps.analytics.models import EntryRollup, Occupancy
+from apps.analytics.utils import hour_bucket
 from apps.companies.models import Company, Employee
 from apps.entries.models import EntryLog
 from apps.gates.models import Gate
@@ -65,6 +73,7 @@ def test_company_analytics_are_scoped_to_owned_company(
 
     EntryLog.objects.create(
         visitor_pass=managed_pass,
+        company=managed_company,
         entry_type=EntryLog.EntryType.VISITOR,
         gate=gate,
         visitor_name=managed_pass.visitor_name,
@@ -73,6 +82,7 @@ def test_company_analytics_are_scoped_to_owned_company(
     )
     EntryLog.objects.create(
         visitor_pass=other_pass,
+        company=other_company,
         entry_type=EntryLog.EntryType.VISITOR,
         gate=gate,
         visitor_name=other_pass.visitor_name,
@@ -84,3 +94,175 @@ def test_company_analytics_are_scoped_to_owned_company(
 
     assert response.status_code == 200
     assert sum(item["count"] for item in response.data) == 1
+
+
+@pytest.mark.django_db
+def test_entry_analytics_read_rollups_for_closed_hours(
+    authenticated_guard_client, admin_user, employee_user, django_capture_on_commit_callbacks
+):
+    company = Company.objects.create(name="Rollup Company", slug="rollup-company")
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    now = timezone.now()
+    visitor_pass = VisitorPass.objects.create(
+        visitor_name="Visitor",
+        visitor_phone="+911111111111",
+        host_company=company,
+        valid_from=now - timedelta(hours=1),
+        valid_until=now + timedelta(hours=2),
+        status=VisitorPass.Status.APPROVED,
+        created_by=employee_user,
+    )
+    for days_ago in (3, 3, 2):
+        EntryLog.objects.create(
+            visitor_pass=visitor_pass,
+            company=company,
+            gate=gate,
+            check_in_time=now - timedelta(days=days_ago),
+            check_out_time=now - timedelta(days=days_ago) + timedelta(minutes=30),
+        )
+
+    call_command("backfill_entry_rollups", stdout=StringIO())
+    assert EntryRollup.objects.filter(company=company).aggregate(
+        check_ins=Sum("check_ins"), check_outs=Sum("check_outs")
+    ) == {"check_ins": 3, "check_outs": 3}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_guard_client.post(
+            reverse("entry-check-in"),
+            {"pass_code": str(visitor_pass.pass_code), "gate": gate.id},
+            format="json",
+        )
+    assert response.status_code == 201
+    assert EntryRollup.objects.get(bucket=hour_bucket(timezone.now()), company=company).check_ins == 1
+
+    # Raw rows older than the current hour are no longer read by the views.
+    EntryLog.objects.filter(check_in_time__lt=now - timedelta(days=1)).delete()
+
+    client = authenticated_guard_client
+    client.force_authenticate(user=admin_user)
+    by_date = client.get(reverse("analytics-entries-by-date")).data
+    assert [item["count"] for item in by_date] == [2, 1, 1]
+    by_gate = client.get(reverse("analytics-entries-by-gate")).data
+    assert by_gate == [{"gate__name": "Main Gate", "count": 4}]
+    peak = client.get(reverse("analytics-peak-hours")).data
+    assert sum(item["count"] for item in peak) == 4
+
+
+@pytest.mark.django_db
+def test_overview_is_aggregated_and_served_from_cache(
+    authenticated_admin_client, employee_user, django_assert_max_num_queries, settings
+):
+    company = Company.objects.create(name="Overview Company", slug="overview-company")
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    now = timezone.now()
+    EntryLog.objects.create(gate=gate, entry_type=EntryLog.EntryType.VISITOR, check_in_time=now)
+    EntryLog.objects.create(
+        gate=gate, entry_type=EntryLog.EntryType.VISITOR,
+        check_in_time=now - timedelta(days=2), check_out_time=now,
+    )
+    url = reverse("analytics-overview")
+
+    with django_assert_max_num_queries(4):
+        response = authenticated_admin_client.get(url)
+    assert response.data == {
+        "total_companies": 1,
+        "total_passes_today": 0,
+        "active_visitors": 1,
+        "pending_deliveries": 0,
+        "checked_in_today": 1,
+        "checked_out_today": 1,
+    }
+
+    company.delete()
+    with django_assert_max_num_queries(0):
+        assert authenticated_admin_client.get(url).data["total_companies"] == 1
+
+    # Once the snapshot is stale it is still served while a refresh runs (eagerly in tests).
+    settings.ANALYTICS_OVERVIEW_TTL = -1
+    assert authenticated_admin_client.get(url).data["total_companies"] == 1
+    assert authenticated_admin_client.get(url).data["total_companies"] == 0
+
+
+@pytest.mark.django_db
+def test_occupancy_follows_check_ins_and_reconciles_from_entries(
+    authenticated_guard_client, admin_user, company_admin_user, employee_user,
+    django_capture_on_commit_callbacks, django_assert_max_num_queries,
+):
+    managed = Company.objects.create(name="Managed", slug="managed", admin=company_admin_user)
+    other = Company.objects.create(name="Other", slug="other")
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    now = timezone.now()
+    passes = [
+        VisitorPass.objects.create(
+            visitor_name=f"Visitor {i}",
+            visitor_phone="+911111111111",
+            host_company=company,
+            valid_from=now - timedelta(hours=1),
+            valid_until=now + timedelta(hours=2),
+            status=VisitorPass.Status.APPROVED,
+            created_by=employee_user,
+        )
+        for i, company in enumerate([managed, managed, other])
+    ]
+    client = authenticated_guard_client
+    entry_ids = []
+    for visitor_pass in passes:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                reverse("entry-check-in"), {"pass_code": str(visitor_pass.pass_code), "gate": gate.id}, format="json"
+            )
+        entry_ids.append(response.data["id"])
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(reverse("entry-check-out", args=[entry_ids[0]]))
+
+    url = reverse("analytics-occupancy")
+    client.get(url)
+    # Warm: the counters and their key list come from the cache, not the entry table.
+    with django_assert_max_num_queries(0):
+        response = client.get(url)
+    assert response.data["total"] == 2
+    assert response.data["by_gate"] == [{"id": gate.id, "count": 2}]
+    assert response.data["by_entry_type"] == {"visitor": 2, "delivery": 0}
+
+    client.force_authenticate(user=company_admin_user)
+    assert client.get(url).data["by_company"] == [{"id": managed.id, "count": 1}]
+
+    # A check-out that skipped the counters (e.g. a manual fix in the admin) is repaired.
+    EntryLog.objects.filter(id=entry_ids[2]).update(check_out_time=now)
+    out = StringIO()
+    call_command("reconcile_occupancy", stdout=out)
+    assert "1 counters corrected" in out.getvalue()
+    client.force_authenticate(user=admin_user)
+    assert client.get(url).data["by_company"] == [{"id": managed.id, "count": 1}]
+
+
+@pytest.mark.django_db
+def test_occupancy_is_seeded_from_open_entries_and_survives_a_seeding_race(monkeypatch):
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    company = Company.objects.create(name="Test Corp", slug="test-corp")
+    EntryLog.objects.bulk_create([
+        EntryLog(gate=gate, company=company, visitor_name=name, check_out_time=check_out_time)
+        for name, check_out_time in [("Asha", None), ("Bilal", None), ("Chen", timezone.now())]
+    ])
+
+    # Entries open at deploy time are counted by the migration, not lost.
+    import_module("apps.analytics.migrations.0003_seed_occupancy").seed_occupancy(django_apps, None)
+    key = (gate.id, company.id, EntryLog.EntryType.VISITOR)
+    assert occupancy.get_occupancy() == {key: 2}
+
+    # A reader seeds a flushed counter from the table while a check-in bumps the row
+    # and misses the counter in between; the check-in must still be counted.
+    occupancy.cache.clear()
+    arriving = EntryLog.objects.create(gate=gate, company=company, visitor_name="Late Arrival")
+    real_add = occupancy.cache.add
+
+    def add_after_check_in(*args, **kwargs):
+        monkeypatch.setattr(occupancy.cache, "add", real_add)
+        occupancy.record_occupancy(check_ins=[arriving])
+        return real_add(*args, **kwargs)
+
+    monkeypatch.setattr(occupancy.cache, "add", add_after_check_in)
+    # The racing reader answers with what it read; the counter it leaves behind is right.
+    assert occupancy.get_occupancy() == {key: 2}
+    assert occupancy.get_occupancy() == {key: 3}
+    assert Occupancy.objects.get().count == 3
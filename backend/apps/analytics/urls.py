@@ -7,4 +7,5 @@ urlpatterns = [
     path("entries-by-gate/", views.entries_by_gate, name="analytics-entries-by-gate"),
     path("peak-hours/", views.peak_hours, name="analytics-peak-hours"),
     path("delivery-stats/", views.delivery_stats, name="analytics-delivery-stats"),
+    path("occupancy/", views.occupancy, name="analytics-occupancy"),
 ]
@@ -0,0 +1,127 @@
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from apps.companies.models import Company
+from apps.deliveries.models import Delivery
+from apps.entries.models import EntryLog
+from apps.passes.models import VisitorPass
+from .models import EntryRollup
+
+
+def hour_bucket(value):
+    return timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+
+
+def _increment(key, field, amount):
+    bucket, gate_id, company_id, entry_type = key
+    qs = EntryRollup.objects.filter(bucket=bucket, gate_id=gate_id, company_id=company_id, entry_type=entry_type)
+    if qs.update(**{field: F(field) + amount, "updated_at": timezone.now()}):
+        return
+    try:
+        with transaction.atomic():
+            EntryRollup.objects.create(
+                bucket=bucket, gate_id=gate_id, company_id=company_id, entry_type=entry_type, **{field: amount}
+            )
+    except IntegrityError:
+        # Another request created the row between our update and insert.
+        qs.update(**{field: F(field) + amount, "updated_at": timezone.now()})
+
+
+def _rollup_order(item):
+    (bucket, gate_id, company_id, entry_type), field = item[0]
+    return bucket, gate_id or 0, company_id or 0, entry_type, field
+
+
+def record_entry_rollups(check_ins=(), check_outs=()):
+    deltas = Counter()
+    for field, entries, time_field in (
+        ("check_ins", check_ins, "check_in_time"),
+        ("check_outs", check_outs, "check_out_time"),
+    ):
+        for entry in entries:
+            key = (hour_bucket(getattr(entry, time_field)), entry.gate_id, entry.company_id, entry.entry_type)
+            deltas[key, field] += 1
+    for (key, field), amount in sorted(deltas.items(), key=_rollup_order):
+        _increment(key, field, amount)
+
+
+def rebuild_entry_rollups(start, end):
+    start, end = hour_bucket(start), hour_bucket(end)
+    totals = {}
+    for field, time_field in (("check_ins", "check_in_time"), ("check_outs", "check_out_time")):
+        rows = (
+            EntryLog.objects.filter(**{f"{time_field}__gte": start, f"{time_field}__lt": end})
+            .values("gate_id", "company_id", "entry_type", bucket=TruncHour(time_field))
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            key = (row["bucket"], row["gate_id"], row["company_id"], row["entry_type"])
+            rollup = totals.setdefault(key, EntryRollup(
+                bucket=row["bucket"], gate_id=row["gate_id"], company_id=row["company_id"], entry_type=row["entry_type"]
+            ))
+            setattr(rollup, field, row["count"])
+    with transaction.atomic():
+        EntryRollup.objects.filter(bucket__gte=start, bucket__lt=end).delete()
+        EntryRollup.objects.bulk_create(totals.values(), batch_size=1000)
+    return len(totals)
+
+
+def _overview_cache_key(role):
+    return f"analytics:overview:{role}"
+
+
+def build_overview():
+    now = timezone.now()
+    day_start = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = day_start + timedelta(days=1)
+    checked_in_today = Q(check_in_time__gte=day_start, check_in_time__lt=day_end)
+    checked_out_today = Q(check_out_time__gte=day_start, check_out_time__lt=day_end)
+    active_visitors = Q(check_out_time__isnull=True, entry_type=EntryLog.EntryType.VISITOR)
+    entries = EntryLog.objects.filter(checked_in_today | checked_out_today | active_visitors).aggregate(
+        active_visitors=Count("id", filter=active_visitors),
+        checked_in_today=Count("id", filter=checked_in_today),
+        checked_out_today=Count("id", filter=checked_out_today),
+    )
+    return {
+        "total_companies": Company.objects.filter(is_active=True).count(),
+        "total_passes_today": VisitorPass.objects.filter(created_at__gte=day_start, created_at__lt=day_end).count(),
+        "active_visitors": entries["active_visitors"],
+        "pending_deliveries": Delivery.objects.filter(
+            status__in=[Delivery.Status.EXPECTED, Delivery.Status.ARRIVED]
+        ).count(),
+        "checked_in_today": entries["checked_in_today"],
+        "checked_out_today": entries["checked_out_today"],
+    }
+
+
+def refresh_overview(role):
+    data = build_overview()
+    cache.set(
+        _overview_cache_key(role),
+        {"data": data, "refreshed_at": time.time()},
+        settings.ANALYTICS_OVERVIEW_TTL + settings.ANALYTICS_OVERVIEW_STALE_TTL,
+    )
+    cache.delete(f"{_overview_cache_key(role)}:refreshing")
+    return data
+
+
+def get_overview(role):
+    snapshot = cache.get(_overview_cache_key(role))
+    if snapshot is None:
+        return refresh_overview(role)
+    if time.time() - snapshot["refreshed_at"] > settings.ANALYTICS_OVERVIEW_TTL:
+        # Serve the stale snapshot and let one worker rebuild it in the background.
+        if cache.add(f"{_overview_cache_key(role)}:refreshing", 1, settings.ANALYTICS_OVERVIEW_STALE_TTL):
+            from .tasks import refresh_analytics_overview
+
+            refresh_analytics_overview.delay(role)
+    return snapshot["data"]
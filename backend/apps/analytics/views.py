@@ -1,15 +1,19 @@
+from collections import Counter
 from datetime import timedelta
-from django.db.models import Count, Q
+from itertools import chain
+from django.db.models import Count, F, Sum
 from django.db.models.functions import TruncDate, TruncHour
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
-from apps.accounts.permissions import IsAdmin, IsAdminOrCompanyAdmin
+from apps.accounts.permissions import IsAdmin, IsAdminOrCompanyAdmin, IsAdminOrCompanyAdminOrGuard
+from apps.companies.models import Company
 from apps.entries.models import EntryLog
-from apps.passes.models import VisitorPass
 from apps.deliveries.models import Delivery
-from apps.companies.models import Company
+from .models import EntryRollup
+from .occupancy import get_occupancy
+from .utils import get_overview, hour_bucket
 
 
 def _get_days(request):
@@ -24,16 +28,37 @@ def _filter_entries_for_user(user):
     qs = EntryLog.objects.all()
     if user.role != "company":
         return qs
+    return qs.filter(company__admin=user)
 
-    companies = Company.objects.filter(admin=user)
-    if not companies.exists():
-        return qs.none()
 
-    return qs.filter(
-        Q(visitor_pass__host_company__admin=user)
-        | Q(delivery__company__admin=user)
-        | Q(company_name__in=companies.values("name"))
-    ).distinct()
+def _filter_rollups_for_user(user):
+    qs = EntryRollup.objects.filter(check_ins__gt=0)
+    if user.role != "company":
+        return qs
+    return qs.filter(company__admin=user)
+
+
+def _count_entries(user, days, rollup_key, raw_key):
+    # Closed hours come from the rollups; only the current hour is counted from raw entries.
+    now = timezone.now()
+    current_bucket = hour_bucket(now)
+    rollups = (
+        _filter_rollups_for_user(user)
+        .filter(bucket__gte=hour_bucket(now - timedelta(days=days)), bucket__lt=current_bucket)
+        .values(key=rollup_key)
+        .annotate(count=Sum("check_ins"))
+        .order_by()
+    )
+    raw = (
+        _filter_entries_for_user(user).filter(check_in_time__gte=current_bucket)
+        .values(key=raw_key)
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    counts = Counter()
+    for row in chain(rollups, raw):
+        counts[row["key"]] += row["count"]
+    return counts
 
 
 def _filter_deliveries_for_user(user):
@@ -46,59 +71,28 @@ def _filter_deliveries_for_user(user):
 @api_view(["GET"])
 @permission_classes([IsAdmin])
 def overview(request):
-    today = timezone.now().date()
-    return Response({
-        "total_companies": Company.objects.filter(is_active=True).count(),
-        "total_passes_today": VisitorPass.objects.filter(created_at__date=today).count(),
-        "active_visitors": EntryLog.objects.filter(check_out_time__isnull=True, entry_type="visitor").count(),
-        "pending_deliveries": Delivery.objects.filter(status__in=["expected", "arrived"]).count(),
-        "checked_in_today": EntryLog.objects.filter(check_in_time__date=today).count(),
-        "checked_out_today": EntryLog.objects.filter(check_out_time__date=today).count(),
-    })
+    return Response(get_overview(request.user.role))
 
 
 @api_view(["GET"])
 @permission_classes([IsAdminOrCompanyAdmin])
 def entries_by_date(request):
-    days = _get_days(request)
-    start_date = timezone.now() - timedelta(days=days)
-    data = (
-        _filter_entries_for_user(request.user).filter(check_in_time__gte=start_date)
-        .annotate(date=TruncDate("check_in_time"))
-        .values("date")
-        .annotate(count=Count("id"))
-        .order_by("date")
-    )
-    return Response(list(data))
+    counts = _count_entries(request.user, _get_days(request), TruncDate("bucket"), TruncDate("check_in_time"))
+    return Response([{"date": date, "count": count} for date, count in sorted(counts.items())])
 
 
 @api_view(["GET"])
 @permission_classes([IsAdminOrCompanyAdmin])
 def entries_by_gate(request):
-    days = _get_days(request)
-    start_date = timezone.now() - timedelta(days=days)
-    data = (
-        _filter_entries_for_user(request.user).filter(check_in_time__gte=start_date)
-        .values("gate__name")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
-    return Response(list(data))
+    counts = _count_entries(request.user, _get_days(request), F("gate__name"), F("gate__name"))
+    return Response([{"gate__name": name, "count": count} for name, count in counts.most_common()])
 
 
 @api_view(["GET"])
 @permission_classes([IsAdmin])
 def peak_hours(request):
-    days = _get_days(request)
-    start_date = timezone.now() - timedelta(days=days)
-    data = (
-        EntryLog.objects.filter(check_in_time__gte=start_date)
-        .annotate(hour=TruncHour("check_in_time"))
-        .values("hour")
-        .annotate(count=Count("id"))
-        .order_by("hour")
-    )
-    return Response(list(data))
+    counts = _count_entries(request.user, _get_days(request), F("bucket"), TruncHour("check_in_time"))
+    return Response([{"hour": hour, "count": count} for hour, count in sorted(counts.items())])
 
 
 @api_view(["GET"])
@@ -118,3 +112,34 @@ def delivery_stats(request):
             .order_by("-count")[:10]
         ),
     })
+
+
+def _by_id(counts):
+    return [{"id": key, "count": count} for key, count in sorted(counts.items(), key=lambda item: item[0] or 0) if count]
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminOrCompanyAdminOrGuard])
+def occupancy(request):
+    # Reads the live counters, not the open entries, so it stays cheap during a muster.
+    counts = get_occupancy()
+    if request.user.role == "company":
+        managed = set(Company.objects.filter(admin=request.user).values_list("id", flat=True))
+        counts = {key: count for key, count in counts.items() if key[1] in managed}
+    try:
+        gate = int(request.query_params["gate"]) if request.query_params.get("gate") else None
+    except ValueError:
+        gate = None
+    by_gate, by_company, by_entry_type = Counter(), Counter(), Counter()
+    for (gate_id, company_id, entry_type), count in counts.items():
+        if gate is not None and gate_id != gate:
+            continue
+        by_gate[gate_id] += count
+        by_company[company_id] += count
+        by_entry_type[entry_type] += count
+    return Response({
+        "total": sum(by_entry_type.values()),
+        "by_gate": _by_id(by_gate),
+        "by_company": _by_id(by_company),
+        "by_entry_type": {entry_type: by_entry_type[entry_type] for entry_type in EntryLog.EntryType.values},
+    })
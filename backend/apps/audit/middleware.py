@@ -0,0 +1,37 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .utils import _request_buffer, write_audit_logs
+
+
+class AuditLogMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Runs natively under ASGI too, so async views don't hop to a thread for this layer.
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        buffer = []
+        token = _request_buffer.set(buffer)
+        try:
+            return self.get_response(request)
+        finally:
+            _request_buffer.reset(token)
+            # The buffered sink inserts here, before the response goes out; the celery
+            # sink only publishes one task.
+            write_audit_logs(buffer)
+
+    async def __acall__(self, request):
+        buffer = []
+        token = _request_buffer.set(buffer)
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_buffer.reset(token)
+            await sync_to_async(write_audit_logs)(buffer)
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import migrations
+
+TABLE = "audit_auditlog"
+LEGACY = "audit_auditlog_legacy"
+SEQUENCE = "audit_auditlog_partitioned_id_seq"
+
+
+def _next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def _month_bounds(first, months_ahead=3):
+    month = datetime(first.year, first.month, 1, tzinfo=dt_timezone.utc)
+    last = datetime.now(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(months_ahead):
+        last = _next_month(last)
+    while month <= last:
+        yield month, _next_month(month)
+        month = _next_month(month)
+
+
+def partition_audit_log(apps, schema_editor):
+    # Native range partitioning by month is PostgreSQL-only; other backends keep the plain
+    # table and rely on manage_partitions' archive-and-delete retention.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [TABLE, f"{TABLE}_pkey"],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT MIN(created_at) FROM {TABLE}")
+        first = cursor.fetchone()[0] or datetime.now(dt_timezone.utc)
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY}")
+        # Partitioned tables can't carry the identity column Django created, and the
+        # primary key has to include the partition key.
+        cursor.execute(f"CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+        cursor.execute(f"CREATE SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at)")
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+        for start, end in _month_bounds(first):
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{start:%Y_%m} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {LEGACY}")
+        cursor.execute(f"SELECT setval('{SEQUENCE}', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)")
+        cursor.execute(f"DROP TABLE {LEGACY}")
+
+        # Definitions were read before the rename, so they already target the new parent.
+        for _name, definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0002_audit_created_at_default"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_audit_log, migrations.RunPython.noop),
+    ]
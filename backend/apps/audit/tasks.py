@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .models import AuditLog
+from .utils import deserialize_audit_log
+
+
+@shared_task
+def write_audit_logs(rows):
+    AuditLog.objects.bulk_create([deserialize_audit_log(row) for row in rows])
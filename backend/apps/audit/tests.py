@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.audit.middleware import AuditLogMiddleware
+from apps.audit.models import AuditLog
+from apps.audit.utils import log_action
+
+
+class RolledBack(Exception):
+    pass
+
+
+@pytest.mark.parametrize("sink", ["buffered", "celery"])
+@pytest.mark.django_db(transaction=True)
+def test_audit_logs_are_written_after_the_request_in_order(settings, admin_user, sink):
+    settings.AUDIT_LOG_SINK = sink
+
+    def view(request):
+        log_action(admin_user, "first", "entry_log", resource_id=1, request=request)
+        try:
+            with transaction.atomic():
+                log_action(admin_user, "rolled_back", "entry_log", resource_id=2)
+                raise RolledBack
+        except RolledBack:
+            pass
+        with transaction.atomic():
+            log_action(admin_user, "second", "entry_log", resource_id=3, extra_data={"gate_id": 7})
+        assert not AuditLog.objects.exists()
+        return HttpResponse()
+
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.5")
+    AuditLogMiddleware(view)(request)
+
+    logs = list(AuditLog.objects.order_by("created_at"))
+    assert [log.action for log in logs] == ["first", "second"]
+    assert logs[0].ip_address == "10.0.0.5"
+    assert logs[1].extra_data == {"gate_id": 7}
+    assert logs[0].created_at < logs[1].created_at
+
+
+@pytest.mark.django_db
+def test_csv_export_writes_extra_data_as_json(authenticated_admin_client, admin_user):
+    log_action(admin_user, "pass_approved", "visitor_pass", extra_data={"pass_ids": [1, 2], "notify": True, "note": None})
+
+    response = authenticated_admin_client.get("/api/v1/audit-logs/export/", {"file_format": "csv", "action": "pass_approved"})
+
+    rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert json.loads(rows[0]["extra_data"]) == {"pass_ids": [1, 2], "notify": True, "note": None}
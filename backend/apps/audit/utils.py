@@ -1,7 +1,22 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
 from .models import AuditLog
 
+AUDIT_LOG_FIELDS = [
+    "user_id", "action", "resource_type", "resource_id", "description",
+    "ip_address", "user_agent", "extra_data", "created_at",
+]
 
-def log_action(user, action, resource_type, resource_id="", description="", request=None, extra_data=None):
+# Per-request buffer installed by AuditLogMiddleware; None outside a request.
+_request_buffer = ContextVar("audit_log_buffer", default=None)
+
+
+def build_audit_log(user, action, resource_type, resource_id="", description="", request=None, extra_data=None):
     ip_address = None
     user_agent = ""
     if request:
@@ -9,7 +24,7 @@ def log_action(user, action, resource_type, resource_id="", description="", requ
         if ip_address and "," in ip_address:
             ip_address = ip_address.split(",")[0].strip()
         user_agent = request.META.get("HTTP_USER_AGENT", "")
-    AuditLog.objects.create(
+    return AuditLog(
         user=user,
         action=action,
         resource_type=resource_type,
@@ -18,4 +33,51 @@ def log_action(user, action, resource_type, resource_id="", description="", requ
         ip_address=ip_address or None,
         user_agent=user_agent,
         extra_data=extra_data or {},
+        created_at=timezone.now(),
     )
+
+
+def serialize_audit_log(audit_log):
+    row = {field: getattr(audit_log, field) for field in AUDIT_LOG_FIELDS}
+    row["created_at"] = row["created_at"].isoformat()
+    return row
+
+
+def deserialize_audit_log(row):
+    return AuditLog(**{**row, "created_at": parse_datetime(row["created_at"])})
+
+
+def write_audit_logs(audit_logs):
+    if not audit_logs:
+        return
+    if settings.AUDIT_LOG_SINK == "celery":
+        from .tasks import write_audit_logs as write_audit_logs_task
+
+        write_audit_logs_task.delay([serialize_audit_log(audit_log) for audit_log in audit_logs])
+    else:
+        AuditLog.objects.bulk_create(audit_logs)
+
+
+def _enqueue(audit_logs):
+    buffer = _request_buffer.get()
+    if buffer is None:
+        write_audit_logs(audit_logs)
+    else:
+        buffer.extend(audit_logs)
+
+
+def log_actions(audit_logs):
+    audit_logs = list(audit_logs)
+    if settings.AUDIT_LOG_SINK == "sync":
+        AuditLog.objects.bulk_create(audit_logs)
+        return
+    # Only record actions whose transaction committed; created_at is already stamped,
+    # so rows keep their order however late they are written.
+    transaction.on_commit(lambda: _enqueue(audit_logs))
+
+
+def log_action(user, action, resource_type, resource_id="", description="", request=None, extra_data=None):
+    log_actions([build_audit_log(
+        user, action, resource_type, resource_id=resource_id, description=description,
+        request=request, extra_data=extra_data,
+    )])
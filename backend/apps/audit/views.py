@@ -1,15 +1,28 @@
 from rest_framework import viewsets
 from apps.accounts.permissions import IsAdmin
+from apps.core.exports import ExportMixin
 from .models import AuditLog
 from .serializers import AuditLogSerializer
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(ExportMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = AuditLogSerializer
     permission_classes = [IsAdmin]
-    filterset_fields = ["action", "resource_type", "user"]
+    # Bounding created_at lets PostgreSQL prune the monthly partitions.
+    filterset_fields = {
+        "action": ["exact"],
+        "resource_type": ["exact"],
+        "user": ["exact"],
+        "created_at": ["gte", "lt"],
+    }
     search_fields = ["description", "resource_type"]
     ordering_fields = ["created_at"]
+    pagination_mode = "cursor"
+    cursor_ordering = "-created_at"
+    export_columns = [
+        "id", "created_at", "user__username", "action", "resource_type", "resource_id",
+        "description", "ip_address", "user_agent", "extra_data",
+    ]
 
     def get_queryset(self):
         return AuditLog.objects.select_related("user").all()
@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from apps.audit.utils import log_action
+from apps.core.imports import format_errors, run_import_job
+from .models import Company, Employee
+
+User = get_user_model()
+
+DEFAULT_EMPLOYEE_PASSWORD = "changeme123"
+
+
+class EmployeeImportRowSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField(required=False, allow_blank=True, default="")
+    first_name = serializers.CharField(required=False, allow_blank=True, max_length=150, default="")
+    last_name = serializers.CharField(required=False, allow_blank=True, max_length=150, default="")
+    phone = serializers.CharField(required=False, allow_blank=True, max_length=20, default="")
+    password = serializers.CharField(required=False, allow_blank=True, default="")
+    employee_id = serializers.CharField(required=False, allow_blank=True, max_length=50, default="")
+    designation = serializers.CharField(required=False, allow_blank=True, max_length=100, default="")
+    department = serializers.CharField(required=False, allow_blank=True, max_length=100, default="")
+
+
+class EmployeeImporter:
+    def __init__(self, job):
+        self.job = job
+        self.company = Company.objects.get(id=job.params["company"])
+        self.row_serializer = EmployeeImportRowSerializer()
+        self.remaining = max(self.company.max_employees - self.company.employees.count(), 0)
+        self.employee_ids = set(
+            self.company.employees.exclude(employee_id="").values_list("employee_id", flat=True)
+        )
+        self.usernames = set()
+
+    def check_row(self, attrs, existing_usernames):
+        if attrs["username"] in existing_usernames or attrs["username"] in self.usernames:
+            return "username: A user with that username already exists."
+        if attrs["employee_id"] and attrs["employee_id"] in self.employee_ids:
+            return "employee_id: This employee ID is already used in the company."
+        if self.remaining <= 0:
+            return f"Company employee limit of {self.company.max_employees} reached."
+        return ""
+
+    def process_chunk(self, rows):
+        valid, errors = [], []
+        for row_number, row in rows:
+            try:
+                valid.append((row_number, self.row_serializer.run_validation(row)))
+            except serializers.ValidationError as exc:
+                errors.append({"row": row_number, "error": format_errors(exc.detail)})
+
+        existing_usernames = set(
+            User.objects.filter(username__in=[attrs["username"] for _, attrs in valid])
+            .values_list("username", flat=True)
+        )
+        accepted = []
+        for row_number, attrs in valid:
+            error = self.check_row(attrs, existing_usernames)
+            if error:
+                errors.append({"row": row_number, "error": error})
+                continue
+            self.usernames.add(attrs["username"])
+            if attrs["employee_id"]:
+                self.employee_ids.add(attrs["employee_id"])
+            self.remaining -= 1
+            accepted.append((row_number, attrs))
+
+        passwords = [attrs["password"] or DEFAULT_EMPLOYEE_PASSWORD for _, attrs in accepted]
+        hashes = list(self.hasher.map(make_password, passwords))
+        users = [
+            User(
+                username=attrs["username"],
+                email=attrs["email"],
+                first_name=attrs["first_name"],
+                last_name=attrs["last_name"],
+                phone=attrs["phone"],
+                password=password_hash,
+                role="employee",
+            )
+            for (_, attrs), password_hash in zip(accepted, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                Employee.objects.bulk_create([
+                    Employee(
+                        user=user,
+                        company=self.company,
+                        employee_id=attrs["employee_id"],
+                        designation=attrs["designation"],
+                        department=attrs["department"],
+                    )
+                    for user, (_, attrs) in zip(users, accepted)
+                ])
+        except IntegrityError as exc:
+            self.remaining += len(accepted)
+            errors.extend({"row": row_number, "error": f"Could not save row: {exc}"} for row_number, _ in accepted)
+            return 0, sorted(errors, key=lambda error: error["row"])
+        return len(users), sorted(errors, key=lambda error: error["row"])
+
+    def run(self):
+        # PBKDF2 in hashlib releases the GIL, so threads hash in parallel; a
+        # process pool can't be started from a daemonic Celery prefork worker.
+        with ThreadPoolExecutor(max_workers=settings.EMPLOYEE_IMPORT_HASH_WORKERS) as self.hasher:
+            job = run_import_job(self.job, self.process_chunk)
+        log_action(
+            user=job.created_by,
+            action="employees_imported",
+            resource_type="import_job",
+            resource_id=job.id,
+            description=f"Imported {job.created_count} employees into {self.company.name} ({job.error_count} rows rejected).",
+            extra_data={"company_id": self.company.id, "processed_rows": job.processed_rows, "status": job.status},
+        )
+        return job
@@ -2,6 +2,7 @@ from django.db import transaction
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from apps.companies.utils import get_administered_companies
+from apps.core.serializers import ImportFileField
 from .models import Company, Employee
 
 User = get_user_model()
@@ -83,7 +84,7 @@ class EmployeeCreateSerializer(serializers.Serializer):
 
 
 class BulkEmployeeUploadSerializer(serializers.Serializer):
-    file = serializers.FileField()
+    file = ImportFileField()
     company = serializers.PrimaryKeyRelatedField(queryset=Company.objects.all())
 
     def validate_company(self, company):
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+
+@shared_task
+def import_employees(job_id):
+    from apps.core.models import ImportJob
+    from .imports import EmployeeImporter
+    job = ImportJob.objects.select_related("created_by").get(id=job_id)
+    EmployeeImporter(job).run()
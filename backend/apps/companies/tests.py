@@ -1,11 +1,15 @@
 import pytest
 from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.utils import timezone
 from apps.companies.models import Company, Employee
 from apps.deliveries.models import Delivery
 from apps.passes.models import VisitorPass
 
+User = get_user_model()
+
 
 @pytest.mark.django_db
 class TestCompanies:
@@ -98,3 +102,41 @@ class TestCompanies:
 
         assert response.status_code == 400
         assert response.data["company"] == ["You can only create employees for your own company."]
+
+    def test_bulk_upload_imports_employees_in_background(
+        self, authenticated_company_client, company_admin_user, employee_user, django_capture_on_commit_callbacks
+    ):
+        company = Company.objects.create(
+            name="Managed Company",
+            slug="managed-company",
+            admin=company_admin_user,
+            max_employees=3,
+        )
+        Employee.objects.create(user=employee_user, company=company, employee_id="EMP001")
+        csv_content = (
+            "username,email,first_name,last_name,employee_id,password\n"
+            "newhire1,new1@test.com,New,One,EMP002,secretpass1\n"
+            "testemployee,dup@test.com,Dup,User,EMP003,\n"
+            "newhire2,new2@test.com,New,Two,EMP001,\n"
+            "newhire3,new3@test.com,New,Three,EMP004,\n"
+            "newhire4,new4@test.com,New,Four,EMP005,\n"
+        )
+        upload = SimpleUploadedFile("employees.csv", csv_content.encode(), content_type="text/csv")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_company_client.post(
+                reverse("employee-bulk-upload"),
+                {"file": upload, "company": company.id},
+                format="multipart",
+            )
+
+        assert response.status_code == 202
+        job = authenticated_company_client.get(reverse("import-job-detail", args=[response.data["id"]])).data
+        assert job["status"] == "completed"
+        assert (job["created_count"], job["error_count"]) == (2, 3)
+        assert company.employees.count() == 3
+        new_hire = User.objects.get(username="newhire1")
+        assert new_hire.check_password("secretpass1")
+        assert new_hire.role == "employee"
+        assert User.objects.get(username="newhire3").check_password("changeme123")
+        assert not User.objects.filter(username="newhire4").exists()
@@ -1,19 +1,18 @@
-import csv
-import io
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.contrib.auth import get_user_model
 
 from apps.accounts.permissions import IsAdmin, IsAdminOrCompanyAdmin
+from apps.core.models import ImportJob
+from apps.core.serializers import ImportJobSerializer
 from .models import Company, Employee
 from .serializers import (
     CompanySerializer, EmployeeSerializer, EmployeeCreateSerializer,
     BulkEmployeeUploadSerializer,
 )
-
-User = get_user_model()
+from .tasks import import_employees
 
 
 class CompanyViewSet(viewsets.ModelViewSet):
@@ -70,31 +69,14 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     def bulk_upload(self, request):
         serializer = BulkEmployeeUploadSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        file = serializer.validated_data["file"]
-        company = serializer.validated_data["company"]
-        decoded = file.read().decode("utf-8-sig")
-        reader = csv.DictReader(io.StringIO(decoded))
-        created = 0
-        errors = []
-        for i, row in enumerate(reader, start=2):
-            try:
-                user = User.objects.create_user(
-                    username=row["username"],
-                    email=row.get("email", ""),
-                    first_name=row.get("first_name", ""),
-                    last_name=row.get("last_name", ""),
-                    phone=row.get("phone", ""),
-                    password=row.get("password", "changeme123"),
-                    role="employee",
-                )
-                Employee.objects.create(
-                    user=user,
-                    company=company,
-                    employee_id=row.get("employee_id", ""),
-                    designation=row.get("designation", ""),
-                    department=row.get("department", ""),
-                )
-                created += 1
-            except Exception as e:
-                errors.append({"row": i, "error": str(e)})
-        return Response({"created": created, "errors": errors}, status=status.HTTP_201_CREATED)
+        job = ImportJob.objects.create(
+            kind=ImportJob.Kind.EMPLOYEES,
+            file=serializer.validated_data["file"],
+            params={"company": serializer.validated_data["company"].id},
+            created_by=request.user,
+        )
+        transaction.on_commit(lambda: import_employees.delay(job.id))
+        return Response(
+            ImportJobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
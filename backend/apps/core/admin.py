@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import ImportJob
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "kind", "status", "created_by", "processed_rows", "created_count", "error_count", "created_at"]
+    list_filter = ["kind", "status"]
@@ -0,0 +1,64 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotAuthenticated, PermissionDenied
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def api_response(data, status=200):
+    # A DRF Response rendered up front, since no APIView is around to negotiate it.
+    response = Response(data, status=status)
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = JSONRenderer.media_type
+    response.renderer_context = {}
+    return response.render()
+
+
+def _check_permissions(request, permission_classes):
+    # Touching request.user runs the authenticators, which may load the user row.
+    user = request.user
+    for permission_class in permission_classes:
+        if not permission_class().has_permission(request, None):
+            if not user.is_authenticated:
+                raise NotAuthenticated()
+            raise PermissionDenied()
+
+
+def async_api_view(methods, permission_classes=None):
+    """Serve an async view with DRF's authentication, parsing and permission checks.
+
+    DRF views are sync-only, so under ASGI they run in a thread. Views wrapped here get
+    a DRF Request (same tokens, payloads and request.data as the API views) and answer
+    errors in the same {"detail": ...} shape. They return api_response().
+    """
+    if permission_classes is None:
+        permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            api_request = Request(
+                request,
+                parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES],
+                authenticators=[authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+            )
+            try:
+                if request.method not in methods:
+                    raise MethodNotAllowed(request.method)
+                # Public views skip authentication, and with it a thread hop per request.
+                if not all(issubclass(permission, AllowAny) for permission in permission_classes):
+                    await sync_to_async(_check_permissions)(api_request, permission_classes)
+                return await view(api_request, *args, **kwargs)
+            except APIException as exc:
+                data = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+                return api_response(data, status=exc.status_code)
+
+        return wrapper
+
+    return decorator
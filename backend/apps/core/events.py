@@ -0,0 +1,100 @@
+import json
+import logging
+import secrets
+from functools import lru_cache
+
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TICKET_SALT = "gatepass.events.ticket"
+
+
+@lru_cache(maxsize=1)
+def _redis():
+    import redis
+
+    return redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+
+
+def build_event(event_type, data, gate_id=None, company_id=None):
+    return {
+        "type": event_type,
+        "gate": gate_id,
+        "company": company_id,
+        "at": timezone.now(),
+        "data": data,
+    }
+
+
+def _publish(payload):
+    import redis
+
+    try:
+        _redis().publish(settings.EVENTS_CHANNEL, payload)
+    except redis.RedisError:
+        # Events are best-effort: a consumer that misses one reloads on reconnect.
+        logger.warning("Could not publish gate event.", exc_info=True)
+
+
+def publish_event(event_type, data, gate_id=None, company_id=None):
+    """Publish a compact gate event to Redis pub/sub once the current transaction commits."""
+    if not settings.EVENTS_ENABLED:
+        return
+    payload = json.dumps(build_event(event_type, data, gate_id, company_id), cls=DjangoJSONEncoder)
+    transaction.on_commit(lambda: _publish(payload))
+
+
+def event_matches(event, gates=None, companies=None):
+    # None means unfiltered; events without a gate (e.g. pass approvals) pass a gate filter.
+    if gates is not None and event["gate"] is not None and event["gate"] not in gates:
+        return False
+    if companies is not None and event["company"] not in companies:
+        return False
+    return True
+
+
+def issue_stream_ticket(user):
+    # EventSource can't send headers, so the stream is opened with this in the URL
+    # rather than the access token, which would then sit in every access log.
+    return signing.dumps({"user": user.id, "nonce": secrets.token_urlsafe(12)}, salt=TICKET_SALT)
+
+
+def read_stream_ticket(ticket):
+    """Return the ticket's payload, or None if it is forged or older than EVENTS_TICKET_TTL."""
+    try:
+        return signing.loads(ticket, salt=TICKET_SALT, max_age=settings.EVENTS_TICKET_TTL)
+    except signing.BadSignature:
+        return None
+
+
+def format_sse(event_type, payload):
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+async def stream_events(gates=None, companies=None):
+    """Yield server-sent events for matching gate events, with periodic keep-alives."""
+    import redis.asyncio as aioredis
+
+    client = aioredis.Redis.from_url(settings.EVENTS_REDIS_URL)
+    pubsub = client.pubsub()
+    await pubsub.subscribe(settings.EVENTS_CHANNEL)
+    try:
+        yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=settings.EVENTS_HEARTBEAT)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            payload = message["data"].decode()
+            event = json.loads(payload)
+            if event_matches(event, gates, companies):
+                yield format_sse(event["type"], payload)
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+        await client.aclose()
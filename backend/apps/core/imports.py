@@ -0,0 +1,105 @@
+import csv
+import io
+from datetime import date, datetime
+from itertools import islice
+
+from django.core.files.base import ContentFile
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ImportJob
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_EXTENSIONS = (".csv", ".xlsx")
+
+
+def _cell_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def iter_import_rows(fileobj, filename):
+    if filename.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+            for row_number, values in enumerate(rows, start=2):
+                if all(value is None or value == "" for value in values):
+                    continue
+                yield row_number, {key: _cell_value(value) for key, value in zip(header, values) if key}
+        finally:
+            workbook.close()
+        return
+
+    reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+    for row_number, row in enumerate(reader, start=2):
+        yield row_number, {
+            (key or "").strip(): (value or "").strip()
+            for key, value in row.items() if key
+        }
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def format_errors(detail):
+    if isinstance(detail, dict):
+        return "; ".join(f"{field}: {format_errors(messages)}" for field, messages in detail.items())
+    if isinstance(detail, list):
+        return " ".join(format_errors(message) for message in detail)
+    return str(detail)
+
+
+def write_error_report(job, errors):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["row", "error"])
+    writer.writerows((error["row"], error["error"]) for error in errors)
+    job.error_report.save(
+        f"import_{job.pk}_errors.csv",
+        ContentFile(buffer.getvalue().encode("utf-8")),
+        save=False,
+    )
+
+
+def run_import_job(job, process_chunk, chunk_size=IMPORT_CHUNK_SIZE):
+    # process_chunk receives [(row_number, row), ...] and returns (created_count, [{"row", "error"}, ...]).
+    job.status = ImportJob.Status.RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=["status", "started_at", "updated_at"])
+
+    errors = []
+    try:
+        with job.file.open("rb") as fileobj:
+            for chunk in chunked(iter_import_rows(fileobj, job.file.name), chunk_size):
+                created, chunk_errors = process_chunk(chunk)
+                errors.extend(chunk_errors)
+                ImportJob.objects.filter(pk=job.pk).update(
+                    processed_rows=F("processed_rows") + len(chunk),
+                    created_count=F("created_count") + created,
+                    error_count=F("error_count") + len(chunk_errors),
+                    updated_at=timezone.now(),
+                )
+    except Exception as exc:
+        job.refresh_from_db()
+        job.status = ImportJob.Status.FAILED
+        job.detail = str(exc)
+    else:
+        job.refresh_from_db()
+        job.status = ImportJob.Status.COMPLETED
+    if errors:
+        write_error_report(job, errors)
+    job.finished_at = timezone.now()
+    job.save()
+    return job
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.partitions import maintain_log_storage
+
+
+class Command(BaseCommand):
+    help = "Pre-create monthly log partitions and archive logs past their retention window"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, help="Partitions to keep ready (default: PARTITION_MONTHS_AHEAD).")
+        parser.add_argument("--skip-retention", action="store_true", help="Only create partitions.")
+        parser.add_argument("--dry-run", action="store_true", help="Report what retention would archive.")
+
+    def handle(self, *args, **options):
+        report = maintain_log_storage(
+            months_ahead=options["months_ahead"],
+            retention=not options["skip_retention"],
+            dry_run=options["dry_run"],
+        )
+        for name in report["created"]:
+            self.stdout.write(f"Created partition {name}.")
+        for item in report["archived"]:
+            if options["dry_run"]:
+                self.stdout.write(f"Would archive {item['rows']} rows from {item['table']} for {item['month']}.")
+            else:
+                self.stdout.write(f"Archived {item['rows']} rows from {item['table']} for {item['month']} to {item['path']}.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(report['created'])} partitions, archived {len(report['archived'])} months."
+        ))
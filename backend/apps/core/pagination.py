@@ -1,7 +1,91 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+
+    # Views opt in with pagination_mode = "cursor" and cursor_ordering = "-<timestamp field>";
+    # any other view can be paged by cursor with ?pagination=cursor.
+    def use_cursor(self, request, view):
+        params = request.query_params
+        if self.cursor_query_param in params or params.get(self.mode_query_param) == "cursor":
+            return True
+        if params.get(self.mode_query_param) == "page" or self.page_query_param in params:
+            return False
+        return getattr(view, "pagination_mode", "page") == "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.use_cursor(request, view)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_queryset_by_cursor(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            "next": self.get_next_cursor_link(),
+            "has_next": self.has_next,
+            "results": data,
+        })
+
+    def get_cursor_ordering(self, request, view):
+        ordering = getattr(view, "cursor_ordering", "-created_at")
+        field = ordering.lstrip("-")
+        requested = request.query_params.get("ordering", "")
+        if requested.lstrip("-") == field:
+            ordering = requested
+        return field, ordering.startswith("-")
+
+    def encode_cursor(self, value, pk):
+        payload = json.dumps([value.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode_cursor(self, cursor, model_field):
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return model_field.to_python(value), int(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound("Invalid cursor.")
+
+    def paginate_queryset_by_cursor(self, queryset, request, view):
+        self.request = request
+        page_size = self.get_page_size(request)
+        field, descending = self.get_cursor_ordering(request, view)
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{field}", f"{prefix}pk")
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            value, pk = self.decode_cursor(cursor, queryset.model._meta.get_field(field))
+            # Keyset seek on (field, pk); the plain range term keeps it on the field's index.
+            before, after = ("lt", "lte") if descending else ("gt", "gte")
+            queryset = queryset.filter(
+                Q(**{f"{field}__{after}": value})
+                & (Q(**{f"{field}__{before}": value}) | Q(**{f"pk__{before}": pk}))
+            )
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = self.encode_cursor(getattr(rows[-1], field), rows[-1].pk) if self.has_next else None
+        return rows
+
+    def get_next_cursor_link(self):
+        if not self.next_cursor:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
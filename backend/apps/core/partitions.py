@@ -0,0 +1,200 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+ARCHIVE_CHUNK_SIZE = 2000
+
+
+def month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partitioned(table):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            ORDER BY child.relname
+            """,
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def default_partition_months(table, column):
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', {qn(column)} AT TIME ZONE 'UTC') FROM {qn(f'{table}_default')}"
+        )
+        return sorted(row[0].replace(tzinfo=dt_timezone.utc) for row in cursor.fetchall())
+
+
+def create_month_partition(table, month, column):
+    name = partition_name(table, month)
+    if name in list_partitions(table):
+        return False
+    qn = connection.ops.quote_name
+    start, end = month, add_months(month, 1)
+    default = qn(f"{table}_default")
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Build the partition standalone, move any rows that landed in the default
+        # partition for this month, then attach it.
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"INSERT INTO {qn(name)} SELECT * FROM {default} WHERE {qn(column)} >= %s AND {qn(column)} < %s",
+            [start, end],
+        )
+        cursor.execute(f"DELETE FROM {default} WHERE {qn(column)} >= %s AND {qn(column)} < %s", [start, end])
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+    return True
+
+
+def ensure_month_partitions(table, column, start, months_ahead):
+    month = month_start(start)
+    last = add_months(month_start(datetime.now(dt_timezone.utc)), months_ahead)
+    months = set(default_partition_months(table, column))
+    while month <= last:
+        months.add(month)
+        month = add_months(month, 1)
+    # Months that only exist in the default partition (e.g. backdated rows) get their own
+    # partition too, which moves the rows out so retention can archive and drop them.
+    return [
+        partition_name(table, month) for month in sorted(months)
+        if create_month_partition(table, month, column)
+    ]
+
+
+def drop_month_partition(table, month):
+    qn = connection.ops.quote_name
+    name = partition_name(table, month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+        cursor.execute(f"DROP TABLE {qn(name)}")
+
+
+def archive_path(table, month):
+    return Path(settings.LOG_ARCHIVE_DIR) / table / f"{month:%Y-%m}.jsonl.gz"
+
+
+def write_archive(queryset, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    count = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as archive:
+        for row in queryset.values().order_by("pk").iterator(chunk_size=ARCHIVE_CHUNK_SIZE):
+            archive.write(json.dumps(row, cls=DjangoJSONEncoder))
+            archive.write("\n")
+            count += 1
+    with open(tmp_path, "rb") as archive:
+        os.fsync(archive.fileno())
+    # A month archived twice (e.g. rows that arrived late) gets a numbered sibling.
+    stem, suffix = path.name.removesuffix(".jsonl.gz"), 1
+    while path.exists():
+        path = path.with_name(f"{stem}.{suffix}.jsonl.gz")
+        suffix += 1
+    os.replace(tmp_path, path)
+    return path, count
+
+
+def archive_month(model, column, month, filters=None, dry_run=False):
+    table = model._meta.db_table
+    queryset = model.objects.filter(
+        **{f"{column}__gte": month, f"{column}__lt": add_months(month, 1)}, **(filters or {})
+    )
+    if dry_run:
+        return None, queryset.count()
+    partitioned = is_partitioned(table) and not filters
+    if partitioned:
+        # Rows still in the default partition move into the month's own partition first.
+        create_month_partition(table, month, column)
+    path, count = write_archive(queryset, archive_path(table, month))
+    if partitioned:
+        drop_month_partition(table, month)
+    else:
+        while True:
+            ids = list(queryset.order_by().values_list("pk", flat=True)[:ARCHIVE_CHUNK_SIZE])
+            if not ids:
+                break
+            model.objects.filter(pk__in=ids).delete()
+    return path, count
+
+
+def expired_months(model, column, retention_months):
+    if not retention_months:
+        return []
+    cutoff = add_months(month_start(datetime.now(dt_timezone.utc)), -retention_months)
+    table = model._meta.db_table
+    if is_partitioned(table):
+        months = {
+            datetime.strptime(name.rsplit("_p", 1)[1], "%Y_%m").replace(tzinfo=dt_timezone.utc)
+            for name in list_partitions(table) if not name.endswith("_default")
+        }
+        months.update(default_partition_months(table, column))
+    else:
+        first = model.objects.filter(**{f"{column}__lt": cutoff}).order_by(column).values_list(column, flat=True).first()
+        months = []
+        month = month_start(first) if first else cutoff
+        while month < cutoff:
+            months.append(month)
+            month = add_months(month, 1)
+    return [month for month in sorted(months) if month < cutoff]
+
+
+PARTITIONED_LOGS = [("audit.AuditLog", "created_at")]
+RETENTION_POLICIES = [
+    ("audit.AuditLog", "created_at", "AUDIT_LOG_RETENTION_MONTHS", {}),
+    # Visitors still inside are never archived; analytics history lives on in the rollups.
+    ("entries.EntryLog", "check_in_time", "ENTRY_LOG_RETENTION_MONTHS", {"check_out_time__isnull": False}),
+]
+
+
+def maintain_log_storage(months_ahead=None, retention=True, dry_run=False):
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    report = {"created": [], "archived": []}
+    for label, column in PARTITIONED_LOGS:
+        table = apps.get_model(label)._meta.db_table
+        if is_partitioned(table) and not dry_run:
+            report["created"] += ensure_month_partitions(table, column, datetime.now(dt_timezone.utc), months_ahead)
+    if not retention:
+        return report
+    for label, column, setting, filters in RETENTION_POLICIES:
+        model = apps.get_model(label)
+        for month in expired_months(model, column, getattr(settings, setting)):
+            path, count = archive_month(model, column, month, filters=filters, dry_run=dry_run)
+            report["archived"].append({"table": model._meta.db_table, "month": f"{month:%Y-%m}", "rows": count, "path": str(path or "")})
+    return report
@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+from .imports import IMPORT_EXTENSIONS
+from .models import ImportJob
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    error_report_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id", "kind", "status", "params",
+            "processed_rows", "created_count", "error_count",
+            "error_report_url", "detail",
+            "started_at", "finished_at", "created_at", "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_error_report_url(self, obj):
+        if not obj.error_report:
+            return None
+        url = f"/api/v1/import-jobs/{obj.pk}/error-report/"
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class ImportFileField(serializers.FileField):
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        if not file.name.lower().endswith(IMPORT_EXTENSIONS):
+            raise serializers.ValidationError("Upload a .csv or .xlsx file.")
+        return file
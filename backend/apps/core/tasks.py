@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from .partitions import maintain_log_storage
+
+
+@shared_task
+def maintain_log_partitions():
+    return maintain_log_storage()
@@ -0,0 +1,159 @@
+import re
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.companies.models import Company, Employee
+from apps.deliveries.models import Delivery
+from apps.entries.models import EntryLog
+from apps.gates.models import Gate
+from apps.passes.models import VisitorPass
+
+HOT_MODELS = [EntryLog, VisitorPass, Delivery]
+HOT_TABLES = [model._meta.db_table for model in HOT_MODELS]
+# Walking a partial index end to end is fine: it only holds the rows the predicate selects.
+PARTIAL_INDEXES = {
+    index.name
+    for model in HOT_MODELS
+    for index in [*model._meta.indexes, *model._meta.constraints]
+    if getattr(index, "condition", None)
+}
+
+
+def _explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN {sql}")
+        else:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def _full_scans(plan):
+    if connection.vendor == "postgresql":
+        return [table for table in HOT_TABLES if f"Seq Scan on {table}" in plan]
+    scans = re.findall(r"\bSCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?", plan)
+    return [table for table, index in scans if table in HOT_TABLES and index not in PARTIAL_INDEXES]
+
+
+def assert_no_full_scans(queries):
+    checked = 0
+    for query in queries:
+        sql = query["sql"]
+        if not sql.startswith("SELECT") or not any(table in sql for table in HOT_TABLES):
+            continue
+        plan = _explain(sql)
+        assert not _full_scans(plan), f"Full table scan in:\n{sql}\n{plan}"
+        checked += 1
+    assert checked, "No queries against hot tables were captured."
+
+
+@pytest.fixture
+def seeded(db, company_admin_user, employee_user):
+    now = timezone.now()
+    companies = Company.objects.bulk_create([
+        Company(name=f"Company {i}", slug=f"company-{i}", admin=company_admin_user if i == 0 else None)
+        for i in range(20)
+    ])
+    employee = Employee.objects.create(user=employee_user, company=companies[0], employee_id="EMP001")
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+
+    statuses = [
+        VisitorPass.Status.CHECKED_OUT, VisitorPass.Status.CHECKED_OUT, VisitorPass.Status.EXPIRED,
+        VisitorPass.Status.APPROVED, VisitorPass.Status.PENDING,
+    ]
+    passes = VisitorPass.objects.bulk_create([
+        VisitorPass(
+            visitor_name=f"Visitor {i}",
+            visitor_phone=f"+91{i:010d}",
+            host_company=companies[i % len(companies)],
+            valid_from=now - timedelta(days=i % 365),
+            valid_until=now - timedelta(days=i % 365) + timedelta(hours=8),
+            status=statuses[i % len(statuses)],
+            created_by=employee_user,
+        )
+        for i in range(3000)
+    ], batch_size=500)
+    deliveries = Delivery.objects.bulk_create([
+        Delivery(
+            company=companies[0],
+            employee=employee,
+            status=Delivery.Status.DELIVERED if i % 50 else Delivery.Status.EXPECTED,
+            otp_code="123456",
+        )
+        for i in range(2000)
+    ], batch_size=500)
+    EntryLog.objects.bulk_create([
+        EntryLog(
+            visitor_pass=visitor_pass,
+            company_id=visitor_pass.host_company_id,
+            gate=gate,
+            check_in_time=visitor_pass.valid_from,
+            check_out_time=None if i % 100 == 0 else visitor_pass.valid_from + timedelta(hours=1),
+        )
+        for i, visitor_pass in enumerate(passes)
+    ] + [
+        EntryLog(
+            delivery=delivery,
+            company=delivery.company,
+            entry_type=EntryLog.EntryType.DELIVERY,
+            gate=gate,
+            check_in_time=now - timedelta(days=i % 365),
+            check_out_time=now - timedelta(days=i % 365) + timedelta(minutes=10),
+        )
+        for i, delivery in enumerate(deliveries)
+    ], batch_size=500)
+
+    approved = VisitorPass.objects.create(
+        visitor_name="Arriving Visitor",
+        visitor_phone="+919999999999",
+        host_company=companies[0],
+        valid_from=now - timedelta(hours=1),
+        valid_until=now + timedelta(hours=4),
+        status=VisitorPass.Status.APPROVED,
+        created_by=employee_user,
+    )
+    expected = Delivery.objects.create(company=companies[0], employee=employee)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return {"gate": gate, "pass": approved, "delivery": expected}
+
+
+@pytest.mark.django_db
+def test_gate_hot_paths_use_indexes(authenticated_guard_client, seeded):
+    client = authenticated_guard_client
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(
+            reverse("entry-check-in"),
+            {"pass_code": str(seeded["pass"].pass_code), "gate": seeded["gate"].id},
+            format="json",
+        )
+        assert response.status_code == 201
+        response = client.post(
+            reverse("entry-check-in"),
+            {"delivery_id": seeded["delivery"].id, "gate": seeded["gate"].id},
+            format="json",
+        )
+        assert response.status_code == 201
+        assert client.get(reverse("delivery-pending-gate")).status_code == 200
+        assert client.get(reverse("entry-manifest"), {"gate": seeded["gate"].id}).status_code == 200
+    assert_no_full_scans(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_reporting_hot_paths_use_indexes(api_client, admin_user, company_admin_user, seeded):
+    with CaptureQueriesContext(connection) as ctx:
+        api_client.force_authenticate(user=company_admin_user)
+        assert api_client.get(reverse("entry-list")).status_code == 200
+        assert api_client.get(reverse("analytics-entries-by-date")).status_code == 200
+        api_client.force_authenticate(user=admin_user)
+        assert api_client.get(reverse("analytics-overview")).status_code == 200
+        assert api_client.get(reverse("entry-active")).status_code == 200
+        call_command("expire_passes", stdout=StringIO())
+    assert_no_full_scans(ctx.captured_queries)
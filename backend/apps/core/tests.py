@@ -1,5 +1,24 @@
+import gzip
+import json
+from datetime import timedelta, timezone as dt_timezone
+from io import StringIO
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import AsyncClient
 from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.audit.models import AuditLog
+from apps.core.events import build_event, event_matches
+from apps.core.partitions import add_months, is_partitioned, list_partitions, month_start, partition_name
+from apps.entries.models import EntryLog
+
+requires_postgres = pytest.mark.skipif(connection.vendor != "postgresql", reason="Partitioning is PostgreSQL-only.")
 
 
 @pytest.mark.django_db
@@ -8,3 +27,190 @@ def test_health_check_returns_ok(api_client):
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok", "database": "ok"}
+
+
+@pytest.mark.django_db
+def test_event_stream_checks_switch_server_and_credentials(settings, api_client, employee_user, guard_user):
+    url = reverse("event-stream")
+    settings.EVENTS_ENABLED = False
+    assert async_to_sync(AsyncClient().get)(url).status_code == 503
+
+    settings.EVENTS_ENABLED = True
+    # Under WSGI the stream would never send a byte, so it is refused up front.
+    assert api_client.get(url).status_code == 503
+    client = AsyncClient()
+    assert async_to_sync(client.get)(url).status_code == 401
+    assert async_to_sync(client.get)(url, {"ticket": "forged"}).status_code == 401
+    token = str(RefreshToken.for_user(employee_user).access_token)
+    assert async_to_sync(client.get)(url, headers={"authorization": f"Bearer {token}"}).status_code == 403
+
+    api_client.force_authenticate(user=employee_user)
+    assert api_client.post(reverse("event-ticket")).status_code == 403
+    api_client.force_authenticate(user=guard_user)
+    ticket = api_client.post(reverse("event-ticket")).data["ticket"]
+    settings.EVENTS_TICKET_TTL = -1
+    assert async_to_sync(client.get)(url, {"ticket": ticket}).status_code == 401
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.closed = False
+
+    async def subscribe(self, channel):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        return self.messages.pop(0) if self.messages else None
+
+    async def unsubscribe(self):
+        pass
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def pubsub(self):
+        return self._pubsub
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.django_db
+def test_event_stream_sends_retry_then_matching_events(settings, monkeypatch, api_client, guard_user):
+    settings.EVENTS_ENABLED = True
+    elsewhere = build_event("entry.checked_in", {"id": 1}, gate_id=2, company_id=7)
+    here = build_event("entry.checked_out", {"id": 2}, gate_id=1, company_id=7)
+    pubsub = FakePubSub(
+        {"data": json.dumps(event, cls=DjangoJSONEncoder).encode()} for event in (elsewhere, here)
+    )
+    monkeypatch.setattr("redis.asyncio.Redis.from_url", lambda url: FakeRedis(pubsub))
+    api_client.force_authenticate(user=guard_user)
+    ticket = api_client.post(reverse("event-ticket")).data["ticket"]
+    url = reverse("event-stream")
+
+    async def read_stream():
+        response = await AsyncClient().get(url, {"ticket": ticket, "gate": "1"})
+        assert response["Content-Type"] == "text/event-stream"
+        chunks = aiter(response.streaming_content)
+        received = [await anext(chunks), await anext(chunks)]
+        await chunks.aclose()
+        return received
+
+    retry, event = async_to_sync(read_stream)()
+    assert retry == f"retry: {settings.EVENTS_RETRY_MS}\n\n".encode()
+    name, data = event.decode().splitlines()[:2]
+    assert name == "event: entry.checked_out"
+    assert json.loads(data.removeprefix("data: "))["data"] == {"id": 2}
+    assert pubsub.closed
+    # Tickets are single-use.
+    assert async_to_sync(AsyncClient().get)(url, {"ticket": ticket}).status_code == 401
+
+
+def test_event_matches_scopes_by_gate_and_company():
+    check_in = {"type": "entry.checked_in", "gate": 1, "company": 7}
+    approval = {"type": "pass.approved", "gate": None, "company": 7}
+
+    assert event_matches(check_in)
+    assert event_matches(check_in, gates={1}, companies={7})
+    assert not event_matches(check_in, gates={2})
+    assert not event_matches(check_in, companies={8})
+    assert event_matches(approval, gates={2}, companies={7})
+
+
+@pytest.mark.django_db
+def test_manage_partitions_archives_logs_past_retention(settings, tmp_path, admin_user):
+    settings.LOG_ARCHIVE_DIR = str(tmp_path)
+    settings.AUDIT_LOG_RETENTION_MONTHS = 6
+    settings.ENTRY_LOG_RETENTION_MONTHS = 6
+    now = timezone.now()
+    old = now - timedelta(days=400)
+    AuditLog.objects.create(user=admin_user, action="old", resource_type="pass", created_at=old)
+    AuditLog.objects.create(user=admin_user, action="recent", resource_type="pass", created_at=now)
+    EntryLog.objects.create(visitor_name="Left", check_in_time=old, check_out_time=old + timedelta(hours=1))
+    EntryLog.objects.create(visitor_name="Still inside", check_in_time=old)
+
+    call_command("manage_partitions", stdout=StringIO())
+
+    assert list(AuditLog.objects.values_list("action", flat=True)) == ["recent"]
+    assert list(EntryLog.objects.values_list("visitor_name", flat=True)) == ["Still inside"]
+    month = f"{old.astimezone(dt_timezone.utc):%Y-%m}"
+    with gzip.open(tmp_path / "audit_auditlog" / f"{month}.jsonl.gz", "rt") as archive:
+        assert [json.loads(line)["action"] for line in archive] == ["old"]
+    with gzip.open(tmp_path / "entries_entrylog" / f"{month}.jsonl.gz", "rt") as archive:
+        assert [json.loads(line)["visitor_name"] for line in archive] == ["Left"]
+
+
+def _rows_in(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT action FROM {connection.ops.quote_name(table)} ORDER BY id")
+        return [row[0] for row in cursor.fetchall()]
+
+
+@requires_postgres
+@pytest.mark.django_db
+def test_audit_log_migration_partitions_by_month():
+    this_month = month_start(timezone.now())
+    partitions = list_partitions("audit_auditlog")
+
+    assert is_partitioned("audit_auditlog")
+    assert "audit_auditlog_default" in partitions
+    for months in range(4):
+        assert partition_name("audit_auditlog", add_months(this_month, months)) in partitions
+
+
+@requires_postgres
+@pytest.mark.django_db
+def test_manage_partitions_moves_and_archives_default_partition_rows(settings, tmp_path, admin_user):
+    settings.LOG_ARCHIVE_DIR = str(tmp_path)
+    settings.AUDIT_LOG_RETENTION_MONTHS = 6
+    now = timezone.now()
+    backdated = add_months(month_start(now), -2)
+    expired = add_months(month_start(now), -12)
+    for action, created_at in (("backdated", backdated), ("expired", expired), ("recent", now)):
+        AuditLog.objects.create(user=admin_user, action=action, resource_type="pass", created_at=created_at)
+    assert _rows_in("audit_auditlog_default") == ["backdated", "expired"]
+
+    call_command("manage_partitions", stdout=StringIO())
+
+    assert _rows_in("audit_auditlog_default") == []
+    assert _rows_in(partition_name("audit_auditlog", backdated)) == ["backdated"]
+    assert partition_name("audit_auditlog", expired) not in list_partitions("audit_auditlog")
+    assert list(AuditLog.objects.order_by("id").values_list("action", flat=True)) == ["backdated", "recent"]
+    with gzip.open(tmp_path / "audit_auditlog" / f"{expired:%Y-%m}.jsonl.gz", "rt") as archive:
+        assert [json.loads(line)["action"] for line in archive] == ["expired"]
+
+
+@pytest.mark.django_db
+def test_log_endpoints_page_by_cursor_without_counting(authenticated_admin_client, admin_user, django_assert_num_queries):
+    now = timezone.now()
+    # Shared timestamps make the id tiebreak carry the cursor across page boundaries.
+    AuditLog.objects.bulk_create([
+        AuditLog(user=admin_user, action=f"action-{i}", resource_type="pass", created_at=now - timedelta(minutes=i // 3))
+        for i in range(25)
+    ])
+    url = reverse("audit-log-list")
+
+    seen = []
+    response = authenticated_admin_client.get(url, {"page_size": 10})
+    while True:
+        data = response.json()
+        assert "count" not in data
+        seen += [row["id"] for row in data["results"]]
+        if not data["has_next"]:
+            break
+        with django_assert_num_queries(1):
+            response = authenticated_admin_client.get(data["next"])
+
+    expected = list(AuditLog.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+    assert seen == expected
+    assert authenticated_admin_client.get(url, {"cursor": "garbage"}).status_code == 404
+
+    paged = authenticated_admin_client.get(url, {"page": 2, "page_size": 10}).json()
+    assert paged["count"] == 25
+    assert [row["id"] for row in paged["results"]] == expected[10:20]
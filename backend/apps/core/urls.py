@@ -1,8 +1,14 @@
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
 
-from .views import health_check
+from .views import ImportJobViewSet, event_stream, event_ticket, health_check
 
+router = SimpleRouter()
+router.register("import-jobs", ImportJobViewSet, basename="import-job")
 
 urlpatterns = [
     path("health/", health_check, name="health-check"),
+    path("events/", event_stream, name="event-stream"),
+    path("events/ticket/", event_ticket, name="event-ticket"),
+    path("", include(router.urls)),
 ]
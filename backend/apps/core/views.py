@@ -1,14 +1,115 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
 from django.db import connections
 from django.db.utils import DatabaseError
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 
+from apps.accounts.permissions import IsAdminOrCompanyAdminOrEmployee, IsAdminOrCompanyAdminOrGuard
+from apps.companies.models import Company
+from .events import issue_stream_ticket, read_stream_ticket, stream_events
+from .models import ImportJob
+from .serializers import ImportJobSerializer
 
-def health_check(_request):
+
+def _ping_database():
+    with connections["default"].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+async def health_check(_request):
     try:
-        with connections["default"].cursor() as cursor:
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
+        await sync_to_async(_ping_database)()
     except DatabaseError:
         return JsonResponse({"status": "error", "database": "unavailable"}, status=503)
 
     return JsonResponse({"status": "ok", "database": "ok"})
+
+
+def _id_list(value):
+    try:
+        return {int(item) for item in value.split(",") if item} if value else None
+    except ValueError:
+        return None
+
+
+async def _authenticate_stream(request):
+    # Browsers pass a single-use ticket from events/ticket/; other clients may send the
+    # access token as a Bearer header.
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        authentication = JWTAuthentication()
+        try:
+            validated = authentication.get_validated_token(header.split(" ", 1)[1])
+            return await sync_to_async(authentication.get_user)(validated)
+        except (InvalidToken, AuthenticationFailed):
+            return None
+    ticket = read_stream_ticket(request.GET.get("ticket", ""))
+    if ticket is None or not await cache.aadd(f"events:ticket:{ticket['nonce']}", 1, settings.EVENTS_TICKET_TTL):
+        return None
+    return await get_user_model().objects.filter(id=ticket["user"], is_active=True).afirst()
+
+
+@api_view(["POST"])
+@permission_classes([IsAdminOrCompanyAdminOrGuard])
+def event_ticket(request):
+    if not settings.EVENTS_ENABLED:
+        return Response({"detail": "Live events are disabled."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response({"ticket": issue_stream_ticket(request.user), "expires_in": settings.EVENTS_TICKET_TTL})
+
+
+async def event_stream(request):
+    if not settings.EVENTS_ENABLED:
+        return JsonResponse({"detail": "Live events are disabled."}, status=503)
+    # A WSGI server reads a streaming body to the end before sending it, and this one
+    # never ends, so the stream is only served by the ASGI app.
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"detail": "Live events need the ASGI server (gatepass.asgi)."}, status=503)
+    user = await _authenticate_stream(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided or are invalid."}, status=401)
+    if user.role not in ("admin", "guard", "company"):
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+
+    gates = _id_list(request.GET.get("gate"))
+    companies = _id_list(request.GET.get("company"))
+    if user.role == "company":
+        managed = {company_id async for company_id in Company.objects.filter(admin=user).values_list("id", flat=True)}
+        companies = managed if companies is None else companies & managed
+
+    response = StreamingHttpResponse(stream_events(gates, companies), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsAdminOrCompanyAdminOrEmployee]
+    filterset_fields = ["kind", "status"]
+
+    def get_queryset(self):
+        qs = ImportJob.objects.all()
+        if self.request.user.role != "admin":
+            qs = qs.filter(created_by=self.request.user)
+        return qs
+
+    @action(detail=True, methods=["get"], url_path="error-report")
+    def error_report(self, request, pk=None):
+        job = self.get_object()
+        if not job.error_report:
+            raise Http404("This import has no error report.")
+        return FileResponse(
+            job.error_report.open("rb"),
+            as_attachment=True,
+            filename=f"import_{job.pk}_errors.csv",
+            content_type="text/csv",
+        )
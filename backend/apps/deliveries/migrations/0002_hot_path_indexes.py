@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('deliveries', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(fields=['status'], name='delivery_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('status__in', ['expected', 'arrived'])), fields=['created_at'], name='delivery_pending_gate_idx'),
+        ),
+    ]
@@ -37,6 +37,13 @@ class Delivery(TimestampedModel):
     class Meta:
         verbose_name_plural = "deliveries"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status"], name="delivery_status_idx"),
+            models.Index(
+                fields=["created_at"], condition=models.Q(status__in=["expected", "arrived"]),
+                name="delivery_pending_gate_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Delivery {self.id} - {self.delivery_type} for {self.employee}"
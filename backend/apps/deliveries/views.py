@@ -7,16 +7,23 @@ from rest_framework.response import Response
 from apps.accounts.permissions import IsAdminOrCompanyAdminOrEmployee, IsGuard
 from apps.audit.utils import log_action
 from apps.companies.utils import get_employee_profile
+from apps.core.events import publish_event
+from apps.core.exports import ExportMixin
 from apps.notifications.tasks import notify_delivery_arrived
 from .models import Delivery
 from .serializers import DeliverySerializer, DeliveryGateSerializer, VerifyOTPSerializer
 
 
-class DeliveryViewSet(viewsets.ModelViewSet):
+class DeliveryViewSet(ExportMixin, viewsets.ModelViewSet):
     serializer_class = DeliverySerializer
     filterset_fields = ["status", "delivery_type", "company"]
     search_fields = ["platform_name", "order_id", "delivery_person_name"]
     ordering_fields = ["created_at", "expected_at"]
+    # otp_code is deliberately left out.
+    export_columns = [
+        "id", "company__name", "employee__user__username", "delivery_type", "status", "platform_name",
+        "order_id", "delivery_person_name", "delivery_person_phone", "expected_at", "notes", "created_at",
+    ]
 
     def get_permissions(self):
         if self.action in ["pending_gate", "arrived", "delivered", "verify_otp"]:
@@ -73,7 +80,9 @@ class DeliveryViewSet(viewsets.ModelViewSet):
         )
         delivery_id = delivery.id
         transaction.on_commit(lambda: notify_delivery_arrived.delay(delivery_id))
-        return Response(DeliveryGateSerializer(delivery).data)
+        data = DeliveryGateSerializer(delivery).data
+        publish_event("delivery.arrived", data, company_id=delivery.company_id)
+        return Response(data)
 
     @action(detail=True, methods=["post"])
     def delivered(self, request, pk=None):
@@ -1,9 +1,16 @@
 from django.contrib import admin
-from .models import EntryLog
+from .models import EntryLog, SyncedScan
 
 
 @admin.register(EntryLog)
 class EntryLogAdmin(admin.ModelAdmin):
     list_display = ["visitor_name", "entry_type", "gate", "check_in_time", "check_out_time"]
-    list_filter = ["entry_type", "gate"]
+    list_filter = ["entry_type", "gate", "check_out_method"]
     search_fields = ["visitor_name", "phone"]
+
+
+@admin.register(SyncedScan)
+class SyncedScanAdmin(admin.ModelAdmin):
+    list_display = ["idempotency_key", "action", "pass_code", "gate", "result", "scanned_at"]
+    list_filter = ["action", "result"]
+    search_fields = ["idempotency_key", "pass_code"]
@@ -0,0 +1,99 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.analytics.occupancy import record_occupancy
+from apps.analytics.utils import record_entry_rollups
+from apps.audit.utils import log_action
+from apps.core.events import publish_event
+from apps.passes.cache import invalidate_pass_cache
+from apps.passes.models import VisitorPass
+from .models import EntryLog
+
+
+def stale_entries(now):
+    """Open entries the auto check-out policy says should have been closed by now."""
+    rules = Q()
+    if settings.AUTO_CHECKOUT_AT_PASS_END:
+        rules |= Q(
+            entry_type=EntryLog.EntryType.VISITOR,
+            visitor_pass__valid_until__lt=now - timedelta(minutes=settings.AUTO_CHECKOUT_PASS_GRACE_MINUTES),
+        )
+    if settings.AUTO_CHECKOUT_VISITOR_HOURS:
+        rules |= Q(
+            entry_type=EntryLog.EntryType.VISITOR,
+            check_in_time__lt=now - timedelta(hours=settings.AUTO_CHECKOUT_VISITOR_HOURS),
+        )
+    if settings.AUTO_CHECKOUT_DELIVERY_MINUTES:
+        rules |= Q(
+            entry_type=EntryLog.EntryType.DELIVERY,
+            check_in_time__lt=now - timedelta(minutes=settings.AUTO_CHECKOUT_DELIVERY_MINUTES),
+        )
+    if not rules:
+        return EntryLog.objects.none()
+    return EntryLog.objects.filter(rules, check_out_time__isnull=True)
+
+
+def auto_check_out(now=None, chunk_size=None):
+    """Close open entries past the auto check-out policy; returns how many were closed.
+
+    Same batching as pass expiry: id order, chunk_size rows per short transaction, and on
+    PostgreSQL rows a guard is checking out right now are skipped until the next run.
+    Entries are marked check_out_method="auto" and their passes move to checked out.
+    """
+    now = now or timezone.now()
+    chunk_size = chunk_size or settings.AUTO_CHECKOUT_CHUNK_SIZE
+    closed, last_id = Counter(), 0
+    while True:
+        with transaction.atomic():
+            # Lock only the entry rows: the pass rule outer-joins the pass, which
+            # PostgreSQL refuses to lock on the nullable side.
+            entries = list(
+                stale_entries(now).filter(id__gt=last_id)
+                .select_for_update(skip_locked=True, of=("self",))
+                .order_by("id")
+                .only("id", "gate", "company", "entry_type", "visitor_pass")[:chunk_size]
+            )
+            if not entries:
+                break
+            EntryLog.objects.filter(id__in=[entry.id for entry in entries]).update(
+                check_out_time=now, check_out_method=EntryLog.CheckOutMethod.AUTO, updated_at=now
+            )
+            for entry in entries:
+                entry.check_out_time = now
+                closed[entry.entry_type] += 1
+
+            passes = VisitorPass.objects.filter(
+                id__in=[entry.visitor_pass_id for entry in entries if entry.visitor_pass_id],
+                status=VisitorPass.Status.CHECKED_IN,
+            )
+            pass_codes = list(passes.values_list("pass_code", flat=True))
+            passes.update(status=VisitorPass.Status.CHECKED_OUT, updated_at=now)
+            invalidate_pass_cache(*pass_codes)
+
+            transaction.on_commit(lambda entries=entries: record_entry_rollups(check_outs=entries))
+            transaction.on_commit(lambda entries=entries: record_occupancy(check_outs=entries))
+            for entry in entries:
+                publish_event(
+                    "entry.checked_out",
+                    {"id": entry.id, "check_out_time": entry.check_out_time},
+                    gate_id=entry.gate_id,
+                    company_id=entry.company_id,
+                )
+        last_id = entries[-1].id
+
+    total = sum(closed.values())
+    if total:
+        visitors, deliveries = closed[EntryLog.EntryType.VISITOR], closed[EntryLog.EntryType.DELIVERY]
+        log_action(
+            user=None,
+            action="entries_auto_checked_out",
+            resource_type="entry_log",
+            description=f"Automatically checked out {visitors} visitors and {deliveries} deliveries.",
+            extra_data={"count": total, "visitors": visitors, "deliveries": deliveries, "cutoff": now.isoformat()},
+        )
+    return total
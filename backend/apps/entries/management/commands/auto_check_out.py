@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.entries.auto_checkout import auto_check_out
+
+
+class Command(BaseCommand):
+    help = "Check out open entries past the auto check-out policy (also runs from Celery beat)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, help="Rows per transaction (default: AUTO_CHECKOUT_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        closed = auto_check_out(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Checked out {closed} stale entries."))
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0001_initial'),
+        ('gates', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='entrylog',
+            name='check_in_time',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='SyncedScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('idempotency_key', models.CharField(max_length=64, unique=True)),
+                ('action', models.CharField(choices=[('check_in', 'Check In'), ('check_out', 'Check Out')], max_length=20)),
+                ('pass_code', models.UUIDField()),
+                ('scanned_at', models.DateTimeField()),
+                ('result', models.CharField(choices=[('applied', 'Applied'), ('conflict', 'Conflict')], max_length=20)),
+                ('detail', models.CharField(blank=True, max_length=255)),
+                ('entry', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='synced_scans', to='entries.entrylog')),
+                ('gate', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='synced_scans', to='gates.gate')),
+                ('synced_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='synced_scans', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('deliveries', '0001_initial'),
+        ('entries', '0002_synced_scan'),
+        ('gates', '0001_initial'),
+        ('passes', '0003_remove_qr_code_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entrylog',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='entry_logs', to='companies.company'),
+        ),
+        migrations.AddIndex(
+            model_name='entrylog',
+            index=models.Index(fields=['company', 'check_in_time'], name='entries_ent_company_4a8512_idx'),
+        ),
+    ]
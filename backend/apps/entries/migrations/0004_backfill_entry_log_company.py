@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+
+
+def backfill_company(apps, schema_editor):
+    EntryLog = apps.get_model("entries", "EntryLog")
+    VisitorPass = apps.get_model("passes", "VisitorPass")
+    Delivery = apps.get_model("deliveries", "Delivery")
+    Company = apps.get_model("companies", "Company")
+
+    EntryLog.objects.filter(company__isnull=True, visitor_pass__isnull=False).update(
+        company_id=Subquery(
+            VisitorPass.objects.filter(id=OuterRef("visitor_pass_id")).values("host_company_id")[:1]
+        )
+    )
+    EntryLog.objects.filter(company__isnull=True, delivery__isnull=False).update(
+        company_id=Subquery(Delivery.objects.filter(id=OuterRef("delivery_id")).values("company_id")[:1])
+    )
+    # Entries whose pass/delivery is gone only keep the name; trust it when no other company shares it.
+    unique_names = (
+        Company.objects.values("name").annotate(total=Count("id")).filter(total=1).values("name")
+    )
+    EntryLog.objects.filter(company__isnull=True, company_name__in=unique_names).update(
+        company_id=Subquery(Company.objects.filter(name=OuterRef("company_name")).values("id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("entries", "0003_entry_log_company"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_company, migrations.RunPython.noop),
+    ]
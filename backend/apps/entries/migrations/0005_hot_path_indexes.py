@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('deliveries', '0002_hot_path_indexes'),
+        ('entries', '0004_backfill_entry_log_company'),
+        ('gates', '0001_initial'),
+        ('passes', '0003_remove_qr_code_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entrylog',
+            index=models.Index(fields=['check_in_time'], name='entry_check_in_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entrylog',
+            index=models.Index(fields=['check_out_time'], name='entry_check_out_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entrylog',
+            index=models.Index(condition=models.Q(('check_out_time__isnull', True)), fields=['visitor_pass'], name='entry_open_pass_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entrylog',
+            index=models.Index(condition=models.Q(('check_out_time__isnull', True)), fields=['delivery'], name='entry_open_delivery_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entrylog',
+            index=models.Index(condition=models.Q(('check_out_time__isnull', True)), fields=['check_in_time'], name='entry_open_check_in_idx'),
+        ),
+    ]
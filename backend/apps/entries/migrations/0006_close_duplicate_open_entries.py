@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.models import Count, F
+
+
+def close_duplicate_open_entries(apps, schema_editor):
+    EntryLog = apps.get_model("entries", "EntryLog")
+    for field in ("visitor_pass", "delivery"):
+        duplicated = (
+            EntryLog.objects.filter(check_out_time__isnull=True, **{f"{field}__isnull": False})
+            .values(field).annotate(total=Count("id")).filter(total__gt=1).values_list(field, flat=True)
+        )
+        for target_id in duplicated:
+            open_entries = EntryLog.objects.filter(check_out_time__isnull=True, **{field: target_id})
+            keep = open_entries.order_by("check_in_time", "id").first()
+            # Racing double scans: keep the first and close the rest at their own check-in time.
+            open_entries.exclude(id=keep.id).update(check_out_time=F("check_in_time"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("entries", "0005_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_open_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('deliveries', '0002_hot_path_indexes'),
+        ('entries', '0006_close_duplicate_open_entries'),
+        ('gates', '0001_initial'),
+        ('passes', '0004_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='entrylog',
+            constraint=models.UniqueConstraint(condition=models.Q(('check_out_time__isnull', True)), fields=('visitor_pass',), name='unique_open_entry_per_pass'),
+        ),
+        migrations.AddConstraint(
+            model_name='entrylog',
+            constraint=models.UniqueConstraint(condition=models.Q(('check_out_time__isnull', True)), fields=('delivery',), name='unique_open_entry_per_delivery'),
+        ),
+        migrations.RemoveIndex(
+            model_name='entrylog',
+            name='entry_open_pass_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='entrylog',
+            name='entry_open_delivery_idx',
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:25
+
+from django.db import migrations, models
+
+
+def mark_guard_check_outs(apps, schema_editor):
+    # Every check-out before the sweeper was done by a guard, at the gate or synced offline.
+    EntryLog = apps.get_model("entries", "EntryLog")
+    EntryLog.objects.filter(check_out_time__isnull=False).update(check_out_method="guard")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0007_one_open_entry_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entrylog',
+            name='check_out_method',
+            field=models.CharField(blank=True, choices=[('guard', 'Guard'), ('auto', 'Automatic')], max_length=10),
+        ),
+        migrations.RunPython(mark_guard_check_outs, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.core.models import TimestampedModel
 
 
@@ -8,6 +9,10 @@ class EntryLog(TimestampedModel):
         VISITOR = "visitor", "Visitor"
         DELIVERY = "delivery", "Delivery"
 
+    class CheckOutMethod(models.TextChoices):
+        GUARD = "guard", "Guard"
+        AUTO = "auto", "Automatic"
+
     visitor_pass = models.ForeignKey(
         "passes.VisitorPass", on_delete=models.SET_NULL,
         null=True, blank=True, related_name="entry_logs"
@@ -16,6 +21,10 @@ class EntryLog(TimestampedModel):
         "deliveries.Delivery", on_delete=models.SET_NULL,
         null=True, blank=True, related_name="entry_logs"
     )
+    company = models.ForeignKey(
+        "companies.Company", on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="entry_logs"
+    )
     entry_type = models.CharField(max_length=20, choices=EntryType.choices, default=EntryType.VISITOR)
     gate = models.ForeignKey("gates.Gate", on_delete=models.SET_NULL, null=True, related_name="entry_logs")
     checked_in_by = models.ForeignKey(
@@ -26,8 +35,9 @@ class EntryLog(TimestampedModel):
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
         null=True, blank=True, related_name="checkouts_performed"
     )
-    check_in_time = models.DateTimeField(auto_now_add=True)
+    check_in_time = models.DateTimeField(default=timezone.now)
     check_out_time = models.DateTimeField(null=True, blank=True)
+    check_out_method = models.CharField(max_length=10, choices=CheckOutMethod.choices, blank=True)
 
     # Denormalized fields
     visitor_name = models.CharField(max_length=255, blank=True)
@@ -36,6 +46,56 @@ class EntryLog(TimestampedModel):
 
     class Meta:
         ordering = ["-check_in_time"]
+        indexes = [
+            models.Index(fields=["company", "check_in_time"]),
+            models.Index(fields=["check_in_time"], name="entry_check_in_time_idx"),
+            models.Index(fields=["check_out_time"], name="entry_check_out_time_idx"),
+            models.Index(
+                fields=["check_in_time"], condition=models.Q(check_out_time__isnull=True),
+                name="entry_open_check_in_idx",
+            ),
+        ]
+        constraints = [
+            # At most one open entry per pass and per delivery; these double as the
+            # partial indexes for the "still inside" lookups.
+            models.UniqueConstraint(
+                fields=["visitor_pass"], condition=models.Q(check_out_time__isnull=True),
+                name="unique_open_entry_per_pass",
+            ),
+            models.UniqueConstraint(
+                fields=["delivery"], condition=models.Q(check_out_time__isnull=True),
+                name="unique_open_entry_per_delivery",
+            ),
+        ]
 
     def __str__(self):
         return f"Entry: {self.visitor_name} at {self.gate} ({self.check_in_time})"
+
+
+class SyncedScan(TimestampedModel):
+    class Action(models.TextChoices):
+        CHECK_IN = "check_in", "Check In"
+        CHECK_OUT = "check_out", "Check Out"
+
+    class Result(models.TextChoices):
+        APPLIED = "applied", "Applied"
+        CONFLICT = "conflict", "Conflict"
+
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    action = models.CharField(max_length=20, choices=Action.choices)
+    pass_code = models.UUIDField()
+    gate = models.ForeignKey("gates.Gate", on_delete=models.SET_NULL, null=True, related_name="synced_scans")
+    scanned_at = models.DateTimeField()
+    synced_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+        null=True, related_name="synced_scans"
+    )
+    entry = models.ForeignKey(
+        EntryLog, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="synced_scans"
+    )
+    result = models.CharField(max_length=20, choices=Result.choices)
+    detail = models.CharField(max_length=255, blank=True)
+
+    def __str__(self):
+        return f"Synced {self.action} {self.pass_code} ({self.result})"
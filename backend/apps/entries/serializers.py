@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import EntryLog
+from .models import EntryLog, SyncedScan
 
 
 class EntryLogSerializer(serializers.ModelSerializer):
@@ -10,17 +10,17 @@ class EntryLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = EntryLog
         fields = [
-            "id", "visitor_pass", "delivery", "entry_type",
+            "id", "visitor_pass", "delivery", "company", "entry_type",
             "gate", "gate_name",
             "checked_in_by", "checked_in_by_name",
             "checked_out_by", "checked_out_by_name",
-            "check_in_time", "check_out_time",
+            "check_in_time", "check_out_time", "check_out_method",
             "visitor_name", "phone", "company_name",
             "created_at", "updated_at",
         ]
         read_only_fields = [
-            "id", "checked_in_by", "checked_out_by",
-            "check_in_time", "check_out_time", "created_at", "updated_at",
+            "id", "company", "checked_in_by", "checked_out_by",
+            "check_in_time", "check_out_time", "check_out_method", "created_at", "updated_at",
         ]
 
     def get_checked_in_by_name(self, obj):
@@ -45,3 +45,21 @@ class CheckInSerializer(serializers.Serializer):
         if data.get("pass_code") and data.get("delivery_id"):
             raise serializers.ValidationError("Provide either pass_code or delivery_id, not both.")
         return data
+
+
+class OfflineScanSerializer(serializers.Serializer):
+    idempotency_key = serializers.CharField(max_length=64)
+    action = serializers.ChoiceField(choices=SyncedScan.Action.choices)
+    pass_code = serializers.UUIDField()
+    gate = serializers.IntegerField()
+    scanned_at = serializers.DateTimeField()
+
+
+class OfflineSyncSerializer(serializers.Serializer):
+    scans = OfflineScanSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_scans(self, scans):
+        keys = [scan["idempotency_key"] for scan in scans]
+        if len(keys) != len(set(keys)):
+            raise serializers.ValidationError("Idempotency keys must be unique within a batch.")
+        return scans
@@ -0,0 +1,7 @@
+from celery import shared_task
+
+
+@shared_task
+def auto_check_out_entries():
+    from .auto_checkout import auto_check_out
+    return auto_check_out()
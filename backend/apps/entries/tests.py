@@ -1,10 +1,24 @@
+import csv
+import gzip
+import io
+import json
 from datetime import timedelta
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
 from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.analytics.occupancy import get_occupancy, record_occupancy
+from apps.audit.models import AuditLog
 from apps.companies.models import Company, Employee
+from apps.core import exports
+from apps.entries.models import EntryLog
+from apps.entries.tasks import auto_check_out_entries
+from apps.entries.utils import load_pass_manifest
 from apps.gates.models import Gate
+from apps.passes.cache import get_pass_snapshot
 from apps.passes.models import VisitorPass
 
 
@@ -32,3 +46,274 @@ def test_duplicate_check_in_is_rejected(authenticated_guard_client, employee_use
     assert first_response.status_code == 201
     assert second_response.status_code == 400
     assert second_response.data["detail"] == "This pass is already checked in."
+
+
+@pytest.fixture
+def approved_pass(db, employee_user):
+    company = Company.objects.create(name="Test Corp", slug="test-corp")
+    employee = Employee.objects.create(user=employee_user, company=company, employee_id="EMP001")
+    now = timezone.now()
+    return VisitorPass.objects.create(
+        visitor_name="Offline Visitor",
+        visitor_phone="+911234567890",
+        host_company=company,
+        host_employee=employee,
+        valid_from=now - timedelta(hours=1),
+        valid_until=now + timedelta(hours=4),
+        status=VisitorPass.Status.APPROVED,
+        created_by=employee_user,
+    )
+
+
+@pytest.mark.django_db
+def test_manifest_is_signed_and_lists_valid_passes(authenticated_guard_client, approved_pass):
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+
+    response = authenticated_guard_client.get("/api/v1/entries/manifest/", {"gate": gate.id, "hours": 6})
+
+    assert response.status_code == 200
+    assert response.data["count"] == 1
+    manifest = load_pass_manifest(response.data["manifest"])
+    assert manifest["passes"][0][0] == str(approved_pass.pass_code)
+    assert manifest["companies"] == {str(approved_pass.host_company_id): "Test Corp"}
+
+
+@pytest.mark.django_db
+def test_offline_sync_applies_scans_once_and_reports_conflicts(authenticated_guard_client, approved_pass):
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    scanned_at = timezone.now() - timedelta(minutes=30)
+    payload = {
+        "scans": [
+            {
+                "idempotency_key": "scan-1",
+                "action": "check_in",
+                "pass_code": str(approved_pass.pass_code),
+                "gate": gate.id,
+                "scanned_at": scanned_at.isoformat(),
+            },
+            {
+                "idempotency_key": "scan-2",
+                "action": "check_in",
+                "pass_code": str(approved_pass.pass_code),
+                "gate": gate.id,
+                "scanned_at": (scanned_at + timedelta(minutes=1)).isoformat(),
+            },
+        ]
+    }
+
+    first = authenticated_guard_client.post("/api/v1/entries/sync/", payload, format="json")
+    second = authenticated_guard_client.post("/api/v1/entries/sync/", payload, format="json")
+
+    assert first.status_code == 200
+    assert (first.data["applied"], first.data["conflicts"]) == (1, 1)
+    assert first.data["results"][1]["detail"] == "This pass is already checked in."
+    assert second.data["duplicates"] == 2
+    entry = EntryLog.objects.get(visitor_pass=approved_pass)
+    assert entry.check_in_time == scanned_at
+    approved_pass.refresh_from_db()
+    assert approved_pass.status == VisitorPass.Status.CHECKED_IN
+
+
+@pytest.mark.django_db
+def test_check_in_claims_pass_atomically(authenticated_guard_client, approved_pass, django_assert_num_queries):
+    gate = Gate.objects.create(name="Side Gate", code="SIDE")
+    # An open entry the pass status doesn't reflect yet, e.g. a concurrent offline sync.
+    EntryLog.objects.create(visitor_pass=approved_pass, company=approved_pass.host_company, gate=gate)
+    payload = {"pass_code": str(approved_pass.pass_code), "gate": gate.id}
+
+    response = authenticated_guard_client.post("/api/v1/entries/check-in/", payload, format="json")
+
+    assert response.status_code == 400
+    assert response.data["detail"] == "This pass is already checked in."
+    approved_pass.refresh_from_db()
+    assert approved_pass.status == VisitorPass.Status.APPROVED
+
+    EntryLog.objects.filter(visitor_pass=approved_pass).update(check_out_time=timezone.now())
+    get_pass_snapshot(approved_pass.pass_code)
+    # Gate, claim UPDATE, entry INSERT and the audit row, plus the test transaction's savepoint
+    # pair; the rollup bump runs after commit, outside the claim transaction.
+    with django_assert_num_queries(6):
+        response = authenticated_guard_client.post("/api/v1/entries/check-in/", payload, format="json")
+    assert response.status_code == 201
+    approved_pass.refresh_from_db()
+    assert approved_pass.status == VisitorPass.Status.CHECKED_IN
+
+
+@pytest.mark.django_db
+def test_export_streams_scoped_entries(api_client, company_admin_user):
+    managed = Company.objects.create(name="Managed Company", slug="managed-company", admin=company_admin_user)
+    other = Company.objects.create(name="Other Company", slug="other-company")
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    for company in (managed, managed, other):
+        EntryLog.objects.create(company=company, company_name=company.name, gate=gate, visitor_name="Visitor")
+    api_client.force_authenticate(user=company_admin_user)
+
+    response = api_client.get("/api/v1/entries/export/", {"file_format": "csv"})
+    assert response.status_code == 200
+    assert response.streaming
+    rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert [row["company_name"] for row in rows] == ["Managed Company", "Managed Company"]
+    assert rows[0]["gate__name"] == "Main Gate"
+
+    response = api_client.get("/api/v1/entries/export/", {"file_format": "jsonl", "compress": "gzip"})
+    assert response["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["company_name"] == "Managed Company"
+
+
+@pytest.mark.django_db
+def test_export_streams_chunk_by_chunk_under_asgi(settings, monkeypatch, company_admin_user):
+    settings.EXPORT_CHUNK_SIZE = 1
+    managed = Company.objects.create(name="Managed Company", slug="managed-company", admin=company_admin_user)
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    for name in ["Asha", "Bilal", "Chen"]:
+        EntryLog.objects.create(company=managed, company_name=managed.name, gate=gate, visitor_name=name)
+    produced = []
+    export_rows = exports.export_rows
+
+    def counting_export_rows(*args):
+        for chunk in export_rows(*args):
+            produced.append(chunk)
+            yield chunk
+
+    monkeypatch.setattr(exports, "export_rows", counting_export_rows)
+    headers = {"authorization": f"Bearer {RefreshToken.for_user(company_admin_user).access_token}"}
+
+    async def read_export(query):
+        response = await AsyncClient().get("/api/v1/entries/export/", query, headers=headers)
+        assert response.is_async
+        chunks = aiter(response.streaming_content)
+        first = await anext(chunks)
+        # The first chunk goes out before the remaining rows are read from the database.
+        produced_before_first = len(produced)
+        return first, produced_before_first, [chunk async for chunk in chunks]
+
+    first, produced_before_first, rest = async_to_sync(read_export)({"file_format": "csv"})
+    assert (produced_before_first, len(produced)) == (1, 4)
+    rows = list(csv.DictReader(io.StringIO(b"".join([first, *rest]).decode())))
+    assert [row["visitor_name"] for row in rows] == ["Chen", "Bilal", "Asha"]
+
+    produced.clear()
+    first, produced_before_first, rest = async_to_sync(read_export)({"file_format": "jsonl", "compress": "gzip"})
+    # gzip sends its header before asking for any rows.
+    assert (produced_before_first, len(produced)) == (0, 3)
+    assert len(gzip.decompress(b"".join([first, *rest])).decode().splitlines()) == 3
+
+
+@pytest.mark.django_db
+def test_check_in_and_out_publish_gate_events_after_commit(
+    settings, monkeypatch, authenticated_guard_client, approved_pass, django_capture_on_commit_callbacks
+):
+    settings.EVENTS_ENABLED = True
+    published = []
+    monkeypatch.setattr("apps.core.events._publish", lambda payload: published.append(json.loads(payload)))
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    payload = {"pass_code": str(approved_pass.pass_code), "gate": gate.id}
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = authenticated_guard_client.post("/api/v1/entries/check-in/", payload, format="json")
+    assert response.status_code == 201
+    assert published == []
+    for callback in callbacks:
+        callback()
+    entry_id = response.data["id"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_guard_client.post(f"/api/v1/entries/{entry_id}/check-out/")
+    assert response.status_code == 200
+
+    assert [event["type"] for event in published] == ["entry.checked_in", "entry.checked_out"]
+    assert {event["gate"] for event in published} == {gate.id}
+    assert {event["company"] for event in published} == {approved_pass.host_company_id}
+    assert published[0]["data"]["visitor_name"] == "Offline Visitor"
+    assert published[1]["data"]["id"] == entry_id
+
+
+@pytest.mark.django_db
+def test_scan_endpoints_serve_natively_under_asgi(guard_user, employee_user, approved_pass):
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    client = AsyncClient()
+    guard = {"authorization": f"Bearer {RefreshToken.for_user(guard_user).access_token}"}
+    employee = {"authorization": f"Bearer {RefreshToken.for_user(employee_user).access_token}"}
+    check_in_url = "/api/v1/entries/check-in/"
+    payload = {"pass_code": str(approved_pass.pass_code), "gate": gate.id}
+
+    response = async_to_sync(client.post)(check_in_url, payload, content_type="application/json", headers=guard)
+    assert response.status_code == 201
+    entry_id = response.json()["id"]
+    response = async_to_sync(client.get)(f"/api/v1/passes/verify/{approved_pass.pass_code}/")
+    assert response.json()["status"] == VisitorPass.Status.CHECKED_IN
+
+    check_out_url = f"/api/v1/entries/{entry_id}/check-out/"
+    response = async_to_sync(client.post)(check_out_url, headers=guard)
+    assert response.status_code == 200
+    assert response.json()["checked_out_by"] == guard_user.id
+    assert async_to_sync(client.post)(check_out_url, headers=guard).status_code == 404
+    approved_pass.refresh_from_db()
+    assert approved_pass.status == VisitorPass.Status.CHECKED_OUT
+
+    assert async_to_sync(client.get)(check_in_url, headers=guard).status_code == 405
+    assert async_to_sync(client.post)(check_in_url, payload).status_code == 401
+    assert async_to_sync(client.post)(check_in_url, payload, headers=employee).status_code == 403
+
+
+@pytest.mark.django_db
+def test_sweeper_auto_checks_out_stale_entries_in_batches(
+    settings, authenticated_guard_client, approved_pass, employee_user, django_capture_on_commit_callbacks
+):
+    settings.AUTO_CHECKOUT_CHUNK_SIZE = 2
+    settings.AUTO_CHECKOUT_PASS_GRACE_MINUTES = 30
+    settings.AUTO_CHECKOUT_VISITOR_HOURS = 12
+    settings.AUTO_CHECKOUT_DELIVERY_MINUTES = 60
+    client = authenticated_guard_client
+    gate = Gate.objects.create(name="Main Gate", code="MAIN")
+    now = timezone.now()
+    long_stay, current = (
+        VisitorPass.objects.create(
+            visitor_name=name, visitor_phone="+911234567890", host_company=approved_pass.host_company,
+            valid_from=now - timedelta(hours=1), valid_until=now + timedelta(hours=4),
+            status=VisitorPass.Status.APPROVED, created_by=employee_user,
+        )
+        for name in ["Long Stay", "Current"]
+    )
+    visitor_entries = {}
+    for visitor_pass in [approved_pass, long_stay, current]:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                "/api/v1/entries/check-in/", {"pass_code": str(visitor_pass.pass_code), "gate": gate.id}, format="json"
+            )
+        visitor_entries[visitor_pass.id] = response.data["id"]
+    delivery_entries = [
+        EntryLog.objects.create(
+            entry_type=EntryLog.EntryType.DELIVERY, gate=gate, company=approved_pass.host_company,
+            check_in_time=now - timedelta(minutes=minutes), visitor_name="Courier",
+        )
+        for minutes in [90, 10]
+    ]
+    record_occupancy(check_ins=delivery_entries)
+    # The first pass ended over the grace period ago; the second visitor checked in 13 hours ago.
+    VisitorPass.objects.filter(id=approved_pass.id).update(valid_until=now - timedelta(hours=1))
+    EntryLog.objects.filter(id=visitor_entries[long_stay.id]).update(check_in_time=now - timedelta(hours=13))
+    verify_url = f"/api/v1/passes/verify/{long_stay.pass_code}/"
+    assert client.get(verify_url).data["status"] == VisitorPass.Status.CHECKED_IN
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert auto_check_out_entries.delay().get() == 3
+    assert auto_check_out_entries.delay().get() == 0
+
+    swept = {visitor_entries[approved_pass.id], visitor_entries[long_stay.id], delivery_entries[0].id}
+    auto = EntryLog.objects.filter(check_out_method=EntryLog.CheckOutMethod.AUTO)
+    assert set(auto.values_list("id", flat=True)) == swept
+    assert set(EntryLog.objects.filter(check_out_time__isnull=True).values_list("id", flat=True)) == {
+        visitor_entries[current.id], delivery_entries[1].id
+    }
+    assert client.get(verify_url).data["status"] == VisitorPass.Status.CHECKED_OUT
+    approved_pass.refresh_from_db()
+    assert approved_pass.status == VisitorPass.Status.CHECKED_OUT
+    assert sum(get_occupancy().values()) == 2
+    audit = AuditLog.objects.get(action="entries_auto_checked_out")
+    assert (audit.extra_data["visitors"], audit.extra_data["deliveries"]) == (2, 1)
+
+    response = client.post(f"/api/v1/entries/{visitor_entries[current.id]}/check-out/")
+    assert response.data["check_out_method"] == EntryLog.CheckOutMethod.GUARD
@@ -6,5 +6,7 @@ router = DefaultRouter()
 router.register("", views.EntryLogViewSet, basename="entry")
 
 urlpatterns = [
+    path("check-in/", views.check_in, name="entry-check-in"),
+    path("<int:pk>/check-out/", views.check_out, name="entry-check-out"),
     path("", include(router.urls)),
 ]
@@ -0,0 +1,203 @@
+from datetime import timedelta
+
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+
+from apps.analytics.occupancy import record_occupancy
+from apps.analytics.utils import record_entry_rollups
+from apps.core.events import publish_event
+from apps.gates.models import Gate
+from apps.notifications.tasks import notify_visitor_checked_in
+from apps.passes.cache import invalidate_pass_cache
+from apps.passes.models import VisitorPass
+from .models import EntryLog, SyncedScan
+from .serializers import EntryLogSerializer
+
+MANIFEST_SALT = "gatepass.entries.manifest"
+MANIFEST_FIELDS = ["pass_code", "status", "valid_from", "valid_until", "host_company"]
+SCAN_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def build_pass_manifest(gate, hours):
+    now = timezone.now()
+    window_end = now + timedelta(hours=hours)
+    rows = (
+        VisitorPass.objects.filter(
+            status__in=[VisitorPass.Status.APPROVED, VisitorPass.Status.CHECKED_IN],
+            valid_from__lte=window_end,
+            valid_until__gte=now,
+        )
+        .order_by("valid_from", "id")
+        .values_list("pass_code", "status", "valid_from", "valid_until", "host_company_id", "host_company__name")
+    )
+    passes = []
+    companies = {}
+    for pass_code, pass_status, valid_from, valid_until, company_id, company_name in rows:
+        passes.append([str(pass_code), pass_status, int(valid_from.timestamp()), int(valid_until.timestamp()), company_id])
+        companies[str(company_id)] = company_name
+    return {
+        "gate": gate.id,
+        "generated_at": int(now.timestamp()),
+        "expires_at": int(window_end.timestamp()),
+        "fields": MANIFEST_FIELDS,
+        "passes": passes,
+        "companies": companies,
+    }
+
+
+def sign_pass_manifest(manifest):
+    return signing.dumps(manifest, salt=MANIFEST_SALT, compress=True)
+
+
+def load_pass_manifest(token, max_age=None):
+    return signing.loads(token, salt=MANIFEST_SALT, max_age=max_age)
+
+
+def _scan_conflict(scan, visitor_pass, gate, open_entries, now):
+    if visitor_pass is None:
+        return "Pass not found."
+    if gate is None:
+        return "Gate not found."
+    if scan["scanned_at"] > now + SCAN_CLOCK_SKEW:
+        return "Scan time is in the future."
+    open_entry = open_entries.get(visitor_pass.id)
+    if scan["action"] == SyncedScan.Action.CHECK_IN:
+        if open_entry is not None:
+            return "This pass is already checked in."
+        if visitor_pass.status != VisitorPass.Status.APPROVED:
+            return f"Pass status is '{visitor_pass.status}'. Cannot check in."
+        if not visitor_pass.valid_from <= scan["scanned_at"] <= visitor_pass.valid_until:
+            return "Pass was not valid at scan time."
+    else:
+        if open_entry is None:
+            return "No active entry for this pass."
+        if scan["scanned_at"] < open_entry.check_in_time:
+            return "Check-out is earlier than check-in."
+    return ""
+
+
+def reconcile_offline_scans(scans, user):
+    now = timezone.now()
+    keys = [scan["idempotency_key"] for scan in scans]
+    with transaction.atomic():
+        synced = {s.idempotency_key: s for s in SyncedScan.objects.filter(idempotency_key__in=keys)}
+        pending = sorted(
+            (scan for scan in scans if scan["idempotency_key"] not in synced),
+            key=lambda scan: scan["scanned_at"],
+        )
+        passes = {
+            p.pass_code: p
+            for p in VisitorPass.objects.select_for_update().select_related("host_company").filter(
+                pass_code__in={scan["pass_code"] for scan in pending}
+            )
+        }
+        gates = {g.id: g for g in Gate.objects.filter(id__in={scan["gate"] for scan in pending}, is_active=True)}
+        open_entries = {
+            e.visitor_pass_id: e
+            for e in EntryLog.objects.select_for_update().filter(
+                visitor_pass__in=list(passes.values()), check_out_time__isnull=True
+            )
+        }
+
+        created_entries, closed_entries, touched_passes, outcomes = [], [], {}, []
+        for scan in pending:
+            visitor_pass = passes.get(scan["pass_code"])
+            gate = gates.get(scan["gate"])
+            detail = _scan_conflict(scan, visitor_pass, gate, open_entries, now)
+            entry = None
+            if not detail:
+                if scan["action"] == SyncedScan.Action.CHECK_IN:
+                    entry = EntryLog(
+                        visitor_pass=visitor_pass,
+                        company=visitor_pass.host_company,
+                        entry_type=EntryLog.EntryType.VISITOR,
+                        gate=gate,
+                        checked_in_by=user,
+                        check_in_time=scan["scanned_at"],
+                        visitor_name=visitor_pass.visitor_name,
+                        phone=visitor_pass.visitor_phone,
+                        company_name=visitor_pass.host_company.name,
+                    )
+                    open_entries[visitor_pass.id] = entry
+                    created_entries.append(entry)
+                    visitor_pass.status = VisitorPass.Status.CHECKED_IN
+                else:
+                    entry = open_entries.pop(visitor_pass.id)
+                    entry.check_out_time = scan["scanned_at"]
+                    entry.checked_out_by = user
+                    entry.check_out_method = EntryLog.CheckOutMethod.GUARD
+                    entry.updated_at = now
+                    if entry.pk:
+                        closed_entries.append(entry)
+                    visitor_pass.status = VisitorPass.Status.CHECKED_OUT
+                visitor_pass.updated_at = now
+                touched_passes[visitor_pass.id] = visitor_pass
+            outcomes.append((scan, gate, entry, detail))
+
+        EntryLog.objects.bulk_create(created_entries)
+        EntryLog.objects.bulk_update(
+            closed_entries, ["check_out_time", "checked_out_by", "check_out_method", "updated_at"]
+        )
+        check_outs = closed_entries + [entry for entry in created_entries if entry.check_out_time]
+        transaction.on_commit(lambda: record_entry_rollups(check_ins=created_entries, check_outs=check_outs))
+        transaction.on_commit(lambda: record_occupancy(check_ins=created_entries, check_outs=check_outs))
+        VisitorPass.objects.bulk_update(touched_passes.values(), ["status", "updated_at"])
+        invalidate_pass_cache(*(p.pass_code for p in touched_passes.values()))
+        SyncedScan.objects.bulk_create([
+            SyncedScan(
+                idempotency_key=scan["idempotency_key"],
+                action=scan["action"],
+                pass_code=scan["pass_code"],
+                gate=gate,
+                scanned_at=scan["scanned_at"],
+                synced_by=user,
+                entry=entry,
+                result=SyncedScan.Result.CONFLICT if detail else SyncedScan.Result.APPLIED,
+                detail=detail,
+            )
+            for scan, gate, entry, detail in outcomes
+        ])
+        for entry in created_entries:
+            transaction.on_commit(lambda pass_id=entry.visitor_pass_id: notify_visitor_checked_in.delay(pass_id))
+        # Live views only care about what is still on site; late check-outs just close the row.
+        for entry in created_entries:
+            if not entry.check_out_time:
+                publish_event(
+                    "entry.checked_in",
+                    EntryLogSerializer(entry).data,
+                    gate_id=entry.gate_id,
+                    company_id=entry.company_id,
+                )
+        for entry in closed_entries:
+            publish_event(
+                "entry.checked_out",
+                {"id": entry.id, "check_out_time": entry.check_out_time},
+                gate_id=entry.gate_id,
+                company_id=entry.company_id,
+            )
+
+    results = {}
+    for key, record in synced.items():
+        results[key] = {
+            "idempotency_key": key,
+            "result": record.result,
+            "detail": record.detail,
+            "entry": record.entry_id,
+            "duplicate": True,
+        }
+    for scan, _gate, entry, detail in outcomes:
+        results[scan["idempotency_key"]] = {
+            "idempotency_key": scan["idempotency_key"],
+            "result": SyncedScan.Result.CONFLICT if detail else SyncedScan.Result.APPLIED,
+            "detail": detail,
+            "entry": entry.pk if entry is not None and not detail else None,
+            "duplicate": False,
+        }
+    ordered = [results[key] for key in keys]
+    return {
+        "applied": sum(1 for r in ordered if not r["duplicate"] and r["result"] == SyncedScan.Result.APPLIED),
+        "conflicts": sum(1 for r in ordered if not r["duplicate"] and r["result"] == SyncedScan.Result.CONFLICT),
+        "duplicates": sum(1 for r in ordered if r["duplicate"]),
+        "results": ordered,
+    }
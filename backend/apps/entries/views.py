@@ -1,29 +1,218 @@
-from django.db import transaction
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from django.db.models import Q
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from apps.accounts.permissions import IsGuard, IsAdminOrCompanyAdmin
+from apps.analytics.occupancy import record_occupancy
+from apps.analytics.utils import record_entry_rollups
 from apps.audit.utils import log_action
-from apps.companies.models import Company
+from apps.core.async_views import api_response, async_api_view
+from apps.core.events import publish_event
+from apps.core.exports import ExportMixin
 from apps.notifications.tasks import notify_delivery_arrived, notify_visitor_checked_in
+from apps.passes.cache import aget_pass_snapshot, invalidate_pass_cache
 from apps.passes.models import VisitorPass
 from apps.deliveries.models import Delivery
 from apps.gates.models import Gate
 from .models import EntryLog
-from .serializers import EntryLogSerializer, CheckInSerializer
+from .serializers import EntryLogSerializer, CheckInSerializer, OfflineSyncSerializer
+from .utils import build_pass_manifest, reconcile_offline_scans, sign_pass_manifest
 
 
-class EntryLogViewSet(viewsets.ReadOnlyModelViewSet):
+def _get_manifest_hours(request):
+    try:
+        hours = int(request.query_params.get("hours", 12))
+    except (TypeError, ValueError):
+        hours = 12
+    return max(1, min(hours, 48))
+
+
+def _pass_check_in_rejection(pass_id):
+    current = VisitorPass.objects.filter(id=pass_id).values("status").first()
+    if current is None:
+        return api_response({"detail": "Pass not found."}, status=status.HTTP_404_NOT_FOUND)
+    if current["status"] == VisitorPass.Status.CHECKED_IN:
+        return api_response({"detail": "This pass is already checked in."}, status=status.HTTP_400_BAD_REQUEST)
+    if current["status"] != VisitorPass.Status.APPROVED:
+        return api_response(
+            {"detail": f"Pass status is '{current['status']}'. Cannot check in."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    return api_response({"detail": "Pass has expired."}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _delivery_check_in_rejection(delivery):
+    if EntryLog.objects.filter(delivery=delivery, check_out_time__isnull=True).exists():
+        return api_response({"detail": "This delivery already has an active entry."}, status=status.HTTP_400_BAD_REQUEST)
+    return api_response(
+        {"detail": f"Delivery status is '{delivery.status}'. Cannot check in."}, status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def _check_in(request, gate, data, snapshot):
+    entry_kwargs = {
+        "gate": gate,
+        "checked_in_by": request.user,
+    }
+
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            if snapshot is not None:
+                # Claim the pass with a conditional UPDATE: concurrent scans queue on the row lock
+                # and only the first still sees it approved.
+                claimed = VisitorPass.objects.filter(
+                    id=snapshot["id"], status=VisitorPass.Status.APPROVED, valid_until__gte=now
+                ).update(status=VisitorPass.Status.CHECKED_IN, updated_at=now)
+                if not claimed:
+                    return _pass_check_in_rejection(snapshot["id"])
+                invalidate_pass_cache(data["pass_code"])
+                entry_kwargs.update({
+                    "visitor_pass_id": snapshot["id"],
+                    "company_id": snapshot["host_company_id"],
+                    "entry_type": EntryLog.EntryType.VISITOR,
+                    "visitor_name": snapshot["visitor_name"],
+                    "phone": snapshot["visitor_phone"],
+                    "company_name": snapshot["host_company_name"],
+                })
+            else:
+                try:
+                    delivery = Delivery.objects.select_related("company").get(id=data["delivery_id"])
+                except Delivery.DoesNotExist:
+                    return api_response({"detail": "Delivery not found."}, status=status.HTTP_404_NOT_FOUND)
+                claimed = Delivery.objects.filter(id=delivery.id, status=Delivery.Status.EXPECTED).update(
+                    status=Delivery.Status.ARRIVED, updated_at=now
+                )
+                if not claimed:
+                    return _delivery_check_in_rejection(delivery)
+                entry_kwargs.update({
+                    "delivery": delivery,
+                    "company": delivery.company,
+                    "entry_type": EntryLog.EntryType.DELIVERY,
+                    "visitor_name": delivery.delivery_person_name,
+                    "phone": delivery.delivery_person_phone,
+                    "company_name": delivery.company.name,
+                })
+
+            entry = EntryLog.objects.create(check_in_time=now, **entry_kwargs)
+            # Bumped after commit so concurrent scans at one gate don't queue on the shared rollup row.
+            transaction.on_commit(lambda: record_entry_rollups(check_ins=[entry]))
+            transaction.on_commit(lambda: record_occupancy(check_ins=[entry]))
+    except IntegrityError:
+        # The one-open-entry constraint caught a scan that raced past the claim (e.g. offline sync).
+        if snapshot is not None:
+            return api_response({"detail": "This pass is already checked in."}, status=status.HTTP_400_BAD_REQUEST)
+        return api_response({"detail": "This delivery already has an active entry."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if snapshot is not None:
+        log_action(
+            user=request.user,
+            action="visitor_checked_in",
+            resource_type="entry_log",
+            resource_id=entry.id,
+            description=f"Checked in visitor {entry.visitor_name} at {gate.name}.",
+            request=request,
+            extra_data={"visitor_pass_id": entry.visitor_pass_id, "gate_id": gate.id},
+        )
+        pass_id = entry.visitor_pass_id
+        transaction.on_commit(lambda: notify_visitor_checked_in.delay(pass_id))
+    else:
+        log_action(
+            user=request.user,
+            action="delivery_checked_in",
+            resource_type="entry_log",
+            resource_id=entry.id,
+            description=f"Checked in delivery {entry.delivery_id} at {gate.name}.",
+            request=request,
+            extra_data={"delivery_id": entry.delivery_id, "gate_id": gate.id},
+        )
+        delivery_id = entry.delivery_id
+        transaction.on_commit(lambda: notify_delivery_arrived.delay(delivery_id))
+    data = EntryLogSerializer(entry).data
+    publish_event("entry.checked_in", data, gate_id=gate.id, company_id=entry.company_id)
+    return api_response(data, status=status.HTTP_201_CREATED)
+
+
+@async_api_view(["POST"], permission_classes=[IsGuard])
+async def check_in(request):
+    serializer = CheckInSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+
+    try:
+        gate = await Gate.objects.aget(id=data["gate"], is_active=True)
+    except Gate.DoesNotExist:
+        return api_response({"detail": "Gate not found."}, status=status.HTTP_404_NOT_FOUND)
+    snapshot = None
+    if data.get("pass_code"):
+        snapshot = await aget_pass_snapshot(data["pass_code"])
+        if snapshot is None:
+            return api_response({"detail": "Pass not found."}, status=status.HTTP_404_NOT_FOUND)
+    # The async ORM can't open transactions, so the claim and its side effects run in one
+    # sync call (a per-request thread under ASGI).
+    return await sync_to_async(_check_in)(request, gate, data, snapshot)
+
+
+def _checked_out(request, entry):
+    record_entry_rollups(check_outs=[entry])
+    record_occupancy(check_outs=[entry])
+    if entry.visitor_pass:
+        invalidate_pass_cache(entry.visitor_pass.pass_code)
+    log_action(
+        user=request.user,
+        action="entry_checked_out",
+        resource_type="entry_log",
+        resource_id=entry.id,
+        description=f"Checked out {entry.visitor_name}.",
+        request=request,
+        extra_data={"visitor_pass_id": entry.visitor_pass_id, "delivery_id": entry.delivery_id},
+    )
+    publish_event(
+        "entry.checked_out",
+        {"id": entry.id, "check_out_time": entry.check_out_time},
+        gate_id=entry.gate_id,
+        company_id=entry.company_id,
+    )
+
+
+@async_api_view(["POST"], permission_classes=[IsGuard])
+async def check_out(request, pk):
+    now = timezone.now()
+    # Conditional UPDATE, so two guards closing the same entry can't both succeed.
+    closed = await EntryLog.objects.filter(id=pk, check_out_time__isnull=True).aupdate(
+        check_out_time=now, checked_out_by=request.user,
+        check_out_method=EntryLog.CheckOutMethod.GUARD, updated_at=now,
+    )
+    if not closed:
+        return api_response({"detail": "Active entry not found."}, status=status.HTTP_404_NOT_FOUND)
+    entry = await EntryLog.objects.select_related(
+        "gate", "checked_in_by", "checked_out_by", "visitor_pass"
+    ).aget(id=pk)
+    if entry.visitor_pass:
+        await VisitorPass.objects.filter(id=entry.visitor_pass_id).aupdate(
+            status=VisitorPass.Status.CHECKED_OUT, updated_at=now
+        )
+    await sync_to_async(_checked_out)(request, entry)
+    return api_response(EntryLogSerializer(entry).data)
+
+
+class EntryLogViewSet(ExportMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = EntryLogSerializer
     filterset_fields = ["entry_type", "gate"]
     search_fields = ["visitor_name", "phone", "company_name"]
     ordering_fields = ["check_in_time"]
+    pagination_mode = "cursor"
+    cursor_ordering = "-check_in_time"
+    export_columns = [
+        "id", "entry_type", "visitor_name", "phone", "company_name", "visitor_pass__pass_code",
+        "delivery_id", "gate__name", "check_in_time", "checked_in_by__username",
+        "check_out_time", "checked_out_by__username", "check_out_method",
+    ]
 
     def get_permissions(self):
-        if self.action in ["check_in", "check_out"]:
+        if self.action in ["manifest", "sync"]:
             return [IsGuard()]
         return [IsAdminOrCompanyAdmin()]
 
@@ -33,125 +222,52 @@ class EntryLogViewSet(viewsets.ReadOnlyModelViewSet):
         ).all()
         user = self.request.user
         if user.role == "company":
-            companies = Company.objects.filter(admin=user)
-            if not companies.exists():
-                return qs.none()
-            qs = qs.filter(
-                Q(visitor_pass__host_company__admin=user)
-                | Q(delivery__company__admin=user)
-                | Q(company_name__in=companies.values("name"))
-            ).distinct()
+            qs = qs.filter(company__admin=user)
         return qs
 
-    @action(detail=False, methods=["post"], url_path="check-in")
-    def check_in(self, request):
-        serializer = CheckInSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        data = serializer.validated_data
+    @action(detail=False, methods=["get"])
+    def active(self, request):
+        qs = self.get_queryset().filter(check_out_time__isnull=True)
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            return self.get_paginated_response(EntryLogSerializer(page, many=True).data)
+        return Response(EntryLogSerializer(qs, many=True).data)
 
+    @action(detail=False, methods=["get"])
+    def manifest(self, request):
         try:
-            gate = Gate.objects.get(id=data["gate"], is_active=True)
-        except Gate.DoesNotExist:
+            gate = Gate.objects.get(id=request.query_params.get("gate"), is_active=True)
+        except (Gate.DoesNotExist, ValueError, TypeError):
             return Response({"detail": "Gate not found."}, status=status.HTTP_404_NOT_FOUND)
+        manifest = build_pass_manifest(gate, _get_manifest_hours(request))
+        return Response({
+            "gate": gate.id,
+            "generated_at": manifest["generated_at"],
+            "expires_at": manifest["expires_at"],
+            "count": len(manifest["passes"]),
+            "manifest": sign_pass_manifest(manifest),
+        })
 
-        entry_kwargs = {
-            "gate": gate,
-            "checked_in_by": request.user,
-        }
-
-        if data.get("pass_code"):
-            try:
-                visitor_pass = VisitorPass.objects.select_related("host_company").get(pass_code=data["pass_code"])
-            except VisitorPass.DoesNotExist:
-                return Response({"detail": "Pass not found."}, status=status.HTTP_404_NOT_FOUND)
-            if EntryLog.objects.filter(visitor_pass=visitor_pass, check_out_time__isnull=True).exists():
-                return Response({"detail": "This pass is already checked in."}, status=status.HTTP_400_BAD_REQUEST)
-            if visitor_pass.status != VisitorPass.Status.APPROVED:
-                return Response({"detail": f"Pass status is '{visitor_pass.status}'. Cannot check in."}, status=status.HTTP_400_BAD_REQUEST)
-            if visitor_pass.valid_until < timezone.now():
-                return Response({"detail": "Pass has expired."}, status=status.HTTP_400_BAD_REQUEST)
-            visitor_pass.status = VisitorPass.Status.CHECKED_IN
-            visitor_pass.save()
-            entry_kwargs.update({
-                "visitor_pass": visitor_pass,
-                "entry_type": EntryLog.EntryType.VISITOR,
-                "visitor_name": visitor_pass.visitor_name,
-                "phone": visitor_pass.visitor_phone,
-                "company_name": visitor_pass.host_company.name,
-            })
-        elif data.get("delivery_id"):
-            try:
-                delivery = Delivery.objects.select_related("company").get(id=data["delivery_id"])
-            except Delivery.DoesNotExist:
-                return Response({"detail": "Delivery not found."}, status=status.HTTP_404_NOT_FOUND)
-            if EntryLog.objects.filter(delivery=delivery, check_out_time__isnull=True).exists():
-                return Response({"detail": "This delivery already has an active entry."}, status=status.HTTP_400_BAD_REQUEST)
-            if delivery.status != Delivery.Status.EXPECTED:
-                return Response({"detail": f"Delivery status is '{delivery.status}'. Cannot check in."}, status=status.HTTP_400_BAD_REQUEST)
-            delivery.status = "arrived"
-            delivery.save()
-            entry_kwargs.update({
-                "delivery": delivery,
-                "entry_type": EntryLog.EntryType.DELIVERY,
-                "visitor_name": delivery.delivery_person_name,
-                "phone": delivery.delivery_person_phone,
-                "company_name": delivery.company.name,
-            })
-
-        entry = EntryLog.objects.create(**entry_kwargs)
-        if data.get("pass_code"):
-            log_action(
-                user=request.user,
-                action="visitor_checked_in",
-                resource_type="entry_log",
-                resource_id=entry.id,
-                description=f"Checked in visitor {entry.visitor_name} at {gate.name}.",
-                request=request,
-                extra_data={"visitor_pass_id": entry.visitor_pass_id, "gate_id": gate.id},
-            )
-            pass_id = entry.visitor_pass_id
-            transaction.on_commit(lambda: notify_visitor_checked_in.delay(pass_id))
-        else:
-            log_action(
-                user=request.user,
-                action="delivery_checked_in",
-                resource_type="entry_log",
-                resource_id=entry.id,
-                description=f"Checked in delivery {entry.delivery_id} at {gate.name}.",
-                request=request,
-                extra_data={"delivery_id": entry.delivery_id, "gate_id": gate.id},
-            )
-            delivery_id = entry.delivery_id
-            transaction.on_commit(lambda: notify_delivery_arrived.delay(delivery_id))
-        return Response(EntryLogSerializer(entry).data, status=status.HTTP_201_CREATED)
-
-    @action(detail=True, methods=["post"], url_path="check-out")
-    def check_out(self, request, pk=None):
+    @action(detail=False, methods=["post"])
+    def sync(self, request):
+        serializer = OfflineSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         try:
-            entry = EntryLog.objects.get(id=pk, check_out_time__isnull=True)
-        except EntryLog.DoesNotExist:
-            return Response({"detail": "Active entry not found."}, status=status.HTTP_404_NOT_FOUND)
-        entry.check_out_time = timezone.now()
-        entry.checked_out_by = request.user
-        entry.save()
-        if entry.visitor_pass:
-            entry.visitor_pass.status = VisitorPass.Status.CHECKED_OUT
-            entry.visitor_pass.save()
+            summary = reconcile_offline_scans(serializer.validated_data["scans"], request.user)
+        except IntegrityError:
+            return Response(
+                {"detail": "A scan in this batch raced a live check-in. Retry the sync."},
+                status=status.HTTP_409_CONFLICT,
+            )
         log_action(
             user=request.user,
-            action="entry_checked_out",
+            action="offline_scans_synced",
             resource_type="entry_log",
-            resource_id=entry.id,
-            description=f"Checked out {entry.visitor_name}.",
+            description=(
+                f"Synced {summary['applied']} offline scans "
+                f"({summary['conflicts']} conflicts, {summary['duplicates']} duplicates)."
+            ),
             request=request,
-            extra_data={"visitor_pass_id": entry.visitor_pass_id, "delivery_id": entry.delivery_id},
+            extra_data={k: summary[k] for k in ("applied", "conflicts", "duplicates")},
         )
-        return Response(EntryLogSerializer(entry).data)
-
-    @action(detail=False, methods=["get"])
-    def active(self, request):
-        qs = self.get_queryset().filter(check_out_time__isnull=True)
-        page = self.paginate_queryset(qs)
-        if page is not None:
-            return self.get_paginated_response(EntryLogSerializer(page, many=True).data)
-        return Response(EntryLogSerializer(qs, many=True).data)
+        return Response(summary)
@@ -4,6 +4,6 @@ from .models import Notification
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ["id", "channel", "recipient_phone", "recipient_email", "status", "sent_at"]
+    list_display = ["id", "channel", "recipient_phone", "recipient_email", "status", "attempts", "sent_at"]
     list_filter = ["channel", "status"]
     search_fields = ["recipient_phone", "recipient_email"]
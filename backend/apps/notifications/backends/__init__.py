@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Short names accepted in SMS_BACKEND alongside full dotted paths.
+SMS_BACKEND_ALIASES = {
+    "console": "apps.notifications.backends.console.SMSBackend",
+    "locmem": "apps.notifications.backends.locmem.SMSBackend",
+    "twilio": "apps.notifications.backends.twilio.SMSBackend",
+    "msg91": "apps.notifications.backends.msg91.SMSBackend",
+    "gateway": "apps.notifications.backends.gateway.SMSBackend",
+}
+
+
+def get_sms_backend(backend=None, **kwargs):
+    backend = backend or settings.SMS_BACKEND
+    return import_string(SMS_BACKEND_ALIASES.get(backend, backend))(**kwargs)
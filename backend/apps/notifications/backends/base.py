@@ -0,0 +1,59 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class SMSMessage:
+    to: str
+    body: str
+
+
+class BaseSMSBackend:
+    """Base class for SMS backends, in the spirit of Django's email backends.
+
+    Subclasses implement the coroutine send_message(); send_messages() runs up to
+    `concurrency` of them at once on one event loop, so a single worker can keep many
+    provider requests in flight. open()/close() bracket a batch (e.g. an HTTP client).
+    """
+
+    def __init__(self, concurrency=None, **kwargs):
+        self.concurrency = concurrency or settings.SMS_CONCURRENCY
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send_message(self, message):
+        raise NotImplementedError("Subclasses of BaseSMSBackend must implement send_message().")
+
+    async def send_messages(self, messages, before_send=None, after_send=None):
+        """Return one (error, latency_ms) per message, or None where before_send() declined it."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(message):
+            async with semaphore:
+                if before_send is not None and not await before_send():
+                    return None
+                started = time.monotonic()
+                try:
+                    await self.send_message(message)
+                    error = None
+                except Exception as e:
+                    error = str(e) or e.__class__.__name__
+                if after_send is not None:
+                    after_send(error)
+                return error, round((time.monotonic() - started) * 1000)
+
+        await self.open()
+        try:
+            return await asyncio.gather(*(send(message) for message in messages))
+        finally:
+            await self.close()
+
+    def send_messages_sync(self, messages, before_send=None, after_send=None):
+        return asyncio.run(self.send_messages(messages, before_send=before_send, after_send=after_send))
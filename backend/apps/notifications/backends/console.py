@@ -0,0 +1,10 @@
+import logging
+
+from .base import BaseSMSBackend
+
+logger = logging.getLogger(__name__)
+
+
+class SMSBackend(BaseSMSBackend):
+    async def send_message(self, message):
+        logger.info("[SMS] To: %s | Message: %s", message.to, message.body)
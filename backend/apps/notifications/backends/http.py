@@ -0,0 +1,37 @@
+from django.conf import settings
+
+from .base import BaseSMSBackend
+
+
+class HTTPSMSBackend(BaseSMSBackend):
+    """Sends each message as one request through a shared httpx.AsyncClient.
+
+    Subclasses return the request for a message from build_request(); any non-2xx
+    response counts as a failed send.
+    """
+
+    def __init__(self, timeout=None, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout or settings.SMS_HTTP_TIMEOUT
+        self.client = None
+
+    async def open(self):
+        import httpx
+
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def build_request(self, message):
+        raise NotImplementedError("Subclasses of HTTPSMSBackend must implement build_request().")
+
+    async def send_message(self, message):
+        response = await self.client.request(**self.build_request(message))
+        response.raise_for_status()
+        return response
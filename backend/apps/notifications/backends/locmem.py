@@ -0,0 +1,9 @@
+from .base import BaseSMSBackend
+
+# Like django.core.mail.outbox: tests inspect what would have been sent.
+outbox = []
+
+
+class SMSBackend(BaseSMSBackend):
+    async def send_message(self, message):
+        outbox.append(message)
@@ -0,0 +1,13 @@
+from django.conf import settings
+
+from .http import HTTPSMSBackend
+
+
+class SMSBackend(HTTPSMSBackend):
+    def build_request(self, message):
+        return {
+            "method": "POST",
+            "url": f"https://api.twilio.com/2010-04-01/Accounts/{settings.TWILIO_ACCOUNT_SID}/Messages.json",
+            "auth": (settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
+            "data": {"To": message.to, "From": settings.TWILIO_FROM_NUMBER, "Body": message.body},
+        }
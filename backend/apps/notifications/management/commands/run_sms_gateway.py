@@ -0,0 +1,26 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.standin import StandInGateway
+
+
+class Command(BaseCommand):
+    help = "Run a local stand-in SMS gateway for CI and load tests (use with SMS_BACKEND=gateway)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8025)
+        parser.add_argument("--latency-ms", type=int, default=50)
+        parser.add_argument("--failure-rate", type=float, default=0.0)
+
+    def handle(self, *args, **options):
+        gateway = StandInGateway(
+            host=options["host"], port=options["port"],
+            latency_ms=options["latency_ms"], failure_rate=options["failure_rate"],
+        )
+        self.stdout.write(f"Stand-in SMS gateway listening on {gateway.url}")
+        try:
+            asyncio.run(gateway.serve())
+        except KeyboardInterrupt:
+            self.stdout.write(f"Stopped after {gateway.received} messages.")
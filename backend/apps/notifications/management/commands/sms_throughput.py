@@ -0,0 +1,47 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.backends import get_sms_backend
+from apps.notifications.backends.base import SMSMessage
+from apps.notifications.standin import StandInGateway
+
+
+class Command(BaseCommand):
+    help = "Measure SMS dispatch throughput through the configured (or a stand-in) backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, help="Defaults to SMS_CONCURRENCY.")
+        parser.add_argument("--backend", help="Backend name or dotted path (default: SMS_BACKEND).")
+        parser.add_argument(
+            "--stand-in", action="store_true",
+            help="Start an in-process stand-in gateway and send to it with the gateway backend.",
+        )
+        parser.add_argument("--latency-ms", type=int, default=50, help="Stand-in response latency.")
+
+    def handle(self, *args, **options):
+        kwargs = {"concurrency": options["concurrency"]}
+        backend_name = options["backend"]
+        if options["stand_in"]:
+            gateway = StandInGateway(port=0, latency_ms=options["latency_ms"])
+            gateway.start_in_thread()
+            backend_name, kwargs["url"] = "gateway", gateway.url
+        backend = get_sms_backend(backend_name, **kwargs)
+        messages = [SMSMessage(to=f"+9190000{i:05d}", body="GatePass throughput test") for i in range(options["count"])]
+
+        started = time.monotonic()
+        results = backend.send_messages_sync(messages)
+        elapsed = time.monotonic() - started
+
+        latencies = sorted(latency for _error, latency in results)
+        failures = sum(error is not None for error, _latency in results)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0
+        self.stdout.write(
+            f"{backend.__class__.__module__}: sent {len(results) - failures}/{len(results)} "
+            f"in {elapsed:.2f}s ({len(results) / elapsed:.0f} msg/s) at concurrency {backend.concurrency}"
+        )
+        self.stdout.write(f"latency p50={statistics.median(latencies) if latencies else 0:.0f}ms p99={p99}ms")
+        if failures:
+            self.stdout.write(self.style.WARNING(f"{failures} messages failed."))
@@ -12,6 +12,7 @@ class Notification(TimestampedModel):
         PENDING = "pending", "Pending"
         SENT = "sent", "Sent"
         FAILED = "failed", "Failed"
+        DEAD_LETTER = "dead_letter", "Dead Letter"
 
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
@@ -22,9 +23,22 @@ class Notification(TimestampedModel):
     channel = models.CharField(max_length=10, choices=Channel.choices)
     subject = models.CharField(max_length=255, blank=True)
     message = models.TextField()
-    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     error_message = models.TextField(blank=True)
     sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_latency_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["channel", "id"],
+                name="notification_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
 
     def __str__(self):
         return f"Notification ({self.channel}) to {self.recipient_phone or self.recipient_email}"
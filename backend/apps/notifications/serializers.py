@@ -8,5 +8,12 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = [
             "id", "recipient", "recipient_phone", "recipient_email",
             "channel", "subject", "message", "status",
-            "error_message", "sent_at", "created_at",
+            "error_message", "sent_at", "attempts", "next_attempt_at",
+            "last_latency_ms", "created_at",
         ]
+
+
+class NotificationReplaySerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=5000
+    )
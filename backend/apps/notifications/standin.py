@@ -0,0 +1,68 @@
+import asyncio
+import json
+import random
+import threading
+
+
+class StandInGateway:
+    """A minimal keep-alive HTTP server that accepts SMS posts like a provider would.
+
+    Every request waits `latency_ms` and answers 200, or 503 for a `failure_rate`
+    share of them, so dispatch throughput can be measured without a live provider.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8025, latency_ms=50, failure_rate=0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.received = 0
+        self.server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/sms"
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+                await asyncio.sleep(self.latency)
+                self.received += 1
+                failed = random.random() < self.failure_rate
+                status = "503 Service Unavailable" if failed else "200 OK"
+                body = json.dumps({"status": "failed" if failed else "queued", "id": self.received}).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, ready=None):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.set()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def start_in_thread(self):
+        # Serves on its own event loop; returns once the socket is bound (port 0 picks a free one).
+        ready = threading.Event()
+        thread = threading.Thread(target=asyncio.run, args=(self.serve(ready),), daemon=True)
+        thread.start()
+        ready.wait()
+        return thread
@@ -1,79 +1,116 @@
 from celery import shared_task
 from django.conf import settings
-from django.core.mail import send_mail
-from django.utils import timezone
+from django.core.cache import cache
 
 
+@shared_task
+def dispatch_notifications(channel):
+    from .utils import dispatch_pending
+    return dispatch_pending(channel)
+
+
+@shared_task
+def dispatch_all_notifications():
+    from .models import Notification
+    from .utils import schedule_dispatch
+    schedule_dispatch(Notification.Channel.values)
+
+
+# Per-message tasks queued before the batched dispatcher existed still drain through it.
 @shared_task
 def send_sms_notification(notification_id):
     from .models import Notification
-    notification = Notification.objects.get(id=notification_id)
-    try:
-        backend = getattr(settings, "SMS_BACKEND", "console")
-        if backend == "console":
-            print(f"[SMS] To: {notification.recipient_phone} | Message: {notification.message}")
-        elif backend == "twilio":
-            from twilio.rest import Client
-            client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-            client.messages.create(
-                body=notification.message,
-                from_=settings.TWILIO_FROM_NUMBER,
-                to=notification.recipient_phone,
-            )
-        notification.status = Notification.Status.SENT
-        notification.sent_at = timezone.now()
-        notification.save()
-    except Exception as e:
-        notification.status = Notification.Status.FAILED
-        notification.error_message = str(e)
-        notification.save()
+    from .utils import schedule_dispatch
+    schedule_dispatch([Notification.Channel.SMS])
 
 
 @shared_task
 def send_email_notification(notification_id):
     from .models import Notification
-    notification = Notification.objects.get(id=notification_id)
-    try:
-        send_mail(
-            subject=notification.subject,
-            message=notification.message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[notification.recipient_email],
-        )
-        notification.status = Notification.Status.SENT
-        notification.sent_at = timezone.now()
-        notification.save()
-    except Exception as e:
-        notification.status = Notification.Status.FAILED
-        notification.error_message = str(e)
-        notification.save()
+    from .utils import schedule_dispatch
+    schedule_dispatch([Notification.Channel.EMAIL])
 
 
-@shared_task
-def notify_pass_approved(pass_id):
-    from apps.passes.models import VisitorPass
+def _pass_approved_notifications(visitor_pass):
     from .models import Notification
-    visitor_pass = VisitorPass.objects.select_related("host_company").get(id=pass_id)
     pass_url = f"{settings.FRONTEND_URL}/pass/{visitor_pass.pass_code}"
     message = (
         f"Your visitor pass for {visitor_pass.host_company.name} has been approved. "
         f"Show this QR code at the gate: {pass_url}"
     )
+    notifications = []
     if visitor_pass.visitor_phone:
-        notif = Notification.objects.create(
+        notifications.append(Notification(
             recipient_phone=visitor_pass.visitor_phone,
             channel=Notification.Channel.SMS,
             message=message,
-        )
-        send_sms_notification.delay(notif.id)
+        ))
     if visitor_pass.visitor_email:
-        notif = Notification.objects.create(
+        notifications.append(Notification(
             recipient_email=visitor_pass.visitor_email,
             channel=Notification.Channel.EMAIL,
             subject="Your Visitor Pass is Approved",
             message=message,
+        ))
+    return notifications
+
+
+def _recipient(notification):
+    return notification.recipient_phone or notification.recipient_email
+
+
+def _deduplicate(template, keyed_notifications):
+    # cache.add is atomic, so of two identical (channel, recipient, template, resource)
+    # messages inside the window only the first claims the key and is sent.
+    window = settings.NOTIFICATION_DEDUPE_WINDOW
+    if not window:
+        return [notification for _resource_id, notification in keyed_notifications]
+    return [
+        notification for resource_id, notification in keyed_notifications
+        if cache.add(
+            f"notifications:dedupe:{notification.channel}:{_recipient(notification)}:{template}:{resource_id}",
+            1, window,
+        )
+    ]
+
+
+def _create_and_send(template, keyed_notifications):
+    from .models import Notification
+    from .utils import schedule_dispatch
+    notifications = _deduplicate(template, keyed_notifications)
+    Notification.objects.bulk_create(notifications)
+    schedule_dispatch(notif.channel for notif in notifications)
+
+
+@shared_task
+def notify_pass_approved(pass_id):
+    from apps.passes.models import VisitorPass
+    visitor_pass = VisitorPass.objects.select_related("host_company").get(id=pass_id)
+    _create_and_send("pass_approved", [
+        (visitor_pass.id, notification) for notification in _pass_approved_notifications(visitor_pass)
+    ])
+
+
+@shared_task
+def notify_passes_approved(pass_ids):
+    from apps.passes.models import VisitorPass
+    keyed_notifications = []
+    for visitor_pass in VisitorPass.objects.select_related("host_company").filter(id__in=pass_ids):
+        keyed_notifications.extend(
+            (visitor_pass.id, notification) for notification in _pass_approved_notifications(visitor_pass)
         )
-        send_email_notification.delay(notif.id)
+    _create_and_send("pass_approved", keyed_notifications)
+
+
+def _digest_keys(user_id):
+    prefix = f"notifications:digest:{user_id}"
+    return prefix, f"{prefix}:seq", f"{prefix}:flushed", f"{prefix}:scheduled"
+
+
+def _check_in_message(visitor_names):
+    if len(visitor_names) == 1:
+        return f"Your visitor {visitor_names[0]} has checked in at the gate."
+    return f"{len(visitor_names)} of your visitors have checked in at the gate: {', '.join(visitor_names)}."
 
 
 @shared_task
@@ -81,17 +118,66 @@ def notify_visitor_checked_in(pass_id):
     from apps.passes.models import VisitorPass
     from .models import Notification
     visitor_pass = VisitorPass.objects.select_related("host_employee__user").get(id=pass_id)
-    if visitor_pass.host_employee:
-        host_user = visitor_pass.host_employee.user
-        message = f"Your visitor {visitor_pass.visitor_name} has checked in at the gate."
-        if host_user.phone:
-            notif = Notification.objects.create(
-                recipient=host_user,
-                recipient_phone=host_user.phone,
-                channel=Notification.Channel.SMS,
-                message=message,
-            )
-            send_sms_notification.delay(notif.id)
+    if not visitor_pass.host_employee or not visitor_pass.host_employee.user.phone:
+        return
+    host_user = visitor_pass.host_employee.user
+    delay = settings.NOTIFICATION_DIGEST_DELAY
+    if not delay:
+        _create_and_send("visitor_checked_in", [(visitor_pass.id, Notification(
+            recipient=host_user,
+            recipient_phone=host_user.phone,
+            channel=Notification.Channel.SMS,
+            message=_check_in_message([visitor_pass.visitor_name]),
+        ))])
+        return
+
+    # Same-visitor repeats are dropped; everyone else is queued for the host's digest.
+    probe = Notification(recipient_phone=host_user.phone, channel=Notification.Channel.SMS)
+    if not _deduplicate("visitor_checked_in", [(visitor_pass.id, probe)]):
+        return
+    prefix, seq_key, _flushed_key, scheduled_key = _digest_keys(host_user.id)
+    ttl = max(delay * 10, 3600)
+    cache.add(seq_key, 0, ttl)
+    seq = cache.incr(seq_key)
+    cache.set(f"{prefix}:{seq}", visitor_pass.visitor_name, ttl)
+    cache.touch(seq_key, ttl)
+    # The first alert in a quiet period schedules the flush; later ones just join it.
+    if cache.add(scheduled_key, 1, ttl):
+        flush_check_in_digest.apply_async((host_user.id,), countdown=delay)
+
+
+@shared_task
+def flush_check_in_digest(user_id):
+    from django.contrib.auth import get_user_model
+    from .models import Notification
+    prefix, seq_key, flushed_key, scheduled_key = _digest_keys(user_id)
+    # Clear the flag before reading, so an alert queued from here on schedules its own flush.
+    cache.delete(scheduled_key)
+    last = cache.get(seq_key, 0)
+    flushed = cache.get(flushed_key, 0)
+    if last < flushed:
+        # The sequence expired and restarted while the flushed mark outlived it.
+        flushed = 0
+    entries = cache.get_many([f"{prefix}:{seq}" for seq in range(flushed + 1, last + 1)])
+    names = []
+    # Stop at the first gap: that alert is still being written and will flush itself.
+    for seq in range(flushed + 1, last + 1):
+        if f"{prefix}:{seq}" not in entries:
+            break
+        names.append(entries[f"{prefix}:{seq}"])
+    if not names:
+        return
+    cache.set(flushed_key, flushed + len(names), max(settings.NOTIFICATION_DIGEST_DELAY * 10, 3600))
+    cache.delete_many([f"{prefix}:{seq}" for seq in range(flushed + 1, flushed + len(names) + 1)])
+    host_user = get_user_model().objects.filter(id=user_id).first()
+    if host_user is None or not host_user.phone:
+        return
+    _create_and_send("visitor_check_in_digest", [(f"{flushed + 1}-{flushed + len(names)}", Notification(
+        recipient=host_user,
+        recipient_phone=host_user.phone,
+        channel=Notification.Channel.SMS,
+        message=_check_in_message(names),
+    ))])
 
 
 @shared_task
@@ -105,10 +191,9 @@ def notify_delivery_arrived(delivery_id):
         f"has arrived at the gate. OTP: {delivery.otp_code}"
     )
     if user.phone:
-        notif = Notification.objects.create(
+        _create_and_send("delivery_arrived", [(delivery.id, Notification(
             recipient=user,
             recipient_phone=user.phone,
             channel=Notification.Channel.SMS,
             message=message,
-        )
-        send_sms_notification.delay(notif.id)
+        ))])
@@ -0,0 +1,249 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from apps.companies.models import Company, Employee
+from apps.notifications.backends import locmem
+from apps.notifications.backends.base import BaseSMSBackend
+from apps.notifications.models import Notification
+from apps.notifications.tasks import (
+    dispatch_notifications, flush_check_in_digest, notify_pass_approved, notify_visitor_checked_in,
+)
+from apps.notifications.utils import TokenBucket
+from apps.passes.models import VisitorPass
+
+
+class UnreachableSMSBackend(BaseSMSBackend):
+    async def send_message(self, message):
+        raise ConnectionError("gateway unreachable")
+
+
+class UnreachableEmailBackend(BaseEmailBackend):
+    def open(self):
+        raise ConnectionRefusedError("smtp unreachable")
+
+
+class OffLoopCache:
+    """Proxies the cache but fails any call made from inside a running event loop."""
+
+    def __getattr__(self, name):
+        method = getattr(cache, name)
+
+        def call(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return method(*args, **kwargs)
+            raise AssertionError(f"cache.{name}() blocked the event loop")
+
+        return call
+
+
+@pytest.mark.django_db
+def test_dispatcher_sends_pending_notifications_in_batches(settings, django_assert_max_num_queries):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.NOTIFICATION_BATCH_SIZE = 10
+    settings.EMAIL_RATE_LIMIT = 0
+    Notification.objects.bulk_create([
+        Notification(channel=Notification.Channel.EMAIL, recipient_email=f"visitor{i}@example.com", message="Hi")
+        for i in range(25)
+    ])
+
+    # Three full or partial batches plus the final empty read, whatever the row count.
+    with django_assert_max_num_queries(10):
+        assert dispatch_notifications("email") == 25
+
+    assert len(mail.outbox) == 25
+    assert not Notification.objects.exclude(status=Notification.Status.SENT).exists()
+
+
+@pytest.mark.django_db
+def test_dispatcher_is_single_flight_per_channel(settings):
+    settings.SMS_BACKEND = "apps.notifications.tests.UnreachableSMSBackend"
+    Notification.objects.create(channel=Notification.Channel.SMS, recipient_phone="+911234567890", message="Hi")
+    cache.add("notifications:dispatch:sms", 1)
+
+    assert dispatch_notifications("sms") == 0
+    assert cache.get("notifications:dispatch:sms:rerun")
+    assert Notification.objects.get().status == Notification.Status.PENDING
+
+    cache.delete("notifications:dispatch:sms")
+    dispatch_notifications("sms")
+    notification = Notification.objects.get()
+    assert notification.status == Notification.Status.PENDING
+    assert notification.attempts == 1
+    assert notification.next_attempt_at > timezone.now()
+    assert notification.error_message == "gateway unreachable"
+
+
+@pytest.mark.django_db
+def test_failures_back_off_open_the_circuit_and_dead_letter(settings, monkeypatch, authenticated_admin_client):
+    monkeypatch.setattr("apps.notifications.utils.cache", OffLoopCache())
+    settings.SMS_BACKEND = "apps.notifications.tests.UnreachableSMSBackend"
+    settings.SMS_RATE_LIMIT = 0
+    settings.NOTIFICATION_MAX_ATTEMPTS = 3
+    settings.NOTIFICATION_CIRCUIT_THRESHOLD = 2
+    Notification.objects.bulk_create([
+        Notification(channel=Notification.Channel.SMS, recipient_phone=f"+91123456789{i}", message="Hi")
+        for i in range(3)
+    ])
+
+    dispatch_notifications("sms")
+    # The circuit opened after two failures, so the third row was never attempted.
+    assert list(Notification.objects.order_by("id").values_list("attempts", flat=True)) == [1, 1, 0]
+    assert cache.get("notifications:circuit:apps.notifications.tests.UnreachableSMSBackend:open")
+
+    for _ in range(20):
+        if not Notification.objects.exclude(status=Notification.Status.DEAD_LETTER).exists():
+            break
+        cache.delete("notifications:circuit:apps.notifications.tests.UnreachableSMSBackend:open")
+        Notification.objects.update(next_attempt_at=None)
+        dispatch_notifications("sms")
+    assert set(Notification.objects.values_list("status", "attempts")) == {(Notification.Status.DEAD_LETTER, 3)}
+
+    settings.SMS_BACKEND = "locmem"
+    cache.delete("notifications:circuit:apps.notifications.tests.UnreachableSMSBackend:open")
+    replay_id = Notification.objects.order_by("id").values_list("id", flat=True).first()
+    response = authenticated_admin_client.post("/api/v1/notifications/replay/", {"ids": [replay_id]}, format="json")
+
+    assert response.data == {"replayed": 1}
+    replayed = Notification.objects.get(id=replay_id)
+    assert (replayed.status, replayed.attempts) == (Notification.Status.SENT, 1)
+    assert replayed.last_latency_ms is not None
+    assert Notification.objects.filter(status=Notification.Status.DEAD_LETTER).count() == 2
+
+
+@pytest.mark.django_db
+def test_email_provider_down_backs_off_and_dead_letters(settings):
+    settings.EMAIL_BACKEND = "apps.notifications.tests.UnreachableEmailBackend"
+    settings.EMAIL_RATE_LIMIT = 0
+    settings.NOTIFICATION_MAX_ATTEMPTS = 2
+    settings.NOTIFICATION_CIRCUIT_THRESHOLD = 5
+    Notification.objects.bulk_create([
+        Notification(channel=Notification.Channel.EMAIL, recipient_email=f"visitor{i}@example.com", message="Hi")
+        for i in range(3)
+    ])
+
+    assert dispatch_notifications("email") == 0
+    rows = Notification.objects.all()
+    assert {(row.attempts, row.error_message) for row in rows} == {(1, "smtp unreachable")}
+    assert all(row.next_attempt_at for row in rows)
+    assert cache.get("notifications:circuit:email:failures") == 1
+
+    Notification.objects.update(next_attempt_at=None)
+    dispatch_notifications("email")
+    assert set(Notification.objects.values_list("status", "attempts")) == {(Notification.Status.DEAD_LETTER, 2)}
+
+
+def test_token_bucket_limits_rate(monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr("apps.notifications.utils.time.monotonic", lambda: clock["now"])
+    monkeypatch.setattr("apps.notifications.utils.time.sleep", lambda seconds: clock.update(now=clock["now"] + seconds))
+    bucket = TokenBucket(rate=5)
+    for _ in range(15):
+        bucket.acquire()
+    assert clock["now"] == pytest.approx(2.0)
+
+
+def test_token_bucket_terminates_on_rounding_residue(monkeypatch):
+    # A clock that only advances in coarse steps leaves float residue in the bucket;
+    # acquire() must still return after a single sleep.
+    clock = {"now": 0.0, "sleeps": 0}
+
+    def sleep(seconds):
+        clock["sleeps"] += 1
+        clock["now"] += round(seconds, 3)
+
+    monkeypatch.setattr("apps.notifications.utils.time.monotonic", lambda: clock["now"])
+    monkeypatch.setattr("apps.notifications.utils.time.sleep", sleep)
+    bucket = TokenBucket(rate=3)
+    for _ in range(12):
+        bucket.acquire()
+    assert clock["sleeps"] == 9
+
+
+@pytest.mark.django_db
+def test_duplicates_are_dropped_and_check_ins_are_digested(settings, monkeypatch, employee_user):
+    settings.NOTIFICATION_DEDUPE_WINDOW = 600
+    settings.NOTIFICATION_DIGEST_DELAY = 60
+    employee_user.phone = "+919000000000"
+    employee_user.save()
+    company = Company.objects.create(name="Test Corp", slug="test-corp")
+    employee = Employee.objects.create(user=employee_user, company=company, employee_id="EMP001")
+    now = timezone.now()
+    passes = [
+        VisitorPass.objects.create(
+            visitor_name=name,
+            visitor_phone=f"+91123456789{i}",
+            visitor_email=f"visitor{i}@example.com",
+            host_company=company,
+            host_employee=employee,
+            valid_from=now,
+            valid_until=now + timedelta(hours=4),
+            status=VisitorPass.Status.APPROVED,
+            created_by=employee_user,
+        )
+        for i, name in enumerate(["Asha", "Bilal", "Chen"])
+    ]
+
+    notify_pass_approved(passes[0].id)
+    notify_pass_approved(passes[0].id)
+    assert Notification.objects.filter(recipient_phone=passes[0].visitor_phone).count() == 1
+    assert Notification.objects.filter(recipient_email=passes[0].visitor_email).count() == 1
+
+    scheduled = []
+    monkeypatch.setattr(flush_check_in_digest, "apply_async", lambda args, countdown: scheduled.append(countdown))
+    for visitor_pass in (passes[0], passes[1], passes[0], passes[2]):
+        notify_visitor_checked_in(visitor_pass.id)
+    assert scheduled == [60]
+    assert not Notification.objects.filter(recipient=employee_user).exists()
+
+    flush_check_in_digest(employee_user.id)
+    flush_check_in_digest(employee_user.id)
+    digest = Notification.objects.get(recipient=employee_user)
+    assert digest.message == "3 of your visitors have checked in at the gate: Asha, Bilal, Chen."
+
+    # The sequence can expire before the flushed mark; the next alert restarts it at 1.
+    cache.delete(f"notifications:digest:{employee_user.id}:seq")
+    cache.delete(f"notifications:dedupe:sms:{employee_user.phone}:visitor_checked_in:{passes[1].id}")
+    notify_visitor_checked_in(passes[1].id)
+    flush_check_in_digest(employee_user.id)
+    latest = Notification.objects.filter(recipient=employee_user).latest("id")
+    assert latest.message == "Your visitor Bilal has checked in at the gate."
+
+
+@pytest.mark.django_db
+def test_sms_backend_sends_a_batch_concurrently(settings):
+    settings.SMS_RATE_LIMIT = 0
+    settings.SMS_CONCURRENCY = 8
+    locmem.outbox.clear()
+    Notification.objects.bulk_create([
+        Notification(channel=Notification.Channel.SMS, recipient_phone=f"+9190000000{i:02d}", message=f"Hi {i}")
+        for i in range(30)
+    ])
+
+    assert dispatch_notifications("sms") == 30
+
+    assert sorted(message.body for message in locmem.outbox) == sorted(f"Hi {i}" for i in range(30))
+    assert not Notification.objects.filter(last_latency_ms__isnull=True).exists()
+
+
+def test_gateway_backend_round_trips_through_the_stand_in():
+    pytest.importorskip("httpx")
+    from apps.notifications.backends.gateway import SMSBackend
+    from apps.notifications.backends.base import SMSMessage
+    from apps.notifications.standin import StandInGateway
+
+    gateway = StandInGateway(port=0, latency_ms=20, failure_rate=0.0)
+    gateway.start_in_thread()
+    backend = SMSBackend(url=gateway.url, concurrency=25)
+
+    results = backend.send_messages_sync([SMSMessage(to="+919000000000", body="Hi")] * 100)
+
+    assert [error for error, _latency in results] == [None] * 100
+    assert gateway.received == 100
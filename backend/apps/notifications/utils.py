@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .backends import get_sms_backend
+from .backends.base import SMSMessage
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows `rate` sends per second on average, bursting up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        # Takes a token now and returns how long to wait before using it. Tokens may go
+        # negative, so concurrent senders queue up behind each other instead of spinning.
+        if not self.rate:
+            return 0
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate) - 1
+        self.updated = now
+        return max(-self.tokens / self.rate, 0)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+def _rate_limit(channel):
+    if channel == Notification.Channel.SMS:
+        return settings.SMS_RATE_LIMIT
+    return settings.EMAIL_RATE_LIMIT
+
+
+def send_sms_many(notifications, bucket, breaker):
+    # The breaker lives in the cache, so it is read once before the batch and written
+    # once after it; while sending, the hooks only count failures in memory and never
+    # block the event loop on a cache round trip.
+    if breaker.is_open():
+        return [None] * len(notifications)
+    failures = breaker.failures()
+    completed = []
+
+    async def before_send():
+        if _circuit_would_open(failures, completed):
+            return False
+        await bucket.acquire_async()
+        return True
+
+    def after_send(error):
+        completed.append(error)
+
+    messages = [SMSMessage(to=notification.recipient_phone, body=notification.message) for notification in notifications]
+    try:
+        return get_sms_backend().send_messages_sync(messages, before_send=before_send, after_send=after_send)
+    finally:
+        breaker.record_results(completed)
+
+
+def send_email_many(notifications, bucket, breaker):
+    outcomes = []
+    connection = get_connection()
+    started = time.monotonic()
+    try:
+        connection.open()
+    except Exception as e:
+        # Provider unreachable: the whole batch takes the failed attempt, so it backs
+        # off and dead-letters like any other send failure.
+        breaker.record_failure()
+        error = str(e) or e.__class__.__name__
+        return [(error, round((time.monotonic() - started) * 1000))] * len(notifications)
+    # Opening the connection once reuses the SMTP session for the whole batch; sending
+    # each message separately keeps one bad address from failing the rest.
+    with connection:
+        for notification in notifications:
+            if breaker.is_open():
+                outcomes.append(None)
+                continue
+            bucket.acquire()
+            started = time.monotonic()
+            try:
+                connection.send_messages([EmailMessage(
+                    subject=notification.subject,
+                    body=notification.message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[notification.recipient_email],
+                    connection=connection,
+                )])
+                error = None
+                breaker.record_success()
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+                breaker.record_failure()
+            outcomes.append((error, round((time.monotonic() - started) * 1000)))
+    return outcomes
+
+
+# Each sender returns one (error, latency_ms) per notification, or None where it was
+# skipped because the provider's circuit opened part-way through the batch.
+SENDERS = {
+    Notification.Channel.SMS: send_sms_many,
+    Notification.Channel.EMAIL: send_email_many,
+}
+
+
+def provider_name(channel):
+    if channel == Notification.Channel.SMS:
+        return settings.SMS_BACKEND
+    return "email"
+
+
+class CircuitBreaker:
+    """Stops sending through a provider after `threshold` consecutive failures.
+
+    State lives in the cache so every worker sees it. While open, dispatch leaves
+    rows pending; once the cooldown lapses one attempt is let through, and another
+    failure reopens it straight away.
+    """
+
+    def __init__(self, provider):
+        self.failures_key = f"notifications:circuit:{provider}:failures"
+        self.open_key = f"notifications:circuit:{provider}:open"
+
+    def is_open(self):
+        return cache.get(self.open_key) is not None
+
+    def failures(self):
+        return cache.get(self.failures_key, 0)
+
+    def record_success(self):
+        cache.delete(self.failures_key)
+
+    def record_failure(self, count=1):
+        cache.add(self.failures_key, 0, settings.NOTIFICATION_CIRCUIT_COOLDOWN * 10)
+        if cache.incr(self.failures_key, count) >= settings.NOTIFICATION_CIRCUIT_THRESHOLD:
+            cache.set(self.open_key, 1, settings.NOTIFICATION_CIRCUIT_COOLDOWN)
+
+    def record_results(self, errors):
+        # Errors in completion order; only the failures since the last success count.
+        trailing = _trailing_failures(errors)
+        if trailing < len(errors):
+            self.record_success()
+        if trailing:
+            self.record_failure(trailing)
+
+
+def _trailing_failures(errors):
+    trailing = 0
+    for error in errors:
+        trailing = 0 if error is None else trailing + 1
+    return trailing
+
+
+def _circuit_would_open(failures, errors):
+    # Mirrors record_results(): a success resets the count, and only a new failure
+    # opens the circuit, so a half-open breaker still lets its one attempt through.
+    trailing = _trailing_failures(errors)
+    if trailing < len(errors):
+        failures = 0
+    return trailing > 0 and failures + trailing >= settings.NOTIFICATION_CIRCUIT_THRESHOLD
+
+
+def retry_delay(attempts):
+    # Exponential backoff with full jitter, so retries from one outage spread out.
+    ceiling = min(settings.NOTIFICATION_RETRY_MAX_DELAY, settings.NOTIFICATION_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return timedelta(seconds=random.uniform(0, ceiling))
+
+
+def _apply_result(notification, error, latency_ms, now):
+    notification.attempts += 1
+    notification.last_latency_ms = latency_ms
+    notification.updated_at = now
+    if error is None:
+        notification.status = Notification.Status.SENT
+        notification.sent_at = now
+        notification.next_attempt_at = None
+        notification.error_message = ""
+    elif notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = Notification.Status.DEAD_LETTER
+        notification.next_attempt_at = None
+        notification.error_message = error
+    else:
+        notification.next_attempt_at = now + retry_delay(notification.attempts)
+        notification.error_message = error
+
+
+RESULT_FIELDS = ["status", "sent_at", "attempts", "next_attempt_at", "last_latency_ms", "error_message", "updated_at"]
+
+
+def send_batch(channel, notifications, bucket, breaker):
+    """Send one batch; returns the rows attempted (the rest stay untouched if the circuit opens)."""
+    outcomes = SENDERS[channel](notifications, bucket, breaker)
+    attempted = []
+    now = timezone.now()
+    for notification, outcome in zip(notifications, outcomes):
+        if outcome is not None:
+            _apply_result(notification, *outcome, now)
+            attempted.append(notification)
+    Notification.objects.bulk_update(attempted, RESULT_FIELDS)
+    return attempted
+
+
+def due_notifications(channel):
+    return Notification.objects.filter(
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()),
+        channel=channel,
+        status=Notification.Status.PENDING,
+    ).order_by("id")
+
+
+def _dispatch_keys(channel):
+    lock = f"notifications:dispatch:{channel}"
+    return lock, f"{lock}:rerun"
+
+
+def dispatch_pending(channel):
+    """Drain due notifications for one channel in batches.
+
+    Only one dispatcher runs per channel at a time. A caller that finds it busy leaves
+    a rerun flag so nothing created during the final batch is stranded. Failed sends
+    are retried later with backoff (the beat sweep picks them up) until
+    NOTIFICATION_MAX_ATTEMPTS, then dead-lettered.
+    """
+    lock, rerun = _dispatch_keys(channel)
+    cache.set(rerun, 1, settings.NOTIFICATION_DISPATCH_LOCK_TTL)
+    if not cache.add(lock, 1, settings.NOTIFICATION_DISPATCH_LOCK_TTL):
+        return 0
+    cache.delete(rerun)
+    breaker = CircuitBreaker(provider_name(channel))
+    bucket = TokenBucket(_rate_limit(channel))
+    sent = 0
+    try:
+        while not breaker.is_open():
+            batch = list(due_notifications(channel)[:settings.NOTIFICATION_BATCH_SIZE])
+            if not batch:
+                break
+            attempted = send_batch(channel, batch, bucket, breaker)
+            sent += sum(notification.status == Notification.Status.SENT for notification in attempted)
+            cache.touch(lock, settings.NOTIFICATION_DISPATCH_LOCK_TTL)
+        if breaker.is_open():
+            logger.warning("Circuit open for %s; leaving %s notifications pending.", provider_name(channel), channel)
+    finally:
+        cache.delete(lock)
+    if cache.get(rerun):
+        schedule_dispatch([channel])
+    return sent
+
+
+def replay_dead_letters(queryset):
+    channels = set(queryset.order_by().values_list("channel", flat=True).distinct())
+    replayed = queryset.update(
+        status=Notification.Status.PENDING,
+        attempts=0,
+        next_attempt_at=None,
+        error_message="",
+        updated_at=timezone.now(),
+    )
+    schedule_dispatch(channels)
+    return replayed
+
+
+def schedule_dispatch(channels):
+    from .tasks import dispatch_notifications
+
+    for channel in set(channels):
+        dispatch_notifications.delay(channel)
@@ -1,7 +1,12 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
 from apps.accounts.permissions import IsAdmin
+from apps.audit.utils import log_action
 from .models import Notification
-from .serializers import NotificationSerializer
+from .serializers import NotificationReplaySerializer, NotificationSerializer
+from .utils import replay_dead_letters
 
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
@@ -10,6 +15,28 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ["channel", "status"]
     search_fields = ["recipient_phone", "recipient_email", "message"]
     ordering_fields = ["created_at", "sent_at"]
+    pagination_mode = "cursor"
+    cursor_ordering = "-created_at"
 
     def get_queryset(self):
         return Notification.objects.all()
+
+    @action(detail=False, methods=["post"])
+    def replay(self, request):
+        # Requeues the given dead-lettered ids, or every dead letter matching the list filters.
+        serializer = NotificationReplaySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        qs = self.filter_queryset(self.get_queryset()).filter(status=Notification.Status.DEAD_LETTER)
+        ids = serializer.validated_data.get("ids")
+        if ids:
+            qs = qs.filter(id__in=ids)
+        replayed = replay_dead_letters(qs)
+        log_action(
+            user=request.user,
+            action="notifications_replayed",
+            resource_type="notification",
+            description=f"Replayed {replayed} dead-lettered notifications.",
+            request=request,
+            extra_data={"ids": ids or [], "replayed": replayed},
+        )
+        return Response({"replayed": replayed})
@@ -0,0 +1,121 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import VisitorPass
+from .serializers import VisitorPassVerifySerializer
+
+STATS_KEYS = {
+    "hits": "pass-cache:hits",
+    "negative_hits": "pass-cache:negative-hits",
+    "misses": "pass-cache:misses",
+}
+MISSING = {"missing": True}
+
+
+def _cache_key(code):
+    return f"pass:{code}"
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+async def _aincr(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
+
+
+def _parse_code(code):
+    try:
+        return uuid.UUID(str(code))
+    except ValueError:
+        return None
+
+
+def build_pass_snapshot(visitor_pass):
+    return {
+        "id": visitor_pass.id,
+        "status": visitor_pass.status,
+        "valid_from": visitor_pass.valid_from,
+        "valid_until": visitor_pass.valid_until,
+        "visitor_name": visitor_pass.visitor_name,
+        "visitor_phone": visitor_pass.visitor_phone,
+        "host_company_id": visitor_pass.host_company_id,
+        "host_company_name": visitor_pass.host_company.name,
+        "verify": dict(VisitorPassVerifySerializer(visitor_pass).data),
+    }
+
+
+def get_pass_snapshot(code):
+    code = _parse_code(code)
+    if code is None:
+        return None
+    key = _cache_key(code)
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        if snapshot.get("missing"):
+            _incr(STATS_KEYS["negative_hits"])
+            return None
+        _incr(STATS_KEYS["hits"])
+        return snapshot
+
+    _incr(STATS_KEYS["misses"])
+    try:
+        visitor_pass = VisitorPass.objects.select_related(
+            "host_company", "host_employee__user"
+        ).get(pass_code=code)
+    except VisitorPass.DoesNotExist:
+        cache.set(key, MISSING, settings.PASS_CACHE_NEGATIVE_TTL)
+        return None
+    snapshot = build_pass_snapshot(visitor_pass)
+    cache.set(key, snapshot, settings.PASS_CACHE_TTL)
+    return snapshot
+
+
+async def aget_pass_snapshot(code):
+    """get_pass_snapshot() for async views, using the async cache and ORM APIs."""
+    code = _parse_code(code)
+    if code is None:
+        return None
+    key = _cache_key(code)
+    snapshot = await cache.aget(key)
+    if snapshot is not None:
+        if snapshot.get("missing"):
+            await _aincr(STATS_KEYS["negative_hits"])
+            return None
+        await _aincr(STATS_KEYS["hits"])
+        return snapshot
+
+    await _aincr(STATS_KEYS["misses"])
+    try:
+        visitor_pass = await VisitorPass.objects.select_related(
+            "host_company", "host_employee__user"
+        ).aget(pass_code=code)
+    except VisitorPass.DoesNotExist:
+        await cache.aset(key, MISSING, settings.PASS_CACHE_NEGATIVE_TTL)
+        return None
+    snapshot = build_pass_snapshot(visitor_pass)
+    await cache.aset(key, snapshot, settings.PASS_CACHE_TTL)
+    return snapshot
+
+
+def invalidate_pass_cache(*codes):
+    keys = [_cache_key(code) for code in codes]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # Drop again after commit so a concurrent reader can't re-cache pre-commit state.
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_pass_cache_stats():
+    values = cache.get_many(STATS_KEYS.values())
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
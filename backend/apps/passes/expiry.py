@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.audit.utils import log_action
+from .cache import invalidate_pass_cache
+from .models import VisitorPass
+
+EXPIRABLE_STATUSES = [VisitorPass.Status.PENDING, VisitorPass.Status.APPROVED]
+
+
+def expirable_passes(now):
+    return VisitorPass.objects.filter(status__in=EXPIRABLE_STATUSES, valid_until__lt=now)
+
+
+def expire_passes(now=None, chunk_size=None):
+    """Mark pending/approved passes past valid_until as expired; returns how many changed.
+
+    Works through the matching rows in id order, chunk_size at a time and one short
+    transaction each, so no statement locks more than chunk_size rows. On PostgreSQL,
+    rows another transaction holds (a pass being approved or scanned right now) are
+    skipped and picked up by the next run.
+    """
+    now = now or timezone.now()
+    chunk_size = chunk_size or settings.PASS_EXPIRY_CHUNK_SIZE
+    expired, last_id = 0, 0
+    while True:
+        # Keyset over the primary key: each chunk starts after the last id seen, so sparse
+        # ids don't cost empty range scans and skipped rows aren't revisited this run.
+        with transaction.atomic():
+            rows = list(
+                expirable_passes(now).filter(id__gt=last_id)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", "pass_code")[:chunk_size]
+            )
+            if not rows:
+                break
+            expired += expirable_passes(now).filter(id__in=[pass_id for pass_id, _code in rows]).update(
+                status=VisitorPass.Status.EXPIRED, updated_at=now
+            )
+            invalidate_pass_cache(*(pass_code for _pass_id, pass_code in rows))
+        last_id = rows[-1][0]
+
+    if expired:
+        log_action(
+            user=None,
+            action="passes_expired",
+            resource_type="visitor_pass",
+            description=f"Expired {expired} visitor passes past their validity.",
+            extra_data={"count": expired, "cutoff": now.isoformat()},
+        )
+    return expired
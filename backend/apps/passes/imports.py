@@ -0,0 +1,103 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from apps.audit.utils import log_action
+from apps.companies.models import Company, Employee
+from apps.companies.utils import get_employee_profile
+from apps.core.imports import format_errors, run_import_job
+from .models import VisitorPass
+
+
+class VisitorPassImportRowSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = VisitorPass
+        fields = [
+            "visitor_name", "visitor_phone", "visitor_email", "visitor_company",
+            "id_type", "id_number", "vehicle_number", "purpose",
+            "valid_from", "valid_until",
+        ]
+
+    def validate(self, attrs):
+        if attrs["valid_until"] <= attrs["valid_from"]:
+            raise serializers.ValidationError({"valid_until": "Must be after valid_from."})
+        return attrs
+
+
+class VisitorPassImporter:
+    def __init__(self, job):
+        self.job = job
+        self.user = job.created_by
+        self.row_serializer = VisitorPassImportRowSerializer()
+        self.default_company_id = job.params.get("host_company")
+        self.employee_profile = None
+
+        if self.user.role == "admin":
+            companies = Company.objects.filter(is_active=True)
+        elif self.user.role == "company":
+            companies = Company.objects.filter(admin=self.user)
+        else:
+            self.employee_profile = get_employee_profile(self.user)
+            companies = Company.objects.filter(employees=self.employee_profile)
+        self.companies = {}
+        for company_id, slug in companies.values_list("id", "slug"):
+            self.companies[str(company_id)] = company_id
+            self.companies[slug] = company_id
+        if self.default_company_id is None and len(set(self.companies.values())) == 1:
+            self.default_company_id = next(iter(self.companies.values()))
+        self.employees = {
+            (company_id, employee_code): employee_id
+            for employee_id, company_id, employee_code in Employee.objects.filter(
+                company_id__in=set(self.companies.values())
+            ).exclude(employee_id="").values_list("id", "company_id", "employee_id")
+        }
+
+    def resolve_host(self, row):
+        company_ref = row.get("host_company", "")
+        company_id = self.companies.get(company_ref) if company_ref else self.default_company_id
+        if company_id is None:
+            raise serializers.ValidationError({"host_company": "Unknown host company or not one you manage."})
+        if self.employee_profile is not None:
+            return company_id, self.employee_profile.id
+        employee_ref = row.get("host_employee", "")
+        if not employee_ref:
+            return company_id, None
+        employee_id = self.employees.get((company_id, employee_ref))
+        if employee_id is None:
+            raise serializers.ValidationError({"host_employee": "No employee with this ID in the host company."})
+        return company_id, employee_id
+
+    def process_chunk(self, rows):
+        passes, errors = [], []
+        for row_number, row in rows:
+            try:
+                attrs = self.row_serializer.run_validation(row)
+                host_company_id, host_employee_id = self.resolve_host(row)
+            except serializers.ValidationError as exc:
+                errors.append({"row": row_number, "error": format_errors(exc.detail)})
+                continue
+            passes.append(VisitorPass(
+                **attrs,
+                host_company_id=host_company_id,
+                host_employee_id=host_employee_id,
+                created_by=self.user,
+            ))
+        with transaction.atomic():
+            VisitorPass.objects.bulk_create(passes)
+        return len(passes), errors
+
+    def run(self):
+        if self.user.role == "employee" and self.employee_profile is None:
+            self.job.status = self.job.Status.FAILED
+            self.job.detail = "Employee profile not found."
+            self.job.save()
+            return self.job
+        job = run_import_job(self.job, self.process_chunk)
+        log_action(
+            user=self.user,
+            action="passes_imported",
+            resource_type="import_job",
+            resource_id=job.id,
+            description=f"Imported {job.created_count} visitor passes ({job.error_count} rows rejected).",
+            extra_data={"processed_rows": job.processed_rows, "status": job.status},
+        )
+        return job
@@ -1,15 +1,14 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from apps.passes.models import VisitorPass
+
+from apps.passes.expiry import expire_passes
 
 
 class Command(BaseCommand):
-    help = "Mark expired visitor passes as expired"
+    help = "Mark expired visitor passes as expired (also runs from Celery beat)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, help="Rows per transaction (default: PASS_EXPIRY_CHUNK_SIZE).")
 
     def handle(self, *args, **options):
-        now = timezone.now()
-        expired = VisitorPass.objects.filter(
-            status__in=["pending", "approved"],
-            valid_until__lt=now,
-        ).update(status="expired")
+        expired = expire_passes(chunk_size=options["chunk_size"])
         self.stdout.write(self.style.SUCCESS(f"Marked {expired} passes as expired."))
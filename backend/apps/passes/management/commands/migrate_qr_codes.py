@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.passes.models import VisitorPass
+from apps.passes.qr import get_qr_code
+
+
+class Command(BaseCommand):
+    help = "Move passes off stored QR images: warm the rendered-QR cache and delete the stored files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--no-warm", action="store_true", help="Skip pre-rendering QR codes into the cache.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        qs = VisitorPass.objects.exclude(Q(qr_code_image="") | Q(qr_code_image__isnull=True)).order_by("id")
+        total = qs.count()
+        if options["dry_run"]:
+            self.stdout.write(f"{total} passes have stored QR images.")
+            return
+
+        migrated = 0
+        missing_files = 0
+        last_id = 0
+        while True:
+            batch = list(qs.filter(id__gt=last_id).only("id", "pass_code", "qr_code_image")[:batch_size])
+            if not batch:
+                break
+            for visitor_pass in batch:
+                if not options["no_warm"]:
+                    get_qr_code(str(visitor_pass.pass_code), "png")
+                storage = visitor_pass.qr_code_image.storage
+                name = visitor_pass.qr_code_image.name
+                if storage.exists(name):
+                    storage.delete(name)
+                else:
+                    missing_files += 1
+            VisitorPass.objects.filter(id__in=[p.id for p in batch]).update(qr_code_image=None)
+            migrated += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f"Migrated {migrated}/{total} passes...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Cleared stored QR images on {migrated} passes ({missing_files} files were already missing)."
+        ))
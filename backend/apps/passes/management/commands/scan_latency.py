@@ -0,0 +1,69 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.passes.models import VisitorPass
+
+
+def _percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Measure pass-verify latency (p50/p99) under concurrent scan load against a running server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server to load, e.g. a WSGI or ASGI backend.")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--pass-code", action="append", dest="pass_codes",
+            help="Pass to verify (repeatable). Defaults to up to 100 approved passes from the database.",
+        )
+
+    def handle(self, *args, **options):
+        codes = options["pass_codes"] or [
+            str(code) for code in VisitorPass.objects.filter(status=VisitorPass.Status.APPROVED)
+            .values_list("pass_code", flat=True)[:100]
+        ]
+        if not codes:
+            raise CommandError("No approved passes to verify; pass --pass-code.")
+        latencies, failures, elapsed = asyncio.run(self._run(options["url"].rstrip("/"), codes, options))
+
+        self.stdout.write(
+            f"{options['url']}: {len(latencies) - failures}/{len(latencies)} ok in {elapsed:.2f}s "
+            f"({len(latencies) / elapsed:.0f} req/s) at concurrency {options['concurrency']}"
+        )
+        latencies.sort()
+        self.stdout.write(
+            f"latency p50={statistics.median(latencies):.1f}ms p95={_percentile(latencies, 0.95):.1f}ms "
+            f"p99={_percentile(latencies, 0.99):.1f}ms max={latencies[-1]:.1f}ms"
+        )
+        if failures:
+            self.stdout.write(self.style.WARNING(f"{failures} requests failed."))
+
+    async def _run(self, url, codes, options):
+        total, concurrency = options["requests"], options["concurrency"]
+        latencies, failures = [], 0
+        remaining = iter(range(total))
+
+        async def worker(client):
+            nonlocal failures
+            for i in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(f"{url}/api/v1/passes/verify/{codes[i % len(codes)]}/")
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append((time.perf_counter() - started) * 1000)
+                failures += not ok
+
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+            started = time.monotonic()
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+            return latencies, failures, time.monotonic() - started
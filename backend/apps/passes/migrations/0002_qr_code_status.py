@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('passes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitorpass',
+            name='qr_code_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], max_length=20),
+        ),
+    ]
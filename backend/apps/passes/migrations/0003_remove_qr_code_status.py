@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('passes', '0002_qr_code_status'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='visitorpass',
+            name='qr_code_status',
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('passes', '0003_remove_qr_code_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='visitorpass',
+            index=models.Index(fields=['status', 'valid_until'], name='pass_status_valid_until_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorpass',
+            index=models.Index(fields=['created_at'], name='pass_created_at_idx'),
+        ),
+    ]
@@ -41,6 +41,8 @@ class VisitorPass(TimestampedModel):
 
     # Pass
     pass_code = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    # Legacy stored QR images; QR codes are now rendered on demand and the
+    # migrate_qr_codes command clears this field.
     qr_code_image = models.ImageField(upload_to="qr_codes/", blank=True, null=True)
     pass_type = models.CharField(max_length=20, choices=PassType.choices, default=PassType.PRE_APPROVED)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
@@ -63,6 +65,10 @@ class VisitorPass(TimestampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "valid_until"], name="pass_status_valid_until_idx"),
+            models.Index(fields=["created_at"], name="pass_created_at_idx"),
+        ]
 
     def __str__(self):
         return f"Pass {self.pass_code} - {self.visitor_name} -> {self.host_company}"
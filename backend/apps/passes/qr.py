@@ -0,0 +1,54 @@
+import hashlib
+import io
+from functools import lru_cache
+
+import qrcode
+import qrcode.image.svg
+from django.conf import settings
+from django.core.cache import cache
+
+# Bump when the rendering parameters change so cached bytes and ETags roll over.
+QR_RENDER_VERSION = 1
+QR_CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+
+def get_pass_url(pass_code):
+    return f"{settings.FRONTEND_URL}/pass/{pass_code}"
+
+
+def render_qr_code(pass_code, fmt):
+    buffer = io.BytesIO()
+    if fmt == "svg":
+        img = qrcode.make(
+            get_pass_url(pass_code), box_size=10, border=4,
+            image_factory=qrcode.image.svg.SvgPathImage,
+        )
+        img.save(buffer)
+    else:
+        img = qrcode.make(get_pass_url(pass_code), box_size=10, border=4)
+        img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def qr_code_cache_key(pass_code, fmt):
+    return f"qr:{QR_RENDER_VERSION}:{fmt}:{pass_code}"
+
+
+def qr_code_etag(pass_code, fmt):
+    digest = hashlib.sha256(
+        f"{QR_RENDER_VERSION}:{fmt}:{get_pass_url(pass_code)}".encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+@lru_cache(maxsize=settings.QR_CODE_LRU_SIZE)
+def get_qr_code(pass_code, fmt):
+    key = qr_code_cache_key(pass_code, fmt)
+    content = cache.get(key)
+    if content is None:
+        content = render_qr_code(pass_code, fmt)
+        cache.set(key, content, settings.QR_CODE_CACHE_TTL)
+    return content
@@ -1,6 +1,10 @@
+from django.urls import reverse
 from rest_framework import serializers
+from apps.companies.models import Company
 from apps.companies.utils import get_administered_companies, get_employee_profile
+from apps.core.serializers import ImportFileField
 from .models import VisitorPass
+from .qr import get_pass_url
 
 
 class VisitorPassValidationMixin:
@@ -40,12 +44,22 @@ class VisitorPassValidationMixin:
         return attrs
 
 
-class VisitorPassSerializer(VisitorPassValidationMixin, serializers.ModelSerializer):
+class QRCodeURLMixin:
+    def get_qr_code_url(self, obj):
+        if obj.status not in (VisitorPass.Status.APPROVED, VisitorPass.Status.CHECKED_IN):
+            return None
+        url = reverse("visitor-pass-qr", kwargs={"code": obj.pass_code, "fmt": "png"})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class VisitorPassSerializer(QRCodeURLMixin, VisitorPassValidationMixin, serializers.ModelSerializer):
     host_company_name = serializers.CharField(source="host_company.name", read_only=True)
     host_employee_name = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
     approved_by_name = serializers.SerializerMethodField()
     pass_url = serializers.SerializerMethodField()
+    qr_code_url = serializers.SerializerMethodField()
 
     class Meta:
         model = VisitorPass
@@ -53,14 +67,14 @@ class VisitorPassSerializer(VisitorPassValidationMixin, serializers.ModelSeriali
             "id", "visitor_name", "visitor_phone", "visitor_email", "visitor_company",
             "id_type", "id_number", "photo", "vehicle_number", "purpose",
             "host_company", "host_company_name", "host_employee", "host_employee_name",
-            "pass_code", "qr_code_image", "pass_type", "status",
+            "pass_code", "qr_code_url", "pass_type", "status",
             "valid_from", "valid_until",
             "created_by", "created_by_name", "approved_by", "approved_by_name",
             "approved_at", "rejected_reason",
             "pass_url", "created_at", "updated_at",
         ]
         read_only_fields = [
-            "id", "pass_code", "qr_code_image", "status", "created_by",
+            "id", "pass_code", "status", "created_by",
             "approved_by", "approved_at", "created_at", "updated_at",
         ]
 
@@ -80,13 +94,13 @@ class VisitorPassSerializer(VisitorPassValidationMixin, serializers.ModelSeriali
         return None
 
     def get_pass_url(self, obj):
-        from django.conf import settings
-        return f"{settings.FRONTEND_URL}/pass/{obj.pass_code}"
+        return get_pass_url(obj.pass_code)
 
 
-class VisitorPassVerifySerializer(serializers.ModelSerializer):
+class VisitorPassVerifySerializer(QRCodeURLMixin, serializers.ModelSerializer):
     host_company_name = serializers.CharField(source="host_company.name", read_only=True)
     host_employee_name = serializers.SerializerMethodField()
+    qr_code_url = serializers.SerializerMethodField()
 
     class Meta:
         model = VisitorPass
@@ -94,7 +108,7 @@ class VisitorPassVerifySerializer(serializers.ModelSerializer):
             "id", "visitor_name", "visitor_phone", "visitor_company",
             "id_type", "id_number", "photo", "vehicle_number", "purpose",
             "host_company_name", "host_employee_name",
-            "qr_code_image", "pass_type", "status", "valid_from", "valid_until",
+            "qr_code_url", "pass_type", "status", "valid_from", "valid_until",
         ]
 
     def get_host_employee_name(self, obj):
@@ -111,3 +125,26 @@ class WalkInPassSerializer(VisitorPassValidationMixin, serializers.ModelSerializ
             "id_type", "id_number", "photo", "vehicle_number", "purpose",
             "host_company", "host_employee", "valid_from", "valid_until",
         ]
+
+
+class BulkPassActionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=5000
+    )
+    reason = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class VisitorPassImportSerializer(serializers.Serializer):
+    file = ImportFileField()
+    host_company = serializers.PrimaryKeyRelatedField(queryset=Company.objects.all(), required=False)
+
+    def validate_host_company(self, company):
+        request = self.context.get("request")
+        if request and request.user.role == "company":
+            if not get_administered_companies(request.user).filter(id=company.id).exists():
+                raise serializers.ValidationError("You can only import passes for your own company.")
+        if request and request.user.role == "employee":
+            employee_profile = get_employee_profile(request.user)
+            if employee_profile is None or employee_profile.company_id != company.id:
+                raise serializers.ValidationError("You can only import passes for your own company.")
+        return company
@@ -0,0 +1,54 @@
+from celery import shared_task
+from django.core.cache import cache
+from django.db import transaction
+
+from .qr import get_qr_code
+
+QR_RENDER_BATCH_SIZE = 200
+QR_RENDER_LOCK_TTL = 600
+
+
+def _render_lock_key(pass_id):
+    return f"qr-render:{pass_id}"
+
+
+def schedule_qr_render(pass_ids):
+    pass_ids = [pass_id for pass_id in pass_ids if cache.add(_render_lock_key(pass_id), 1, QR_RENDER_LOCK_TTL)]
+    for start in range(0, len(pass_ids), QR_RENDER_BATCH_SIZE):
+        batch = pass_ids[start:start + QR_RENDER_BATCH_SIZE]
+        transaction.on_commit(lambda batch=batch: render_pass_qr_codes.delay(batch))
+
+
+@shared_task(bind=True, max_retries=3)
+def render_pass_qr_codes(self, pass_ids):
+    from .models import VisitorPass
+
+    rendered, failed = [], []
+    for pass_id, pass_code in VisitorPass.objects.filter(id__in=pass_ids).values_list("id", "pass_code"):
+        try:
+            get_qr_code(str(pass_code), "png")
+        except Exception:
+            failed.append(pass_id)
+            continue
+        rendered.append(pass_id)
+
+    cache.delete_many([_render_lock_key(pass_id) for pass_id in rendered])
+    if failed:
+        if self.request.retries < self.max_retries:
+            raise self.retry(args=[failed], countdown=10 * 2 ** self.request.retries)
+        cache.delete_many([_render_lock_key(pass_id) for pass_id in failed])
+    return {"rendered": len(rendered), "failed": len(failed)}
+
+
+@shared_task
+def import_visitor_passes(job_id):
+    from apps.core.models import ImportJob
+    from .imports import VisitorPassImporter
+    job = ImportJob.objects.select_related("created_by").get(id=job_id)
+    VisitorPassImporter(job).run()
+
+
+@shared_task
+def expire_visitor_passes():
+    from .expiry import expire_passes
+    return expire_passes()
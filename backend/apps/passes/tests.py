@@ -1,9 +1,19 @@
+import io
+
 import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
+from apps.audit.models import AuditLog
 from apps.companies.models import Company, Employee
+from apps.notifications.models import Notification
 from apps.passes.models import VisitorPass
+from apps.passes.qr import qr_code_etag
+from apps.passes.tasks import expire_visitor_passes
 
 
 @pytest.fixture
@@ -61,4 +71,208 @@ class TestVisitorPasses:
         response = api_client.get(verify_url)
 
         assert response.status_code == 200
-        assert response.data["qr_code_image"]
+        assert response.data["qr_code_url"].endswith(f"/passes/{visitor_pass.pass_code}/qr.png")
+
+    def test_qr_code_is_rendered_on_demand_with_cache_headers(self, api_client, visitor_pass):
+        url = reverse("visitor-pass-qr", kwargs={"code": visitor_pass.pass_code, "fmt": "png"})
+        response = api_client.get(url)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "image/png"
+        assert response.content.startswith(b"\x89PNG")
+        assert "immutable" in response["Cache-Control"]
+
+        revalidated = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert revalidated.status_code == 304
+
+        svg = api_client.get(reverse("visitor-pass-qr", kwargs={"code": visitor_pass.pass_code, "fmt": "svg"}))
+        assert svg["Content-Type"] == "image/svg+xml"
+        assert svg["ETag"] != response["ETag"]
+
+    def test_qr_code_for_unknown_pass_is_404(self, api_client):
+        url = reverse("visitor-pass-qr", kwargs={"code": "00000000-0000-0000-0000-000000000000", "fmt": "png"})
+        assert api_client.get(url).status_code == 404
+        etag = qr_code_etag("00000000-0000-0000-0000-000000000000", "png")
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 404
+
+    def test_migrate_qr_codes_clears_stored_images(self, visitor_pass):
+        visitor_pass.qr_code_image.save("qr_legacy.png", ContentFile(b"png"), save=True)
+        stored_name = visitor_pass.qr_code_image.name
+
+        call_command("migrate_qr_codes", stdout=io.StringIO())
+
+        visitor_pass.refresh_from_db()
+        assert not visitor_pass.qr_code_image
+        assert not default_storage.exists(stored_name)
+
+    def test_verify_is_served_from_cache_until_status_changes(
+        self, api_client, authenticated_admin_client, visitor_pass, django_assert_num_queries
+    ):
+        url = f"/api/v1/passes/verify/{visitor_pass.pass_code}/"
+        api_client.get(url)
+        with django_assert_num_queries(0):
+            cached = api_client.get(url)
+        assert cached.data["status"] == "pending"
+
+        authenticated_admin_client.post(reverse("visitor-pass-approve", args=[visitor_pass.id]))
+
+        assert api_client.get(url).data["status"] == "approved"
+        stats = authenticated_admin_client.get(reverse("visitor-pass-cache-stats")).data
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_unknown_pass_code_is_negatively_cached(self, api_client, authenticated_admin_client):
+        url = "/api/v1/passes/verify/00000000-0000-0000-0000-000000000000/"
+        api_client.get(url)
+        assert api_client.get(url).status_code == 404
+        stats = authenticated_admin_client.get(reverse("visitor-pass-cache-stats")).data
+        assert stats["negative_hits"] == 1
+
+
+@pytest.mark.django_db
+def test_bulk_approve_is_scoped_and_reports_per_id(
+    authenticated_company_client, company_admin_user, employee_user, django_capture_on_commit_callbacks
+):
+    company = Company.objects.create(name="Managed Corp", slug="managed-corp", admin=company_admin_user)
+    other_company = Company.objects.create(name="Other Corp", slug="other-corp")
+    now = timezone.now()
+
+    def make_pass(host_company, status=VisitorPass.Status.PENDING):
+        return VisitorPass.objects.create(
+            visitor_name="Conference Guest",
+            visitor_phone="+911234567890",
+            host_company=host_company,
+            valid_from=now,
+            valid_until=now + timedelta(hours=8),
+            status=status,
+            created_by=employee_user,
+        )
+
+    pending = make_pass(company)
+    already_approved = make_pass(company, VisitorPass.Status.APPROVED)
+    foreign = make_pass(other_company)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_company_client.post(
+            reverse("visitor-pass-bulk-approve"),
+            {"ids": [pending.id, already_approved.id, foreign.id]},
+            format="json",
+        )
+
+    assert response.status_code == 200
+    assert response.data["processed"] == 1
+    assert [r["status"] for r in response.data["results"]] == ["approved", "error", "error"]
+    assert response.data["results"][2]["detail"] == "Pass not found."
+    pending.refresh_from_db()
+    foreign.refresh_from_db()
+    assert pending.status == VisitorPass.Status.APPROVED
+    assert pending.approved_by == company_admin_user
+    assert foreign.status == VisitorPass.Status.PENDING
+    assert AuditLog.objects.filter(action="pass_approved", resource_id=str(pending.id)).exists()
+    assert Notification.objects.filter(recipient_phone="+911234567890").count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_reject_records_reason(authenticated_admin_client, visitor_pass):
+    response = authenticated_admin_client.post(
+        reverse("visitor-pass-bulk-reject"),
+        {"ids": [visitor_pass.id], "reason": "Event cancelled"},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    visitor_pass.refresh_from_db()
+    assert visitor_pass.status == VisitorPass.Status.REJECTED
+    assert visitor_pass.rejected_reason == "Event cancelled"
+
+
+@pytest.mark.django_db
+def test_bulk_import_creates_passes_and_reports_row_errors(
+    authenticated_company_client, company_admin_user, employee_user, django_capture_on_commit_callbacks
+):
+    company = Company.objects.create(name="Event Corp", slug="event-corp", admin=company_admin_user)
+    Employee.objects.create(user=employee_user, company=company, employee_id="E001")
+    csv_content = (
+        "visitor_name,visitor_phone,host_employee,valid_from,valid_until\n"
+        "Guest One,+911111111111,E001,2026-05-01T09:00:00+05:30,2026-05-01T18:00:00+05:30\n"
+        "Guest Two,+912222222222,,2026-05-01T09:00:00+05:30,2026-05-01T18:00:00+05:30\n"
+        ",+913333333333,,2026-05-01T09:00:00+05:30,2026-05-01T18:00:00+05:30\n"
+        "Guest Four,+914444444444,E999,2026-05-01T09:00:00+05:30,2026-05-01T18:00:00+05:30\n"
+    )
+    upload = SimpleUploadedFile("guests.csv", csv_content.encode(), content_type="text/csv")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_company_client.post(
+            reverse("visitor-pass-bulk-import"), {"file": upload}, format="multipart"
+        )
+
+    assert response.status_code == 202
+    job = authenticated_company_client.get(reverse("import-job-detail", args=[response.data["id"]])).data
+    assert job["status"] == "completed"
+    assert (job["processed_rows"], job["created_count"], job["error_count"]) == (4, 2, 2)
+    assert VisitorPass.objects.filter(host_company=company, status="pending").count() == 2
+    assert VisitorPass.objects.get(visitor_name="Guest One").host_employee.employee_id == "E001"
+
+    report = authenticated_company_client.get(reverse("import-job-error-report", args=[job["id"]]))
+    rows = b"".join(report.streaming_content).decode().splitlines()
+    assert rows[0] == "row,error"
+    assert rows[1].startswith("4,visitor_name")
+    assert rows[2].startswith("5,host_employee")
+
+
+@pytest.mark.django_db
+def test_bulk_import_reads_xlsx(authenticated_admin_client, company, django_capture_on_commit_callbacks):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["visitor_name", "visitor_phone", "host_company", "valid_from", "valid_until"])
+    sheet.append(["Sheet Guest", 911234567890, company.slug, datetime(2026, 5, 1, 9), datetime(2026, 5, 1, 18)])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    upload = SimpleUploadedFile("guests.xlsx", buffer.getvalue())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_admin_client.post(
+            reverse("visitor-pass-bulk-import"), {"file": upload}, format="multipart"
+        )
+
+    assert response.status_code == 202
+    visitor_pass = VisitorPass.objects.get(visitor_name="Sheet Guest")
+    assert visitor_pass.visitor_phone == "911234567890"
+    assert visitor_pass.host_company == company
+
+
+@pytest.mark.django_db
+def test_expiry_task_expires_in_chunks_and_writes_one_audit_record(api_client, company, employee_user, settings):
+    settings.PASS_EXPIRY_CHUNK_SIZE = 2
+    now = timezone.now()
+
+    def make_pass(status, valid_until):
+        return VisitorPass.objects.create(
+            visitor_name="Visitor", visitor_phone="+911234567890", host_company=company,
+            valid_from=valid_until - timedelta(hours=2), valid_until=valid_until, status=status,
+            created_by=employee_user,
+        )
+
+    stale = [
+        make_pass(status, now - timedelta(hours=1))
+        for status in [VisitorPass.Status.PENDING, *[VisitorPass.Status.APPROVED] * 4]
+    ]
+    current = make_pass(VisitorPass.Status.APPROVED, now + timedelta(hours=1))
+    on_site = make_pass(VisitorPass.Status.CHECKED_IN, now - timedelta(hours=1))
+    verify_url = f"/api/v1/passes/verify/{stale[1].pass_code}/"
+    assert api_client.get(verify_url).data["status"] == VisitorPass.Status.APPROVED
+
+    assert expire_visitor_passes.delay().get() == 5
+    assert expire_visitor_passes.delay().get() == 0
+
+    assert set(VisitorPass.objects.filter(status=VisitorPass.Status.EXPIRED).values_list("id", flat=True)) == {
+        visitor_pass.id for visitor_pass in stale
+    }
+    current.refresh_from_db()
+    on_site.refresh_from_db()
+    assert (current.status, on_site.status) == (VisitorPass.Status.APPROVED, VisitorPass.Status.CHECKED_IN)
+    assert api_client.get(verify_url).data["status"] == VisitorPass.Status.EXPIRED
+    audit = AuditLog.objects.get(action="passes_expired")
+    assert audit.extra_data["count"] == 5
@@ -1,4 +1,4 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 from . import views
 
@@ -6,5 +6,11 @@ router = DefaultRouter()
 router.register("", views.VisitorPassViewSet, basename="visitor-pass")
 
 urlpatterns = [
+    re_path(
+        r"^(?P<code>[0-9a-f-]{36})/qr\.(?P<fmt>png|svg)$",
+        views.pass_qr_code,
+        name="visitor-pass-qr",
+    ),
+    path("verify/<str:code>/", views.verify_pass, name="visitor-pass-verify"),
     path("", include(router.urls)),
 ]
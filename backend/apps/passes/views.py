@@ -1,41 +1,72 @@
-import io
-import qrcode
-from django.conf import settings
-from django.core.files.base import ContentFile
+from celery import group
 from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.utils import timezone
+from django.views.decorators.http import etag, require_GET
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from apps.accounts.permissions import IsAdminOrCompanyAdmin, IsAdminOrCompanyAdminOrEmployee, IsGuard
-from apps.audit.utils import log_action
+from apps.accounts.permissions import IsAdmin, IsAdminOrCompanyAdmin, IsAdminOrCompanyAdminOrEmployee, IsGuard
+from apps.audit.utils import build_audit_log, log_action, log_actions
 from apps.companies.utils import get_employee_profile
-from apps.notifications.tasks import notify_pass_approved
+from apps.core.async_views import api_response, async_api_view
+from apps.core.events import publish_event
+from apps.core.exports import ExportMixin
+from apps.core.models import ImportJob
+from apps.core.serializers import ImportJobSerializer
+from apps.notifications.tasks import notify_pass_approved, notify_passes_approved
+from .cache import aget_pass_snapshot, get_pass_cache_stats, get_pass_snapshot, invalidate_pass_cache
 from .models import VisitorPass
-from .serializers import VisitorPassSerializer, VisitorPassVerifySerializer, WalkInPassSerializer
+from .qr import QR_CONTENT_TYPES, get_qr_code, qr_code_etag
+from .serializers import (
+    BulkPassActionSerializer, VisitorPassImportSerializer, VisitorPassSerializer, WalkInPassSerializer,
+)
+from .tasks import import_visitor_passes, render_pass_qr_codes, schedule_qr_render
 
 
-def generate_qr_code(pass_obj):
-    url = f"{settings.FRONTEND_URL}/pass/{pass_obj.pass_code}"
-    img = qrcode.make(url, box_size=10, border=4)
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
-    pass_obj.qr_code_image.save(
-        f"qr_{pass_obj.pass_code}.png",
-        ContentFile(buffer.read()),
-        save=True,
-    )
+def _pass_qr_etag(request, code, fmt):
+    # No ETag for unknown passes, so If-None-Match can't turn their 404 into a 304.
+    if get_pass_snapshot(code) is None:
+        return None
+    return qr_code_etag(code, fmt)
 
 
-class VisitorPassViewSet(viewsets.ModelViewSet):
+@require_GET
+@etag(_pass_qr_etag)
+def pass_qr_code(request, code, fmt):
+    if get_pass_snapshot(code) is None:
+        raise Http404("Pass not found.")
+    response = HttpResponse(get_qr_code(str(code), fmt), content_type=QR_CONTENT_TYPES[fmt])
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+@async_api_view(["GET"], permission_classes=[AllowAny])
+async def verify_pass(request, code):
+    snapshot = await aget_pass_snapshot(code)
+    if snapshot is None:
+        return api_response({"detail": "Pass not found."}, status=status.HTTP_404_NOT_FOUND)
+    data = dict(snapshot["verify"])
+    for field in ("photo", "qr_code_url"):
+        if data.get(field):
+            data[field] = request.build_absolute_uri(data[field])
+    return api_response(data)
+
+
+class VisitorPassViewSet(ExportMixin, viewsets.ModelViewSet):
     serializer_class = VisitorPassSerializer
     permission_classes = [IsAdminOrCompanyAdminOrEmployee]
     filterset_fields = ["status", "pass_type", "host_company"]
     search_fields = ["visitor_name", "visitor_phone", "visitor_email", "pass_code"]
     ordering_fields = ["created_at", "valid_from"]
+    export_columns = [
+        "id", "pass_code", "visitor_name", "visitor_phone", "visitor_email", "visitor_company",
+        "id_type", "id_number", "vehicle_number", "purpose", "host_company__name",
+        "host_employee__user__username", "pass_type", "status", "valid_from", "valid_until",
+        "created_by__username", "approved_by__username", "approved_at", "rejected_reason", "created_at",
+    ]
 
     def get_queryset(self):
         qs = VisitorPass.objects.select_related(
@@ -68,6 +99,15 @@ class VisitorPassViewSet(viewsets.ModelViewSet):
             request=self.request,
         )
 
+    def perform_update(self, serializer):
+        visitor_pass = serializer.save()
+        invalidate_pass_cache(visitor_pass.pass_code)
+
+    def perform_destroy(self, instance):
+        pass_code = instance.pass_code
+        instance.delete()
+        invalidate_pass_cache(pass_code)
+
     @action(detail=True, methods=["post"], permission_classes=[IsAdminOrCompanyAdmin])
     def approve(self, request, pk=None):
         visitor_pass = self.get_object()
@@ -80,7 +120,8 @@ class VisitorPassViewSet(viewsets.ModelViewSet):
         visitor_pass.approved_by = request.user
         visitor_pass.approved_at = timezone.now()
         visitor_pass.save()
-        generate_qr_code(visitor_pass)
+        invalidate_pass_cache(visitor_pass.pass_code)
+        schedule_qr_render([visitor_pass.id])
         log_action(
             user=request.user,
             action="pass_approved",
@@ -90,6 +131,11 @@ class VisitorPassViewSet(viewsets.ModelViewSet):
             request=request,
         )
         transaction.on_commit(lambda: notify_pass_approved.delay(visitor_pass.id))
+        publish_event(
+            "pass.approved",
+            {"id": visitor_pass.id, "visitor_name": visitor_pass.visitor_name, "valid_from": visitor_pass.valid_from},
+            company_id=visitor_pass.host_company_id,
+        )
         return Response(self.get_serializer(visitor_pass).data)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAdminOrCompanyAdmin])
@@ -103,6 +149,7 @@ class VisitorPassViewSet(viewsets.ModelViewSet):
         visitor_pass.status = VisitorPass.Status.REJECTED
         visitor_pass.rejected_reason = request.data.get("reason", "")
         visitor_pass.save()
+        invalidate_pass_cache(visitor_pass.pass_code)
         log_action(
             user=request.user,
             action="pass_rejected",
@@ -114,15 +161,98 @@ class VisitorPassViewSet(viewsets.ModelViewSet):
         )
         return Response(self.get_serializer(visitor_pass).data)
 
-    @action(detail=False, methods=["get"], url_path="verify/(?P<code>[^/.]+)", permission_classes=[AllowAny])
-    def verify(self, request, code=None):
-        try:
-            visitor_pass = VisitorPass.objects.select_related(
-                "host_company", "host_employee__user"
-            ).get(pass_code=code)
-        except VisitorPass.DoesNotExist:
-            return Response({"detail": "Pass not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(VisitorPassVerifySerializer(visitor_pass, context={"request": request}).data)
+    def _bulk_transition(self, request, new_status):
+        serializer = BulkPassActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+        reason = serializer.validated_data["reason"]
+        approving = new_status == VisitorPass.Status.APPROVED
+        now = timezone.now()
+
+        with transaction.atomic():
+            found = dict(
+                self.get_queryset().select_related(None).select_for_update()
+                .filter(id__in=ids).values_list("id", "status")
+            )
+            pending_ids = [pass_id for pass_id in ids if found.get(pass_id) == VisitorPass.Status.PENDING]
+            changes = {"status": new_status, "updated_at": now}
+            if approving:
+                changes.update(approved_by=request.user, approved_at=now)
+            else:
+                changes["rejected_reason"] = reason
+            VisitorPass.objects.filter(id__in=pending_ids).update(**changes)
+            changed = list(VisitorPass.objects.filter(id__in=pending_ids).values_list(
+                "id", "pass_code", "visitor_name", "host_company_id", "valid_from"
+            ))
+            verb = "Approved" if approving else "Rejected"
+            log_actions([
+                build_audit_log(
+                    user=request.user,
+                    action="pass_approved" if approving else "pass_rejected",
+                    resource_type="visitor_pass",
+                    resource_id=pass_id,
+                    description=f"{verb} visitor pass for {visitor_name}.",
+                    request=request,
+                    extra_data={"bulk": True} if approving else {"bulk": True, "reason": reason},
+                )
+                for pass_id, _pass_code, visitor_name, _company_id, _valid_from in changed
+            ])
+            invalidate_pass_cache(*(pass_code for _pass_id, pass_code, *_rest in changed))
+            if approving and pending_ids:
+                transaction.on_commit(lambda: group(
+                    render_pass_qr_codes.si(pending_ids),
+                    notify_passes_approved.si(pending_ids),
+                ).delay())
+                for pass_id, _pass_code, visitor_name, company_id, valid_from in changed:
+                    publish_event(
+                        "pass.approved",
+                        {"id": pass_id, "visitor_name": visitor_name, "valid_from": valid_from},
+                        company_id=company_id,
+                    )
+
+        error = f"Only pending passes can be {'approved' if approving else 'rejected'}."
+        results = []
+        for pass_id in ids:
+            if pass_id not in found:
+                results.append({"id": pass_id, "status": "error", "detail": "Pass not found."})
+            elif found[pass_id] != VisitorPass.Status.PENDING:
+                results.append({"id": pass_id, "status": "error", "detail": error})
+            else:
+                results.append({"id": pass_id, "status": new_status, "detail": ""})
+        return Response({
+            "processed": len(pending_ids),
+            "failed": len(ids) - len(pending_ids),
+            "results": results,
+        })
+
+    @action(detail=False, methods=["post"], url_path="bulk-approve", permission_classes=[IsAdminOrCompanyAdmin])
+    def bulk_approve(self, request):
+        return self._bulk_transition(request, VisitorPass.Status.APPROVED)
+
+    @action(detail=False, methods=["post"], url_path="bulk-reject", permission_classes=[IsAdminOrCompanyAdmin])
+    def bulk_reject(self, request):
+        return self._bulk_transition(request, VisitorPass.Status.REJECTED)
+
+    @action(detail=False, methods=["post"], url_path="bulk-import")
+    def bulk_import(self, request):
+        serializer = VisitorPassImportSerializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        host_company = serializer.validated_data.get("host_company")
+        job = ImportJob.objects.create(
+            kind=ImportJob.Kind.VISITOR_PASSES,
+            file=serializer.validated_data["file"],
+            params={"host_company": host_company.id} if host_company else {},
+            created_by=request.user,
+        )
+        transaction.on_commit(lambda: import_visitor_passes.delay(job.id))
+        return Response(
+            ImportJobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=False, methods=["get"], url_path="cache-stats", permission_classes=[IsAdmin])
+    def cache_stats(self, request):
+        return Response(get_pass_cache_stats())
 
     @action(detail=False, methods=["post"], url_path="walk-in", permission_classes=[IsGuard])
     def walk_in(self, request):
@@ -135,7 +265,7 @@ class VisitorPassViewSet(viewsets.ModelViewSet):
             approved_by=request.user,
             approved_at=timezone.now(),
         )
-        generate_qr_code(visitor_pass)
+        schedule_qr_render([visitor_pass.id])
         log_action(
             user=request.user,
             action="walk_in_pass_created",
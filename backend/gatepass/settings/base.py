@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from decouple import config
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -47,6 +48,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.audit.middleware.AuditLogMiddleware",
 ]
 
 ROOT_URLCONF = "gatepass.urls"
@@ -128,6 +130,56 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Cache
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("CACHE_URL", default="redis://localhost:6379/1"),
+    }
+}
+PASS_CACHE_TTL = config("PASS_CACHE_TTL", default=300, cast=int)
+PASS_CACHE_NEGATIVE_TTL = config("PASS_CACHE_NEGATIVE_TTL", default=30, cast=int)
+PASS_EXPIRY_CHUNK_SIZE = config("PASS_EXPIRY_CHUNK_SIZE", default=500, cast=int)
+QR_CODE_LRU_SIZE = config("QR_CODE_LRU_SIZE", default=512, cast=int)
+QR_CODE_CACHE_TTL = config("QR_CODE_CACHE_TTL", default=7 * 24 * 3600, cast=int)
+
+# Bulk imports and exports
+EMPLOYEE_IMPORT_HASH_WORKERS = config("EMPLOYEE_IMPORT_HASH_WORKERS", default=4, cast=int)
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Audit log sink: sync (write inline), buffered (one bulk insert per request
+# after commit, still before the response is sent) or celery (batched per
+# request and written by a worker, off the request path)
+AUDIT_LOG_SINK = config("AUDIT_LOG_SINK", default="celery")
+
+# Log partitions and retention (0 keeps logs forever)
+PARTITION_MONTHS_AHEAD = config("PARTITION_MONTHS_AHEAD", default=3, cast=int)
+AUDIT_LOG_RETENTION_MONTHS = config("AUDIT_LOG_RETENTION_MONTHS", default=0, cast=int)
+ENTRY_LOG_RETENTION_MONTHS = config("ENTRY_LOG_RETENTION_MONTHS", default=0, cast=int)
+LOG_ARCHIVE_DIR = config("LOG_ARCHIVE_DIR", default=str(BASE_DIR / "archive"))
+
+# Auto check-out for entries nobody closed at the gate: visitors a grace period
+# after their pass ends or N hours after check-in, deliveries M minutes after
+# check-in (0 hours/minutes turns that rule off)
+AUTO_CHECKOUT_AT_PASS_END = config("AUTO_CHECKOUT_AT_PASS_END", default=True, cast=bool)
+AUTO_CHECKOUT_PASS_GRACE_MINUTES = config("AUTO_CHECKOUT_PASS_GRACE_MINUTES", default=30, cast=int)
+AUTO_CHECKOUT_VISITOR_HOURS = config("AUTO_CHECKOUT_VISITOR_HOURS", default=12, cast=int)
+AUTO_CHECKOUT_DELIVERY_MINUTES = config("AUTO_CHECKOUT_DELIVERY_MINUTES", default=120, cast=int)
+AUTO_CHECKOUT_CHUNK_SIZE = config("AUTO_CHECKOUT_CHUNK_SIZE", default=500, cast=int)
+
+# Analytics rollups
+ENTRY_ROLLUP_RECONCILE_HOURS = config("ENTRY_ROLLUP_RECONCILE_HOURS", default=48, cast=int)
+ANALYTICS_OVERVIEW_TTL = config("ANALYTICS_OVERVIEW_TTL", default=30, cast=int)
+ANALYTICS_OVERVIEW_STALE_TTL = config("ANALYTICS_OVERVIEW_STALE_TTL", default=300, cast=int)
+
+# Live gate events (Redis pub/sub fanned out over server-sent events)
+EVENTS_ENABLED = config("EVENTS_ENABLED", default=True, cast=bool)
+EVENTS_REDIS_URL = config("EVENTS_REDIS_URL", default="redis://localhost:6379/2")
+EVENTS_CHANNEL = "gatepass:events"
+EVENTS_HEARTBEAT = config("EVENTS_HEARTBEAT", default=15, cast=int)
+EVENTS_RETRY_MS = 3000
+EVENTS_TICKET_TTL = 30
+
 # Celery
 CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", default="redis://localhost:6379/0")
@@ -135,12 +187,63 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-entry-rollups": {
+        "task": "apps.analytics.tasks.reconcile_entry_rollups",
+        "schedule": crontab(minute=5),
+    },
+    "reconcile-occupancy": {
+        "task": "apps.analytics.tasks.reconcile_occupancy",
+        "schedule": crontab(hour=3, minute=15),
+    },
+    "dispatch-notifications": {
+        "task": "apps.notifications.tasks.dispatch_all_notifications",
+        "schedule": crontab(),
+    },
+    "expire-visitor-passes": {
+        "task": "apps.passes.tasks.expire_visitor_passes",
+        "schedule": crontab(minute="*/5"),
+    },
+    "auto-check-out-entries": {
+        "task": "apps.entries.tasks.auto_check_out_entries",
+        "schedule": crontab(minute="*/15"),
+    },
+    "maintain-log-partitions": {
+        "task": "apps.core.tasks.maintain_log_partitions",
+        "schedule": crontab(hour=2, minute=30),
+    },
+}
 
 # Notification backends
-SMS_BACKEND = config("SMS_BACKEND", default="console")  # console | twilio | msg91
+# console | locmem | twilio | msg91 | gateway, or a dotted path to a BaseSMSBackend subclass
+SMS_BACKEND = config("SMS_BACKEND", default="console")
+SMS_CONCURRENCY = config("SMS_CONCURRENCY", default=20, cast=int)
+SMS_HTTP_TIMEOUT = config("SMS_HTTP_TIMEOUT", default=10, cast=float)
 TWILIO_ACCOUNT_SID = config("TWILIO_ACCOUNT_SID", default="")
 TWILIO_AUTH_TOKEN = config("TWILIO_AUTH_TOKEN", default="")
 TWILIO_FROM_NUMBER = config("TWILIO_FROM_NUMBER", default="")
+MSG91_AUTH_KEY = config("MSG91_AUTH_KEY", default="")
+MSG91_TEMPLATE_ID = config("MSG91_TEMPLATE_ID", default="")
+# Stand-in gateway started with `manage.py run_sms_gateway`
+SMS_GATEWAY_URL = config("SMS_GATEWAY_URL", default="http://127.0.0.1:8025/sms")
+
+# Notification dispatch: batch size per channel and sends per second (0 = unlimited)
+NOTIFICATION_BATCH_SIZE = config("NOTIFICATION_BATCH_SIZE", default=100, cast=int)
+NOTIFICATION_DISPATCH_LOCK_TTL = config("NOTIFICATION_DISPATCH_LOCK_TTL", default=300, cast=int)
+SMS_RATE_LIMIT = config("SMS_RATE_LIMIT", default=10, cast=float)
+EMAIL_RATE_LIMIT = config("EMAIL_RATE_LIMIT", default=5, cast=float)
+# Retries back off exponentially (with jitter) from NOTIFICATION_RETRY_BASE_DELAY seconds;
+# rows still failing after NOTIFICATION_MAX_ATTEMPTS are dead-lettered. A provider with
+# NOTIFICATION_CIRCUIT_THRESHOLD consecutive failures is paused for the cooldown.
+NOTIFICATION_MAX_ATTEMPTS = config("NOTIFICATION_MAX_ATTEMPTS", default=5, cast=int)
+NOTIFICATION_RETRY_BASE_DELAY = config("NOTIFICATION_RETRY_BASE_DELAY", default=30, cast=int)
+NOTIFICATION_RETRY_MAX_DELAY = config("NOTIFICATION_RETRY_MAX_DELAY", default=3600, cast=int)
+NOTIFICATION_CIRCUIT_THRESHOLD = config("NOTIFICATION_CIRCUIT_THRESHOLD", default=5, cast=int)
+NOTIFICATION_CIRCUIT_COOLDOWN = config("NOTIFICATION_CIRCUIT_COOLDOWN", default=60, cast=int)
+# Identical messages (recipient, template, resource) within the window are dropped, and
+# host check-in alerts are debounced into one digest SMS (0 disables either).
+NOTIFICATION_DEDUPE_WINDOW = config("NOTIFICATION_DEDUPE_WINDOW", default=600, cast=int)
+NOTIFICATION_DIGEST_DELAY = config("NOTIFICATION_DIGEST_DELAY", default=60, cast=int)
 
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="noreply@gatepass.local")
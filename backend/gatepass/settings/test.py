@@ -12,6 +12,12 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 # Disable password hashing to speed up tests
 # Using Django's recommended fast hasher for testing
 PASSWORD_HASHERS = [
@@ -20,9 +26,13 @@ PASSWORD_HASHERS = [
 
 # Use console backends for testing
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
-SMS_BACKEND = "console"
+SMS_BACKEND = "locmem"
 MEDIA_ROOT = tempfile.mkdtemp(prefix="gatepass-test-media-")
 
 # Disable Celery task execution during tests
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+
+# Write audit logs inline so tests can assert on them straight away
+AUDIT_LOG_SINK = "sync"
+EVENTS_ENABLED = False
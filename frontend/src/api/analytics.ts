@@ -1,5 +1,5 @@
 import { apiClient } from './client'
-import type { AnalyticsOverview } from '@/types'
+import type { AnalyticsOverview, Occupancy } from '@/types'
 
 export const analyticsApi = {
   overview: async (): Promise<AnalyticsOverview> => {
@@ -22,6 +22,11 @@ export const analyticsApi = {
     return response.data
   },
 
+  occupancy: async (gate?: number): Promise<Occupancy> => {
+    const response = await apiClient.get('/analytics/occupancy/', { params: gate ? { gate } : undefined })
+    return response.data
+  },
+
   deliveryStats: async (days = 30): Promise<Record<string, unknown>> => {
     const response = await apiClient.get('/analytics/delivery-stats/', { params: { days } })
     return response.data
@@ -6,4 +6,9 @@ export const auditApi = {
     const response = await apiClient.get('/audit-logs/', { params })
     return response.data
   },
+
+  export: async (params?: Record<string, string>): Promise<Blob> => {
+    const response = await apiClient.get('/audit-logs/export/', { params, responseType: 'blob' })
+    return response.data
+  },
 }
@@ -1,5 +1,5 @@
 import { apiClient } from './client'
-import type { Company, Employee, PaginatedResponse } from '@/types'
+import type { Company, Employee, ImportJob, PaginatedResponse } from '@/types'
 
 export const companiesApi = {
   list: async (params?: Record<string, string>): Promise<PaginatedResponse<Company>> => {
@@ -57,7 +57,7 @@ export const employeesApi = {
     await apiClient.delete(`/companies/employees/${id}/`)
   },
 
-  bulkUpload: async (file: File, companyId: number): Promise<{ created: number; errors: unknown[] }> => {
+  bulkUpload: async (file: File, companyId: number): Promise<ImportJob> => {
     const formData = new FormData()
     formData.append('file', file)
     formData.append('company', companyId.toString())
@@ -7,6 +7,11 @@ export const deliveriesApi = {
     return response.data
   },
 
+  export: async (params?: Record<string, string>): Promise<Blob> => {
+    const response = await apiClient.get('/deliveries/export/', { params, responseType: 'blob' })
+    return response.data
+  },
+
   get: async (id: number): Promise<Delivery> => {
     const response = await apiClient.get(`/deliveries/${id}/`)
     return response.data
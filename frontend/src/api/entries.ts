@@ -1,5 +1,5 @@
 import { apiClient } from './client'
-import type { EntryLog, PaginatedResponse } from '@/types'
+import type { CursorPaginatedResponse, EntryLog, OfflineScan, OfflineSyncResult, PaginatedResponse, PassManifest } from '@/types'
 
 export const entriesApi = {
   list: async (params?: Record<string, string>): Promise<PaginatedResponse<EntryLog>> => {
@@ -7,8 +7,13 @@ export const entriesApi = {
     return response.data
   },
 
-  active: async (): Promise<PaginatedResponse<EntryLog>> => {
-    const response = await apiClient.get('/entries/active/')
+  export: async (params?: Record<string, string>): Promise<Blob> => {
+    const response = await apiClient.get('/entries/export/', { params, responseType: 'blob' })
+    return response.data
+  },
+
+  active: async (params?: Record<string, string>): Promise<CursorPaginatedResponse<EntryLog>> => {
+    const response = await apiClient.get('/entries/active/', { params })
     return response.data
   },
 
@@ -21,4 +26,14 @@ export const entriesApi = {
     const response = await apiClient.post(`/entries/${id}/check-out/`)
     return response.data
   },
+
+  manifest: async (gate: number, hours = 12): Promise<PassManifest> => {
+    const response = await apiClient.get('/entries/manifest/', { params: { gate, hours } })
+    return response.data
+  },
+
+  sync: async (scans: OfflineScan[]): Promise<OfflineSyncResult> => {
+    const response = await apiClient.post('/entries/sync/', { scans })
+    return response.data
+  },
 }
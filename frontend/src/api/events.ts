@@ -0,0 +1,10 @@
+import { apiClient } from './client'
+
+export const eventsApi = {
+  // Single-use and short-lived; opens one live-events stream without putting the
+  // access token in the URL.
+  ticket: async (): Promise<{ ticket: string; expires_in: number }> => {
+    const response = await apiClient.post('/events/ticket/')
+    return response.data
+  },
+}
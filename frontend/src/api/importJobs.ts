@@ -0,0 +1,9 @@
+import { apiClient } from './client'
+import type { ImportJob } from '@/types'
+
+export const importJobsApi = {
+  get: async (id: number): Promise<ImportJob> => {
+    const response = await apiClient.get(`/import-jobs/${id}/`)
+    return response.data
+  },
+}
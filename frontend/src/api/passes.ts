@@ -1,5 +1,5 @@
 import { apiClient } from './client'
-import type { VisitorPass, VerifiedVisitorPass, PaginatedResponse } from '@/types'
+import type { BulkPassActionResult, ImportJob, VisitorPass, VerifiedVisitorPass, PaginatedResponse } from '@/types'
 
 export const passesApi = {
   list: async (params?: Record<string, string>): Promise<PaginatedResponse<VisitorPass>> => {
@@ -7,6 +7,11 @@ export const passesApi = {
     return response.data
   },
 
+  export: async (params?: Record<string, string>): Promise<Blob> => {
+    const response = await apiClient.get('/passes/export/', { params, responseType: 'blob' })
+    return response.data
+  },
+
   get: async (id: number): Promise<VisitorPass> => {
     const response = await apiClient.get(`/passes/${id}/`)
     return response.data
@@ -36,6 +41,26 @@ export const passesApi = {
     return response.data
   },
 
+  bulkApprove: async (ids: number[]): Promise<BulkPassActionResult> => {
+    const response = await apiClient.post('/passes/bulk-approve/', { ids })
+    return response.data
+  },
+
+  bulkReject: async (ids: number[], reason: string): Promise<BulkPassActionResult> => {
+    const response = await apiClient.post('/passes/bulk-reject/', { ids, reason })
+    return response.data
+  },
+
+  bulkImport: async (file: File, hostCompanyId?: number): Promise<ImportJob> => {
+    const formData = new FormData()
+    formData.append('file', file)
+    if (hostCompanyId) formData.append('host_company', hostCompanyId.toString())
+    const response = await apiClient.post('/passes/bulk-import/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    })
+    return response.data
+  },
+
   verify: async (code: string): Promise<VerifiedVisitorPass> => {
     const response = await apiClient.get(`/passes/verify/${code}/`)
     return response.data
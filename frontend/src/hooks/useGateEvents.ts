@@ -0,0 +1,88 @@
+import { useEffect } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+import { isAxiosError } from 'axios'
+import { API_URL } from '@/api/client'
+import { eventsApi } from '@/api/events'
+import { useAuthStore } from '@/store/authStore'
+import type { CursorPaginatedResponse, EntryLog } from '@/types'
+
+interface GateEvent<T> {
+  type: string
+  gate: number | null
+  company: number | null
+  at: string
+  data: T
+}
+
+type ActiveEntries = CursorPaginatedResponse<EntryLog>
+
+const RECONNECT_DELAY_MS = 3000
+
+// Applies live check-in/check-out events to the cached active-entries list, so guard
+// screens update as scans happen instead of waiting for the next poll.
+export function useGateEvents(gate?: number) {
+  const queryClient = useQueryClient()
+  const token = useAuthStore((state) => state.token)
+
+  useEffect(() => {
+    if (!token || typeof EventSource === 'undefined') return
+    let source: EventSource | undefined
+    let retry: ReturnType<typeof setTimeout> | undefined
+    let stopped = false
+
+    const reconnect = () => {
+      if (!stopped) retry = setTimeout(connect, RECONNECT_DELAY_MS)
+    }
+
+    // Tickets are single-use, so every (re)connect asks for a new one instead of
+    // letting EventSource retry the same URL.
+    async function connect() {
+      let ticket: string
+      try {
+        ticket = (await eventsApi.ticket()).ticket
+      } catch (error) {
+        // Disabled (503) or not allowed (4xx): stay on the slower poll.
+        const status = isAxiosError(error) ? error.response?.status : undefined
+        if (status === undefined || (status >= 500 && status !== 503)) reconnect()
+        return
+      }
+      if (stopped) return
+      const params = new URLSearchParams({ ticket })
+      if (gate) params.set('gate', String(gate))
+      source = new EventSource(`${API_URL}/events/?${params}`)
+
+      source.addEventListener('entry.checked_in', (message) => {
+        const event: GateEvent<EntryLog> = JSON.parse((message as MessageEvent).data)
+        queryClient.setQueryData<ActiveEntries>(['active-entries'], (current) =>
+          current && !current.results.some((entry) => entry.id === event.data.id)
+            ? { ...current, results: [event.data, ...current.results] }
+            : current
+        )
+      })
+      source.addEventListener('entry.checked_out', (message) => {
+        const event: GateEvent<{ id: number }> = JSON.parse((message as MessageEvent).data)
+        queryClient.setQueryData<ActiveEntries>(['active-entries'], (current) =>
+          current && { ...current, results: current.results.filter((entry) => entry.id !== event.data.id) }
+        )
+      })
+      source.addEventListener('delivery.arrived', () => {
+        queryClient.invalidateQueries({ queryKey: ['pending-deliveries'] })
+      })
+      // Events missed while disconnected are recovered by refetching once the stream is back.
+      source.addEventListener('open', () => {
+        queryClient.invalidateQueries({ queryKey: ['active-entries'] })
+      })
+      source.addEventListener('error', () => {
+        source?.close()
+        reconnect()
+      })
+    }
+
+    connect()
+    return () => {
+      stopped = true
+      clearTimeout(retry)
+      source?.close()
+    }
+  }, [gate, queryClient, token])
+}
@@ -47,9 +47,9 @@ export function PublicPassPage() {
           <div className="flex justify-center">
             <StatusBadge status={pass.status} />
           </div>
-          {pass.qr_code_image && (
+          {pass.qr_code_url && (
             <div className="flex justify-center">
-              <img src={pass.qr_code_image} alt="QR Code" className="w-48 h-48" />
+              <img src={pass.qr_code_url} alt="QR Code" className="w-48 h-48" />
             </div>
           )}
           <div className="space-y-2 text-sm">
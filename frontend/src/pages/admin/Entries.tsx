@@ -25,6 +25,7 @@ export function AdminEntriesPage() {
     { accessorKey: 'entry_type', header: 'Type', cell: ({ row }) => <Badge variant="outline" className="capitalize">{row.original.entry_type}</Badge> },
     { accessorKey: 'check_in_time', header: 'Check In', cell: ({ row }) => formatDateTime(row.original.check_in_time) },
     { accessorKey: 'check_out_time', header: 'Check Out', cell: ({ row }) => row.original.check_out_time ? formatDateTime(row.original.check_out_time) : <Badge variant="secondary">Active</Badge> },
+    { accessorKey: 'check_out_method', header: 'Checked Out By', cell: ({ row }) => row.original.check_out_method === 'auto' ? <Badge variant="outline">Auto</Badge> : row.original.checked_out_by_name },
   ]
 
   if (isLoading) return <LoadingSpinner className="h-64" />
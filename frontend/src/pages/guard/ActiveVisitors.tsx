@@ -1,5 +1,6 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { entriesApi } from '@/api/entries'
+import { useGateEvents } from '@/hooks/useGateEvents'
 import { PageHeader } from '@/components/common/PageHeader'
 import { DataTable } from '@/components/common/DataTable'
 import { LoadingSpinner } from '@/components/common/LoadingSpinner'
@@ -11,11 +12,13 @@ import { ColumnDef } from '@tanstack/react-table'
 
 export function ActiveVisitorsPage() {
   const queryClient = useQueryClient()
+  useGateEvents()
 
+  // Live events keep the list current; the slow poll only covers a dropped stream.
   const { data, isLoading } = useQuery({
     queryKey: ['active-entries'],
-    queryFn: entriesApi.active,
-    refetchInterval: 30000,
+    queryFn: () => entriesApi.active(),
+    refetchInterval: 120000,
   })
 
   const checkOutMutation = useMutation({
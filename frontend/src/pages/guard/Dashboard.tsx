@@ -1,5 +1,6 @@
 import { useQuery } from '@tanstack/react-query'
 import { entriesApi } from '@/api/entries'
+import { useGateEvents } from '@/hooks/useGateEvents'
 import { deliveriesApi } from '@/api/deliveries'
 import { shiftsApi } from '@/api/gates'
 import { PageHeader } from '@/components/common/PageHeader'
@@ -9,6 +10,8 @@ import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Users, Package, DoorOpen } from 'lucide-react'
 
 export function GuardDashboard() {
+  useGateEvents()
+
   const { data: shift } = useQuery({
     queryKey: ['my-shift'],
     queryFn: shiftsApi.myCurrent,
@@ -16,7 +19,8 @@ export function GuardDashboard() {
 
   const { data: activeEntries, isLoading: loadingEntries } = useQuery({
     queryKey: ['active-entries'],
-    queryFn: entriesApi.active,
+    queryFn: () => entriesApi.active(),
+    refetchInterval: 120000,
   })
 
   const { data: pendingDeliveries, isLoading: loadingDeliveries } = useQuery({
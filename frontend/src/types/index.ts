@@ -98,7 +98,7 @@ export interface VisitorPass {
   host_employee: number | null
   host_employee_name: string | null
   pass_code: string
-  qr_code_image: string | null
+  qr_code_url: string | null
   pass_type: 'pre_approved' | 'walk_in' | 'recurring'
   status: 'pending' | 'approved' | 'checked_in' | 'checked_out' | 'expired' | 'rejected' | 'cancelled'
   valid_from: string
@@ -114,6 +114,12 @@ export interface VisitorPass {
   updated_at: string
 }
 
+export interface BulkPassActionResult {
+  processed: number
+  failed: number
+  results: { id: number; status: string; detail: string }[]
+}
+
 export interface VerifiedVisitorPass {
   id: number
   visitor_name: string
@@ -126,7 +132,7 @@ export interface VerifiedVisitorPass {
   purpose: string
   host_company_name: string
   host_employee_name: string | null
-  qr_code_image: string | null
+  qr_code_url: string | null
   pass_type: VisitorPass['pass_type']
   status: VisitorPass['status']
   valid_from: string
@@ -137,6 +143,7 @@ export interface EntryLog {
   id: number
   visitor_pass: number | null
   delivery: number | null
+  company: number | null
   entry_type: 'visitor' | 'delivery'
   gate: number
   gate_name: string
@@ -146,6 +153,7 @@ export interface EntryLog {
   checked_out_by_name: string | null
   check_in_time: string
   check_out_time: string | null
+  check_out_method: '' | 'guard' | 'auto'
   visitor_name: string
   phone: string
   company_name: string
@@ -153,6 +161,37 @@ export interface EntryLog {
   updated_at: string
 }
 
+export interface PassManifest {
+  gate: number
+  generated_at: number
+  expires_at: number
+  count: number
+  manifest: string
+}
+
+export interface OfflineScan {
+  idempotency_key: string
+  action: 'check_in' | 'check_out'
+  pass_code: string
+  gate: number
+  scanned_at: string
+}
+
+export interface OfflineScanResult {
+  idempotency_key: string
+  result: 'applied' | 'conflict'
+  detail: string
+  entry: number | null
+  duplicate: boolean
+}
+
+export interface OfflineSyncResult {
+  applied: number
+  conflicts: number
+  duplicates: number
+  results: OfflineScanResult[]
+}
+
 export interface Delivery {
   id: number
   company: number
@@ -185,6 +224,22 @@ export interface AuditLog {
   created_at: string
 }
 
+export interface ImportJob {
+  id: number
+  kind: 'visitor_passes' | 'employees'
+  status: 'queued' | 'running' | 'completed' | 'failed'
+  params: Record<string, unknown>
+  processed_rows: number
+  created_count: number
+  error_count: number
+  error_report_url: string | null
+  detail: string
+  started_at: string | null
+  finished_at: string | null
+  created_at: string
+  updated_at: string
+}
+
 export interface PaginatedResponse<T> {
   count: number
   next: string | null
@@ -192,12 +247,25 @@ export interface PaginatedResponse<T> {
   results: T[]
 }
 
+export interface CursorPaginatedResponse<T> {
+  next: string | null
+  has_next: boolean
+  results: T[]
+}
+
 export interface LoginResponse {
   access: string
   refresh: string
   user: User
 }
 
+export interface Occupancy {
+  total: number
+  by_gate: { id: number | null; count: number }[]
+  by_company: { id: number | null; count: number }[]
+  by_entry_type: Record<string, number>
+}
+
 export interface AnalyticsOverview {
   total_companies: number
   total_passes_today: number